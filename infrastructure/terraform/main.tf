@@ -73,6 +73,7 @@ resource "aws_iam_role_policy" "lambda_policy" {
         Effect = "Allow"
         Action = [
           "cloudwatch:GetMetricData",
+          "cloudwatch:ListMetrics",
           "cloudwatch:DescribeAlarms"
         ]
         Resource = "*"
@@ -114,11 +115,37 @@ resource "aws_iam_role_policy" "lambda_policy" {
           "sns:Publish"
         ]
         Resource = aws_sns_topic.alarm_reports.arn
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:PutItem",
+          "dynamodb:DeleteItem"
+        ]
+        Resource = aws_dynamodb_table.single_flight.arn
       }
     ]
   })
 }
 
+# Leases that stop concurrent containers repeating an investigation
+resource "aws_dynamodb_table" "single_flight" {
+  name         = "${local.function_name}-single-flight"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "flight_key"
+
+  attribute {
+    name = "flight_key"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+}
+
 # Lambda function
 resource "aws_lambda_function" "alarm_investigator" {
   function_name = local.function_name
@@ -133,7 +160,8 @@ resource "aws_lambda_function" "alarm_investigator" {
 
   environment {
     variables = {
-      SNS_TOPIC_ARN = aws_sns_topic.alarm_reports.arn
+      SNS_TOPIC_ARN       = aws_sns_topic.alarm_reports.arn
+      SINGLE_FLIGHT_TABLE = aws_dynamodb_table.single_flight.name
     }
   }
 
@@ -7,8 +7,13 @@ echo "Building Alarm Investigator Lambda package..."
 rm -rf dist/
 mkdir -p dist/package
 
-# Install dependencies
-pip install -r requirements.txt -t dist/package/
+# Install dependencies as wheels for the Lambda runtime (python3.12 on arm64),
+# whatever platform the build runs on
+pip install -r requirements.txt -t dist/package/ \
+    --platform manylinux2014_aarch64 \
+    --only-binary=:all: \
+    --python-version 3.12 \
+    --implementation cp
 
 # Copy source code
 cp -r src/alarm_investigator dist/package/
@@ -1,8 +1,123 @@
 """Bedrock agent orchestrator for alarm investigation."""
 
+import asyncio
+import functools
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+
+from alarm_investigator.checkpoint import Checkpoint, CheckpointStore
+from alarm_investigator.compaction import ConversationCompactor
+from alarm_investigator.metrics import MetricsRecorder
 from alarm_investigator.models import AlarmEvent
+from alarm_investigator.prefetch import EvidenceRouter
 from alarm_investigator.tools.base import ToolRegistry
 
+logger = logging.getLogger(__name__)
+
+# Converse calls of async investigations get their own workers, so they
+# neither hold up tool calls nor queue on the event loop's small default
+# executor
+CONVERSE_EXECUTOR_WORKERS = 32
+_converse_executor = ThreadPoolExecutor(
+    max_workers=CONVERSE_EXECUTOR_WORKERS, thread_name_prefix="converse-executor"
+)
+
+
+@dataclass
+class TokenUsage:
+    """Token counts accumulated from Bedrock converse responses."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+
+    def add(self, usage: dict) -> None:
+        """Add the ``usage`` field of a converse response."""
+        self.input_tokens += usage.get("inputTokens", 0)
+        self.output_tokens += usage.get("outputTokens", 0)
+        self.cache_read_tokens += usage.get("cacheReadInputTokens", 0)
+        self.cache_write_tokens += usage.get("cacheWriteInputTokens", 0)
+
+
+@dataclass
+class TimeBreakdown:
+    """Wall-clock seconds spent in each phase of an investigation."""
+
+    prefetch_seconds: float = 0.0
+    model_seconds: float = 0.0
+    tool_seconds: float = 0.0
+    turns: int = 0
+    forced_final_report: bool = False
+
+    @property
+    def seconds_per_turn(self) -> float:
+        """Average model plus tool time of a turn so far."""
+        if not self.turns:
+            return 0.0
+        return (self.model_seconds + self.tool_seconds) / self.turns
+
+
+@dataclass
+class InvestigationOutcome:
+    """The report of one investigation and how it ended."""
+
+    report: str
+    stop_reason: str | None
+    usage: TokenUsage
+
+
+class ToolCall:
+    """A tool call on its own thread that starts once a parallelism slot is free.
+
+    ``started`` is set when the call actually begins, so time spent queued
+    for a slot does not count against its timeout. An abandoned call that
+    is still running gives its slot back, so a hung call cannot hold up
+    later calls; its thread finishes in the background.
+    """
+
+    def __init__(self, run: Callable[[], dict], slots: threading.Semaphore):
+        self.future: Future = Future()
+        self.started: float | None = None
+        self._slots = slots
+        self._holds_slot = False
+        self._lock = threading.Lock()
+        threading.Thread(
+            target=self._run, args=(run,), name="investigation-tool", daemon=True
+        ).start()
+
+    def _run(self, run: Callable[[], dict]) -> None:
+        self._slots.acquire()
+        with self._lock:
+            if not self.future.set_running_or_notify_cancel():
+                self._slots.release()
+                return
+            self._holds_slot = True
+            self.started = time.monotonic()
+        try:
+            self.future.set_result(run())
+        except BaseException as e:
+            self.future.set_exception(e)
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        with self._lock:
+            if self._holds_slot:
+                self._holds_slot = False
+                self._slots.release()
+
+    def abandon(self) -> None:
+        """Stop waiting for the call, dropping it if it has not started yet."""
+        if not self.future.cancel():
+            self._release()
+
 
 class InvestigationAgent:
     """Agent that investigates CloudWatch alarms using Bedrock."""
@@ -14,25 +129,34 @@ class InvestigationAgent:
         bedrock_client,
         tool_registry: ToolRegistry,
         max_iterations: int = 10,
+        max_parallel_tools: int = 4,
+        tool_timeout: float = 30.0,
+        compactor: ConversationCompactor | None = None,
+        prompt_caching: bool = True,
+        evidence_router: EvidenceRouter | None = None,
+        final_report_reserve: float = 30.0,
+        checkpoint_store: CheckpointStore | None = None,
+        metrics: MetricsRecorder | None = None,
     ):
         self._client = bedrock_client
         self._registry = tool_registry
         self._max_iterations = max_iterations
+        self._max_parallel_tools = max_parallel_tools
+        self._tool_timeout = tool_timeout
+        self._tool_slots = threading.Semaphore(max_parallel_tools)
+        self._compactor = compactor or ConversationCompactor()
+        self._prompt_caching = prompt_caching
+        self._evidence_router = evidence_router
+        self._final_report_reserve = final_report_reserve
+        self._checkpoint_store = checkpoint_store
+        self._metrics = metrics
+        self.usage = TokenUsage()
+        self.timings = TimeBreakdown()
+        # Why the last investigation stopped; only "end_turn" means the model
+        # finished its report
+        self.stop_reason: str | None = None
 
-    def _build_system_prompt(self, alarm: AlarmEvent) -> str:
-        """Build the system prompt for investigation."""
-        return f"""You are an AWS infrastructure expert investigating a CloudWatch alarm.
-
-## Alarm Details
-- **Alarm Name:** {alarm.alarm_name}
-- **State:** {alarm.state.value}
-- **Previous State:** {alarm.previous_state.value}
-- **Reason:** {alarm.reason}
-- **Namespace:** {alarm.namespace or "N/A"}
-- **Metric:** {alarm.metric_name or "N/A"}
-- **Dimensions:** {alarm.dimensions or {}}
-- **Account:** {alarm.account_id}
-- **Region:** {alarm.region}
+    INSTRUCTIONS = """You are an AWS infrastructure expert investigating a CloudWatch alarm.
 
 ## Your Task
 1. Use the available tools to gather information about the affected resources
@@ -49,61 +173,632 @@ Provide your analysis as a structured report with:
 
 Be concise but thorough. Focus on actionable insights."""
 
-    def investigate(self, alarm: AlarmEvent) -> str:
-        """Investigate an alarm and return a report."""
-        system_prompt = self._build_system_prompt(alarm)
+    CACHE_POINT = {"cachePoint": {"type": "default"}}
+
+    MAX_ITERATIONS_REPORT = (
+        "Investigation reached max iterations. Partial analysis may be available above."
+    )
+
+    FINAL_REPORT_PROMPT = (
+        "Time is nearly up. Do not request any more tools; write the final report now "
+        "from the evidence gathered so far, noting anything left unverified."
+    )
+
+    DEADLINE_REPORT = "Investigation stopped at its time limit before a report was written."
+
+    # How often to check whether calls queued for a parallelism slot have started
+    QUEUED_POLL_SECONDS = 0.05
+
+    # Converse usage fields and the metrics they are recorded as, per turn
+    USAGE_METRICS = (
+        ("inputTokens", "InputTokens"),
+        ("outputTokens", "OutputTokens"),
+        ("cacheReadInputTokens", "CacheReadTokens"),
+        ("cacheWriteInputTokens", "CacheWriteTokens"),
+    )
+
+    def _build_alarm_context(
+        self, alarm: AlarmEvent, related_alarms: list[AlarmEvent] | None = None
+    ) -> str:
+        """Build the alarm-specific part of the system prompt."""
+        context = f"""## Alarm Details
+- **Alarm Name:** {alarm.alarm_name}
+- **State:** {alarm.state.value}
+- **Previous State:** {alarm.previous_state.value}
+- **Reason:** {alarm.reason}
+- **Namespace:** {alarm.namespace or "N/A"}
+- **Metric:** {alarm.metric_name or "N/A"}
+- **Dimensions:** {alarm.dimensions or {}}
+- **Account:** {alarm.account_id}
+- **Region:** {alarm.region}"""
+        if related_alarms:
+            lines = [
+                "## Related Alarms",
+                "These alarms fired for the same resource in the same window. "
+                "Your report covers all of them.",
+            ]
+            lines.extend(
+                f"- **{a.alarm_name}** ({a.state.value}): "
+                f"{a.namespace or 'N/A'}/{a.metric_name or 'N/A'} - {a.reason}"
+                for a in related_alarms
+            )
+            context = f"{context}\n\n" + "\n".join(lines)
+        return context
+
+    def _build_system_prompt(
+        self, alarm: AlarmEvent, related_alarms: list[AlarmEvent] | None = None
+    ) -> str:
+        """Build the system prompt for investigation."""
+        return f"{self.INSTRUCTIONS}\n\n{self._build_alarm_context(alarm, related_alarms)}"
+
+    def _build_system_blocks(
+        self, alarm: AlarmEvent, related_alarms: list[AlarmEvent] | None = None
+    ) -> list[dict]:
+        """Build the system content, with cache checkpoints after stable prefixes.
+
+        The static instructions come first so their checkpoint is shared
+        across alarms; the alarm details are cached for the remaining turns
+        of this investigation.
+        """
+        if not self._prompt_caching:
+            return [{"text": self._build_system_prompt(alarm, related_alarms)}]
+        return [
+            {"text": self.INSTRUCTIONS},
+            self.CACHE_POINT,
+            {"text": self._build_alarm_context(alarm, related_alarms)},
+            self.CACHE_POINT,
+        ]
+
+    def _build_tool_config(self) -> dict:
+        """Build the Bedrock tool config, cached after the tool list."""
         tool_config = self._registry.get_bedrock_config()
+        if self._prompt_caching and tool_config.get("tools"):
+            tool_config["tools"].append(self.CACHE_POINT)
+        return tool_config
+
+    def _record_usage(
+        self, usage: dict | None, iteration: int, totals: TokenUsage | None = None
+    ) -> None:
+        """Accumulate token usage, including prompt cache reads and writes.
+
+        Usage is added to ``totals``, or to the agent's ``usage`` by default.
+        """
+        if not usage:
+            return
+        (self.usage if totals is None else totals).add(usage)
+        if self._metrics is not None:
+            for field, metric in self.USAGE_METRICS:
+                self._metrics.put(metric, usage.get(field, 0), "Count")
+        logger.info(
+            "Turn %d usage: input=%d output=%d cache_read=%d cache_write=%d",
+            iteration + 1,
+            usage.get("inputTokens", 0),
+            usage.get("outputTokens", 0),
+            usage.get("cacheReadInputTokens", 0),
+            usage.get("cacheWriteInputTokens", 0),
+        )
+
+    def _execute_tool(self, tool_use: dict) -> dict:
+        """Run a single tool call, converting failures into error results."""
+        try:
+            return self._registry.execute(tool_use["name"], tool_use["input"])
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+
+    def _submit_tool(self, tool_use: dict) -> ToolCall:
+        """Start a tool call, to run as soon as a parallelism slot is free."""
+        return ToolCall(lambda: self._execute_tool(tool_use), self._tool_slots)
+
+    def _collect_tool_results(
+        self,
+        tool_uses: list[dict],
+        calls: list[ToolCall],
+        timeout: float | None = None,
+        cutoff: float | None = None,
+    ) -> list[dict]:
+        """Wait for started tool calls and build their results in request order.
+
+        Each call gets ``timeout`` seconds from when it actually starts;
+        calls still pending at the ``cutoff`` monotonic time are given up.
+        """
+        timeout = self._tool_timeout if timeout is None else timeout
+        results: dict[int, dict] = {}
+        pending = dict(enumerate(calls))
+        while pending:
+            now = time.monotonic()
+            # Only calls still queued for a slot need polling
+            next_check = timeout if cutoff is None else cutoff - now
+            for index, call in list(pending.items()):
+                if call.future.done():
+                    results[index] = call.future.result()
+                elif (cutoff is not None and now >= cutoff) or (
+                    call.started is not None and now - call.started >= timeout
+                ):
+                    call.abandon()
+                    results[index] = self._timeout_result(tool_uses[index], timeout)
+                else:
+                    if call.started is None:
+                        next_check = min(next_check, self.QUEUED_POLL_SECONDS)
+                    else:
+                        next_check = min(next_check, call.started + timeout - now)
+                    continue
+                del pending[index]
+            if pending:
+                wait(
+                    [call.future for call in pending.values()],
+                    timeout=max(next_check, 0),
+                    return_when=FIRST_COMPLETED,
+                )
 
-        messages = [
-            {
-                "role": "user",
-                "content": [
-                    {"text": "Please investigate this alarm and provide a root cause analysis."}
-                ],
+        return [
+            self._tool_result_block(tool_use, results[index])
+            for index, tool_use in enumerate(tool_uses)
+        ]
+
+    def _execute_tools(
+        self,
+        tool_uses: list[dict],
+        timeout: float | None = None,
+        cutoff: float | None = None,
+    ) -> list[dict]:
+        """Run the tool calls of one turn concurrently, preserving their order."""
+        calls = [self._submit_tool(tool_use) for tool_use in tool_uses]
+        return self._collect_tool_results(tool_uses, calls, timeout, cutoff)
+
+    def _tool_result_block(self, tool_use: dict, result: dict) -> dict:
+        """Wrap a tool result in a Bedrock toolResult content block."""
+        return {
+            "toolResult": {
+                "toolUseId": tool_use["toolUseId"],
+                "content": [{"json": result}],
             }
+        }
+
+    def _timeout_result(self, tool_use: dict, timeout: float | None = None) -> dict:
+        """Build the error result for a tool call that exceeded its timeout."""
+        timeout = self._tool_timeout if timeout is None else timeout
+        return {
+            "status": "error",
+            "error": f"Tool {tool_use['name']} timed out after {timeout:g}s",
+        }
+
+    def _plan_prefetch(self, alarm: AlarmEvent) -> list[dict]:
+        """Plan the evidence lookups to run before the first model turn."""
+        if self._evidence_router is None:
+            return []
+        return self._evidence_router.plan(alarm, self._registry)
+
+    def prefetch(self, alarm: AlarmEvent, deadline: float | None = None) -> list[tuple[dict, dict]]:
+        """Run the planned evidence lookups concurrently.
+
+        Like tool turns, the lookups are cut short to leave the final-report
+        reserve before ``deadline``.
+        """
+        started = time.monotonic()
+        tool_uses = self._plan_prefetch(alarm)
+        blocks = self._execute_tools(
+            tool_uses, self._tool_time_budget(deadline), self._tool_cutoff(deadline)
+        )
+        self.timings.prefetch_seconds = time.monotonic() - started
+        return [
+            (tool_use, block["toolResult"]["content"][0]["json"])
+            for tool_use, block in zip(tool_uses, blocks)
         ]
 
-        for iteration in range(self._max_iterations):
-            response = self._client.converse(
-                modelId=self.MODEL_ID,
-                system=[{"text": system_prompt}],
-                messages=messages,
-                toolConfig=tool_config if tool_config.get("tools") else None,
+    def _initial_messages(self, evidence: list[tuple[dict, dict]] | None = None) -> list[dict]:
+        """Build the opening user message, including any prefetched evidence."""
+        content = [{"text": "Please investigate this alarm and provide a root cause analysis."}]
+        if evidence:
+            sections = ["Evidence already gathered for this alarm (no need to request it again):"]
+            for tool_use, result in evidence:
+                arguments = json.dumps(tool_use["input"], sort_keys=True)
+                sections.append(
+                    f"### {tool_use['name']} {arguments}\n"
+                    f"```json\n{json.dumps(result, default=str)}\n```"
+                )
+            content.append({"text": "\n\n".join(sections)})
+        return [{"role": "user", "content": content}]
+
+    def _compact(self, messages: list[dict], iteration: int) -> None:
+        """Shrink already-consumed tool results before the next converse call."""
+        stats = self._compactor.compact(messages)
+        if stats.bytes_saved:
+            logger.info(
+                "Compacted conversation before turn %d: saved %d bytes (~%d tokens), "
+                "%d results digested, %d elided",
+                iteration + 1,
+                stats.bytes_saved,
+                stats.tokens_saved,
+                stats.digested,
+                stats.elided,
+            )
+
+    def _converse_params(self, system: list[dict], tool_config: dict, messages: list) -> dict:
+        """Build the keyword arguments for a Bedrock converse call."""
+        return {
+            "modelId": self.MODEL_ID,
+            "system": system,
+            "messages": messages,
+            "toolConfig": tool_config if tool_config.get("tools") else None,
+        }
+
+    def _converse(self, params: dict, deadline: float | None) -> dict | None:
+        """Call converse, giving up with ``None`` if it is still running at ``deadline``.
+
+        The abandoned call, retries included, finishes in the background.
+        """
+        if deadline is None:
+            return self._client.converse(**params)
+
+        future: Future = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(self._client.converse(**params))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="investigation-converse", daemon=True).start()
+        try:
+            return future.result(timeout=max(deadline - time.monotonic(), 0.0))
+        except FutureTimeoutError:
+            logger.warning("Converse call still running at the investigation deadline")
+            return None
+
+    def _final_report(self, assistant_message: dict) -> str:
+        """Extract the report text from the final assistant message."""
+        for content in assistant_message["content"]:
+            if "text" in content:
+                return content["text"]
+        return "Investigation complete but no report generated."
+
+    def _must_finish(self, deadline: float | None) -> bool:
+        """Whether another tool turn would not fit before the final-report reserve."""
+        if deadline is None:
+            return False
+        remaining = deadline - time.monotonic() - self._final_report_reserve
+        return remaining <= self.timings.seconds_per_turn
+
+    def _tool_time_budget(self, deadline: float | None) -> float | None:
+        """Cap tool calls so they end before the final-report reserve."""
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic() - self._final_report_reserve
+        return max(min(self._tool_timeout, remaining), 0.0)
+
+    def _tool_cutoff(self, deadline: float | None) -> float | None:
+        """Time by which every tool call must be done, queued calls included."""
+        if deadline is None:
+            return None
+        return deadline - self._final_report_reserve
+
+    def _log_timings(self, started: float, stop_reason: str | None) -> None:
+        """Log where the investigation's time went."""
+        timings = self.timings
+        logger.info(
+            "Investigation took %.1fs: prefetch=%.1fs model=%.1fs tools=%.1fs "
+            "turns=%d stop_reason=%s forced_final_report=%s",
+            time.monotonic() - started + timings.prefetch_seconds,
+            timings.prefetch_seconds,
+            timings.model_seconds,
+            timings.tool_seconds,
+            timings.turns,
+            stop_reason,
+            timings.forced_final_report,
+        )
+
+    def _record_turn(self, started: float) -> None:
+        """Record the latency of a converse call."""
+        if self._metrics is not None:
+            self._metrics.put("TurnLatency", (time.monotonic() - started) * 1000, "Milliseconds")
+
+    def _record_outcome(self, iterations: int, stop_reason: str | None, started: float) -> None:
+        """Record how many turns an investigation took and why it stopped."""
+        if self._metrics is None:
+            return
+        self._metrics.put("Iterations", iterations, "Count")
+        duration = time.monotonic() - started + self.timings.prefetch_seconds
+        self._metrics.put("InvestigationDuration", duration * 1000, "Milliseconds")
+        self._metrics.put("Investigations", 1, "Count", {"StopReason": stop_reason or "none"})
+
+    def _load_checkpoint(self, key: str | None) -> Checkpoint | None:
+        """Return the saved transcript for a key, if checkpointing is enabled."""
+        if self._checkpoint_store is None or key is None:
+            return None
+        try:
+            return self._checkpoint_store.load(key)
+        except Exception:
+            logger.warning("Could not load checkpoint %s", key, exc_info=True)
+            return None
+
+    def has_checkpoint(self, key: str | None) -> bool:
+        """Whether an investigation under ``key`` would resume from a checkpoint."""
+        return self._load_checkpoint(key) is not None
+
+    def _save_checkpoint(self, key: str | None, messages: list[dict], iteration: int) -> None:
+        """Persist the transcript after a completed turn; failures are only logged."""
+        if self._checkpoint_store is None or key is None:
+            return
+        try:
+            self._checkpoint_store.save(key, Checkpoint(messages, iteration, time.time()))
+        except Exception:
+            logger.warning("Could not save checkpoint %s", key, exc_info=True)
+
+    def _clear_checkpoint(self, key: str | None) -> None:
+        """Drop the checkpoint of a finished investigation."""
+        if self._checkpoint_store is None or key is None:
+            return
+        try:
+            self._checkpoint_store.delete(key)
+        except Exception:
+            logger.warning("Could not delete checkpoint %s", key, exc_info=True)
+
+    def investigate(
+        self,
+        alarm: AlarmEvent,
+        related_alarms: list[AlarmEvent] | None = None,
+        evidence: list[tuple[dict, dict]] | None = None,
+        deadline: float | None = None,
+        checkpoint_key: str | None = None,
+    ) -> str:
+        """Investigate an alarm, and any related alarms, and return a report.
+
+        ``evidence`` is the result of an earlier ``prefetch`` of the alarm;
+        it is gathered here when not given. ``deadline`` is a
+        ``time.monotonic()`` value: tool calls are cut short to fit it, and
+        once another tool turn would not fit, the model is asked for its
+        final report instead. With a checkpoint store, the transcript is
+        saved under ``checkpoint_key`` after every turn and a later call
+        with the same key resumes from the last completed turn.
+
+        ``usage``, ``timings`` and ``stop_reason`` describe this call only;
+        a prefetch run for it beforehand counts towards its timings.
+        """
+        self.usage = TokenUsage()
+        self.timings = TimeBreakdown(
+            prefetch_seconds=self.timings.prefetch_seconds if evidence is not None else 0.0
+        )
+        self.stop_reason = None
+        system = self._build_system_blocks(alarm, related_alarms)
+        tool_config = self._build_tool_config()
+
+        checkpoint = self._load_checkpoint(checkpoint_key)
+        if checkpoint is not None:
+            messages, first_iteration = checkpoint.messages, checkpoint.iteration
+            logger.info(
+                "Resuming investigation of %s at turn %d", alarm.alarm_name, first_iteration + 1
             )
+        else:
+            if evidence is None:
+                evidence = self.prefetch(alarm, deadline)
+            messages, first_iteration = self._initial_messages(evidence), 0
+            self._save_checkpoint(checkpoint_key, messages, first_iteration)
+
+        started = time.monotonic()
+        stop_reason = None
+        report = self.MAX_ITERATIONS_REPORT
+        for iteration in range(first_iteration, self._max_iterations):
+            final_turn = self._must_finish(deadline)
+            if final_turn:
+                self.timings.forced_final_report = True
+                messages[-1]["content"].append({"text": self.FINAL_REPORT_PROMPT})
 
+            self._compact(messages, iteration)
+            turn_started = time.monotonic()
+            response = self._converse(
+                self._converse_params(system, tool_config, messages), deadline
+            )
+            self.timings.model_seconds += time.monotonic() - turn_started
+            if response is None:
+                stop_reason = "deadline"
+                report = self.DEADLINE_REPORT
+                break
+            self.timings.turns += 1
+            self._record_turn(turn_started)
+
+            self._record_usage(response.get("usage"), iteration)
             stop_reason = response.get("stopReason")
             assistant_message = response["output"]["message"]
             messages.append(assistant_message)
 
             if stop_reason == "end_turn":
-                # Extract text from response
-                for content in assistant_message["content"]:
-                    if "text" in content:
-                        return content["text"]
-                return "Investigation complete but no report generated."
+                report = self._final_report(assistant_message)
+                break
+
+            if final_turn:
+                # The model asked for more tools anyway; keep whatever it wrote
+                texts = [c["text"] for c in assistant_message["content"] if "text" in c]
+                report = texts[0] if texts else self.DEADLINE_REPORT
+                break
 
             if stop_reason == "tool_use":
                 # Execute requested tools
-                tool_results = []
-                for content in assistant_message["content"]:
-                    if "toolUse" in content:
-                        tool_use = content["toolUse"]
-                        tool = self._registry.get(tool_use["name"])
-
-                        if tool:
-                            result = tool.execute(**tool_use["input"])
-                        else:
-                            result = {"error": f"Unknown tool: {tool_use['name']}"}
-
-                        tool_results.append(
-                            {
-                                "toolResult": {
-                                    "toolUseId": tool_use["toolUseId"],
-                                    "content": [{"json": result}],
-                                }
+                tool_uses = [
+                    content["toolUse"]
+                    for content in assistant_message["content"]
+                    if "toolUse" in content
+                ]
+                tools_started = time.monotonic()
+                tool_results = self._execute_tools(
+                    tool_uses, self._tool_time_budget(deadline), self._tool_cutoff(deadline)
+                )
+                self.timings.tool_seconds += time.monotonic() - tools_started
+
+                messages.append({"role": "user", "content": tool_results})
+                self._save_checkpoint(checkpoint_key, messages, iteration + 1)
+
+        self._clear_checkpoint(checkpoint_key)
+        self.stop_reason = stop_reason
+        self._log_timings(started, stop_reason)
+        self._record_outcome(self.timings.turns, stop_reason, started)
+        return report
+
+    def investigate_stream(
+        self, alarm: AlarmEvent, related_alarms: list[AlarmEvent] | None = None
+    ) -> Iterator[dict]:
+        """Investigate an alarm with converse_stream, yielding events as they arrive.
+
+        Events are dicts with a ``type`` of ``text`` (report text delta),
+        ``tool_use`` (a complete tool request, already started),
+        ``tool_result`` or ``report`` (the final report, always last).
+        """
+        self.usage = TokenUsage()
+        self.timings = TimeBreakdown()
+        system = self._build_system_blocks(alarm, related_alarms)
+        tool_config = self._build_tool_config()
+
+        messages = self._initial_messages(self.prefetch(alarm))
+
+        for iteration in range(self._max_iterations):
+            self._compact(messages, iteration)
+            response = self._client.converse_stream(
+                **self._converse_params(system, tool_config, messages)
+            )
+
+            blocks: dict[int, dict] = {}
+            tool_uses: list[dict] = []
+            submitted: list[ToolCall] = []
+            stop_reason = None
+
+            for event in response["stream"]:
+                if "contentBlockStart" in event:
+                    start = event["contentBlockStart"]
+                    if "toolUse" in start.get("start", {}):
+                        tool_use = start["start"]["toolUse"]
+                        blocks[start["contentBlockIndex"]] = {
+                            "toolUse": {
+                                "toolUseId": tool_use["toolUseId"],
+                                "name": tool_use["name"],
+                                "input": "",
                             }
-                        )
+                        }
+                elif "contentBlockDelta" in event:
+                    delta_event = event["contentBlockDelta"]
+                    delta = delta_event["delta"]
+                    index = delta_event["contentBlockIndex"]
+                    if "text" in delta:
+                        block = blocks.setdefault(index, {"text": ""})
+                        block["text"] += delta["text"]
+                        yield {"type": "text", "text": delta["text"]}
+                    elif "toolUse" in delta:
+                        blocks[index]["toolUse"]["input"] += delta["toolUse"].get("input", "")
+                elif "contentBlockStop" in event:
+                    block = blocks.get(event["contentBlockStop"]["contentBlockIndex"])
+                    if block and "toolUse" in block:
+                        # The input is complete, so the tool can start right away
+                        tool_use = block["toolUse"]
+                        tool_use["input"] = json.loads(tool_use["input"] or "{}")
+                        tool_uses.append(tool_use)
+                        submitted.append(self._submit_tool(tool_use))
+                        yield {"type": "tool_use", "tool_use": tool_use}
+                elif "messageStop" in event:
+                    stop_reason = event["messageStop"].get("stopReason")
+                elif "metadata" in event:
+                    self._record_usage(event["metadata"].get("usage"), iteration)
+
+            assistant_message = {
+                "role": "assistant",
+                "content": [blocks[index] for index in sorted(blocks)],
+            }
+            messages.append(assistant_message)
+
+            if stop_reason == "end_turn":
+                yield {"type": "report", "text": self._final_report(assistant_message)}
+                return
+
+            if tool_uses:
+                tool_results = self._collect_tool_results(tool_uses, submitted)
+                for block in tool_results:
+                    yield {"type": "tool_result", "tool_result": block["toolResult"]}
+
+                messages.append({"role": "user", "content": tool_results})
+
+        yield {"type": "report", "text": self.MAX_ITERATIONS_REPORT}
+
+
+class AsyncInvestigationAgent(InvestigationAgent):
+    """Agent that runs the investigation loop as coroutines.
+
+    Bedrock calls and tools run off the event loop, on executors sized for
+    many investigations at once, so a single process can drive dozens of
+    them concurrently. ``stop_reason`` and ``usage`` are kept per call and
+    returned by ``investigate_with_outcome`` instead of set on the agent.
+    """
+
+    async def _aexecute_tool(self, tool_use: dict, semaphore: asyncio.Semaphore) -> dict:
+        """Run a single tool call, converting failures into error results."""
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    self._registry.aexecute(tool_use["name"], tool_use["input"]),
+                    timeout=self._tool_timeout,
+                )
+            except TimeoutError:
+                return self._timeout_result(tool_use)
+            except Exception as e:
+                return {"status": "error", "error": str(e)}
+
+    async def investigate(
+        self, alarm: AlarmEvent, related_alarms: list[AlarmEvent] | None = None
+    ) -> str:
+        """Investigate an alarm, and any related alarms, and return a report."""
+        return (await self.investigate_with_outcome(alarm, related_alarms)).report
+
+    async def investigate_with_outcome(
+        self, alarm: AlarmEvent, related_alarms: list[AlarmEvent] | None = None
+    ) -> InvestigationOutcome:
+        """Investigate an alarm and return its report, stop reason and token usage."""
+        system = self._build_system_blocks(alarm, related_alarms)
+        tool_config = self._build_tool_config()
+        semaphore = asyncio.Semaphore(self._max_parallel_tools)
+
+        prefetch_uses = self._plan_prefetch(alarm)
+        prefetch_results = await asyncio.gather(
+            *(self._aexecute_tool(tool_use, semaphore) for tool_use in prefetch_uses)
+        )
+        messages = self._initial_messages(list(zip(prefetch_uses, prefetch_results)))
+
+        started = time.monotonic()
+        stop_reason = None
+        usage = TokenUsage()
+        loop = asyncio.get_running_loop()
+        for iteration in range(self._max_iterations):
+            self._compact(messages, iteration)
+            turn_started = time.monotonic()
+            response = await loop.run_in_executor(
+                _converse_executor,
+                functools.partial(
+                    self._client.converse, **self._converse_params(system, tool_config, messages)
+                ),
+            )
+            self._record_turn(turn_started)
+
+            self._record_usage(response.get("usage"), iteration, usage)
+            stop_reason = response.get("stopReason")
+            assistant_message = response["output"]["message"]
+            messages.append(assistant_message)
+
+            if stop_reason == "end_turn":
+                self._record_outcome(iteration + 1, stop_reason, started)
+                return InvestigationOutcome(
+                    self._final_report(assistant_message), stop_reason, usage
+                )
+
+            if stop_reason == "tool_use":
+                tool_uses = [
+                    content["toolUse"]
+                    for content in assistant_message["content"]
+                    if "toolUse" in content
+                ]
+                results = await asyncio.gather(
+                    *(self._aexecute_tool(tool_use, semaphore) for tool_use in tool_uses)
+                )
+                tool_results = [
+                    self._tool_result_block(tool_use, result)
+                    for tool_use, result in zip(tool_uses, results)
+                ]
 
                 messages.append({"role": "user", "content": tool_results})
 
-        return "Investigation reached max iterations. Partial analysis may be available above."
+        self._record_outcome(self._max_iterations, stop_reason, started)
+        return InvestigationOutcome(self.MAX_ITERATIONS_REPORT, stop_reason, usage)
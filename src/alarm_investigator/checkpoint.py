@@ -0,0 +1,133 @@
+"""Checkpoints of investigation transcripts, so a retried event can resume."""
+
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from contextlib import closing
+from dataclasses import dataclass
+
+from alarm_investigator.models import AlarmEvent
+from alarm_investigator.storage import SQLiteStore, hashed_path, write_atomic
+
+
+def checkpoint_key(alarm: AlarmEvent) -> str:
+    """Key shared by retries of the same event.
+
+    EventBridge keeps the event ``id`` across retries; without one, the
+    alarm and the timestamp of its state change identify the event.
+    """
+    event_id = alarm.raw_event.get("id")
+    if event_id:
+        return f"event:{event_id}"
+    state_timestamp = alarm.raw_event.get("detail", {}).get("state", {}).get("timestamp", "")
+    return "|".join(
+        [alarm.account_id, alarm.region, alarm.alarm_name, alarm.state.value, state_timestamp]
+    )
+
+
+@dataclass
+class Checkpoint:
+    """The conversation after the last completed turn."""
+
+    messages: list[dict]
+    iteration: int
+    saved_at: float
+
+
+class CheckpointStore(ABC):
+    """Storage for investigation checkpoints."""
+
+    @abstractmethod
+    def load(self, key: str) -> Checkpoint | None:
+        """Return the checkpoint for a key, if present."""
+        pass
+
+    @abstractmethod
+    def save(self, key: str, checkpoint: Checkpoint) -> None:
+        """Store a checkpoint, replacing any earlier one for the key."""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove the checkpoint for a key."""
+        pass
+
+
+def _encode(checkpoint: Checkpoint) -> str:
+    return json.dumps(
+        {
+            "messages": checkpoint.messages,
+            "iteration": checkpoint.iteration,
+            "saved_at": checkpoint.saved_at,
+        },
+        default=str,
+    )
+
+
+def _decode(data: str) -> Checkpoint:
+    value = json.loads(data)
+    return Checkpoint(
+        messages=value["messages"], iteration=value["iteration"], saved_at=value["saved_at"]
+    )
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Store with one JSON file per key, e.g. under /tmp in Lambda."""
+
+    def __init__(self, directory: str, max_age_seconds: float = 3600, clock=time.time):
+        self._directory = directory
+        self._max_age_seconds = max_age_seconds
+        self._clock = clock
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self, key: str) -> Checkpoint | None:
+        try:
+            with open(hashed_path(self._directory, key)) as f:
+                checkpoint = _decode(f.read())
+        except (OSError, ValueError, KeyError):
+            return None
+        if self._clock() - checkpoint.saved_at > self._max_age_seconds:
+            return None
+        return checkpoint
+
+    def save(self, key: str, checkpoint: Checkpoint) -> None:
+        write_atomic(hashed_path(self._directory, key), _encode(checkpoint))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(hashed_path(self._directory, key))
+        except FileNotFoundError:
+            pass
+
+
+class SQLiteCheckpointStore(SQLiteStore, CheckpointStore):
+    """Checkpoints in a SQLite table, for retries landing on another process."""
+
+    SCHEMA = "CREATE TABLE IF NOT EXISTS checkpoints (key TEXT PRIMARY KEY, data TEXT NOT NULL)"
+
+    def __init__(self, path: str, max_age_seconds: float = 3600, clock=time.time):
+        self._max_age_seconds = max_age_seconds
+        self._clock = clock
+        super().__init__(path)
+
+    def load(self, key: str) -> Checkpoint | None:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT data FROM checkpoints WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        checkpoint = _decode(row[0])
+        if self._clock() - checkpoint.saved_at > self._max_age_seconds:
+            return None
+        return checkpoint
+
+    def save(self, key: str, checkpoint: Checkpoint) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (key, data) VALUES (?, ?)",
+                (key, _encode(checkpoint)),
+            )
+
+    def delete(self, key: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM checkpoints WHERE key = ?", (key,))
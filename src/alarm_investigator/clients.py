@@ -0,0 +1,80 @@
+"""Shared AWS client pool reused across warm Lambda invocations."""
+
+import threading
+
+import boto3
+from botocore.config import Config
+
+from alarm_investigator.ratelimit import RateLimiter, get_rate_limiter
+
+DEFAULT_CLIENT_CONFIG = Config(
+    max_pool_connections=25,
+    tcp_keepalive=True,
+    # Exponential backoff with full jitter between retries
+    retries={"mode": "standard", "max_attempts": 5},
+)
+
+
+class ClientPool:
+    """Region-keyed pool of boto3 clients built from one shared session."""
+
+    def __init__(
+        self,
+        session=None,
+        config: Config | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        self._session = session
+        self._config = config or DEFAULT_CLIENT_CONFIG
+        self._rate_limiter = rate_limiter
+        self._clients: dict[tuple[str, str], object] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, service: str, region: str):
+        """Get a client for a service and region, creating it on first use."""
+        key = (service, region)
+        client = self._clients.get(key)
+        if client is not None:
+            self.hits += 1
+            return client
+
+        # boto3 sessions are not thread-safe, so creation is serialized
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.hits += 1
+                return client
+
+            if self._session is None:
+                self._session = boto3.session.Session()
+            client = self._session.client(service, region_name=region, config=self._config)
+            if self._rate_limiter is not None:
+                self._rate_limiter.attach(client)
+            self._clients[key] = client
+            self.misses += 1
+            return client
+
+    def stats(self) -> dict:
+        """Return pool hit/miss counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "clients": len(self._clients),
+        }
+
+    def clear(self) -> None:
+        """Drop all cached clients and reset counters."""
+        with self._lock:
+            self._clients.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_pool = ClientPool(rate_limiter=get_rate_limiter())
+
+
+def get_client_pool() -> ClientPool:
+    """Return the process-wide client pool."""
+    return _pool
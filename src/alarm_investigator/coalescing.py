@@ -0,0 +1,116 @@
+"""Coalescing of alarm storms into one investigation per resource burst."""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from alarm_investigator.models import AlarmEvent, AlarmState
+
+# Dimensions that identify a resource rather than a facet of one (e.g. a disk path)
+RESOURCE_DIMENSIONS = (
+    "InstanceId",
+    "AutoScalingGroupName",
+    "DBInstanceIdentifier",
+    "DBClusterIdentifier",
+    "FunctionName",
+    "ClusterName",
+    "ServiceName",
+    "LoadBalancer",
+    "TargetGroup",
+    "TableName",
+    "QueueName",
+)
+
+
+def resource_fingerprint(alarm: AlarmEvent) -> str:
+    """Identify the resource an alarm is about.
+
+    Uses the resource-identifying dimensions when present, otherwise all
+    dimensions; an alarm without dimensions is only its own resource.
+    """
+    dimensions = alarm.dimensions or {}
+    identity = {k: v for k, v in dimensions.items() if k in RESOURCE_DIMENSIONS} or dimensions
+    if not identity:
+        identity = {"AlarmName": alarm.alarm_name}
+    parts = [alarm.account_id, alarm.region]
+    parts.extend(f"{key}={identity[key]}" for key in sorted(identity))
+    return "|".join(parts)
+
+
+def event_time(alarm: AlarmEvent) -> datetime | None:
+    """Return when the alarm changed state, from the EventBridge envelope."""
+    detail = alarm.raw_event.get("detail", {})
+    for value in (detail.get("state", {}).get("timestamp"), alarm.raw_event.get("time")):
+        if value:
+            try:
+                parsed = datetime.fromisoformat(value)
+            except ValueError:
+                continue
+            return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    return None
+
+
+@dataclass
+class AlarmGroup:
+    """Alarms for one resource that are investigated together."""
+
+    fingerprint: str
+    alarms: list[AlarmEvent] = field(default_factory=list)
+
+    @property
+    def primary(self) -> AlarmEvent:
+        """The alarm the investigation is framed around: the first in ALARM state."""
+        for alarm in self.alarms:
+            if alarm.state == AlarmState.ALARM:
+                return alarm
+        return self.alarms[0]
+
+    @property
+    def related(self) -> list[AlarmEvent]:
+        """The other alarms in the group."""
+        primary = self.primary
+        return [alarm for alarm in self.alarms if alarm is not primary]
+
+
+class AlarmCoalescer:
+    """Groups alarm events by resource fingerprint within a time window.
+
+    A group opens with its earliest event and takes every later event for
+    the same resource that arrives within ``window_seconds`` of it. Events
+    without a timestamp are never split off by the window.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 60,
+        fingerprint: Callable[[AlarmEvent], str] = resource_fingerprint,
+    ):
+        self._window_seconds = window_seconds
+        self._fingerprint = fingerprint
+
+    def group(self, alarms: list[AlarmEvent]) -> list[AlarmGroup]:
+        """Group alarms, returning groups in order of their first event."""
+        epoch = datetime.min.replace(tzinfo=timezone.utc)
+        timed = [(event_time(alarm), i, alarm) for i, alarm in enumerate(alarms)]
+        timed.sort(key=lambda t: (t[0] or epoch, t[1]))
+
+        groups: list[AlarmGroup] = []
+        open_groups: dict[str, tuple[datetime | None, AlarmGroup]] = {}
+        for at, _, alarm in timed:
+            key = self._fingerprint(alarm)
+            current = open_groups.get(key)
+            if current is not None:
+                opened_at, group = current
+                if (
+                    at is None
+                    or opened_at is None
+                    or ((at - opened_at).total_seconds() <= self._window_seconds)
+                ):
+                    group.alarms.append(alarm)
+                    continue
+
+            group = AlarmGroup(fingerprint=key, alarms=[alarm])
+            open_groups[key] = (at, group)
+            groups.append(group)
+
+        return groups
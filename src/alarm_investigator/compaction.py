@@ -0,0 +1,110 @@
+"""Conversation compaction to bound the size of each Bedrock request."""
+
+import json
+from dataclasses import dataclass
+
+BYTES_PER_TOKEN = 4  # rough average for JSON-heavy English text
+
+
+def estimate_tokens(num_bytes: int) -> int:
+    """Estimate the token count of a payload from its size."""
+    return num_bytes // BYTES_PER_TOKEN
+
+
+def _size(value) -> int:
+    return len(json.dumps(value, default=str))
+
+
+@dataclass
+class CompactionStats:
+    """What a compaction pass removed from the conversation."""
+
+    bytes_before: int = 0
+    bytes_after: int = 0
+    digested: int = 0
+    elided: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def tokens_saved(self) -> int:
+        return estimate_tokens(self.bytes_saved)
+
+
+class ConversationCompactor:
+    """Shrinks tool results the model has already read.
+
+    Once the estimated conversation size exceeds the token budget, consumed
+    tool results are replaced (oldest first) by compact digests, and then,
+    if still needed, by short elided references. The latest tool results
+    are never touched, and every toolResult keeps its toolUseId.
+    """
+
+    def __init__(self, token_budget: int = 20_000, max_string_length: int = 200):
+        self._token_budget = token_budget
+        self._max_string_length = max_string_length
+
+    def compact(self, messages: list[dict]) -> CompactionStats:
+        """Compact the conversation in place and report the savings."""
+        total = _size(messages)
+        stats = CompactionStats(bytes_before=total, bytes_after=total)
+        if estimate_tokens(total) <= self._token_budget:
+            return stats
+
+        # Tool results in the last message have not been seen by the model yet
+        blocks = [
+            block["toolResult"]
+            for message in messages[:-1]
+            if message["role"] == "user"
+            for block in message["content"]
+            if "toolResult" in block
+        ]
+
+        for replace, counter in ((self._digest_result, "digested"), (self._elide, "elided")):
+            for result in blocks:
+                if estimate_tokens(total) <= self._token_budget:
+                    break
+                new_content = replace(result)
+                if new_content is None:
+                    continue
+                total += _size(new_content) - _size(result["content"])
+                result["content"] = new_content
+                setattr(stats, counter, getattr(stats, counter) + 1)
+
+        stats.bytes_after = total
+        return stats
+
+    def _digest_result(self, result: dict) -> list[dict] | None:
+        """Replace raw JSON output with a digest of its scalar fields."""
+        content = result["content"]
+        if len(content) != 1 or "json" not in content[0] or content[0]["json"].get("compacted"):
+            return None
+        return [{"json": {**self._digest(content[0]["json"]), "compacted": True}}]
+
+    def _elide(self, result: dict) -> list[dict] | None:
+        """Replace a result with a reference to the elided output."""
+        content = result["content"]
+        if len(content) == 1 and content[0].get("text", "").startswith("[elided"):
+            return None
+        return [
+            {
+                "text": (
+                    f"[elided tool result {result['toolUseId']}: already analyzed, "
+                    f"{_size(content)} bytes removed to save context]"
+                )
+            }
+        ]
+
+    def _digest(self, value, depth: int = 0):
+        """Keep scalars and small structures; summarize lists and long strings."""
+        if isinstance(value, dict):
+            if depth >= 2:
+                return f"<{len(value)} fields elided>"
+            return {key: self._digest(val, depth + 1) for key, val in value.items()}
+        if isinstance(value, list):
+            return f"<{len(value)} items elided>"
+        if isinstance(value, str) and len(value) > self._max_string_length:
+            return value[: self._max_string_length] + "..."
+        return value
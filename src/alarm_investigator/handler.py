@@ -1,20 +1,253 @@
 """Lambda handler for Alarm Investigator."""
 
 import json
+import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import boto3
 
 from alarm_investigator.agent import InvestigationAgent
+from alarm_investigator.checkpoint import CheckpointStore, FileCheckpointStore, checkpoint_key
+from alarm_investigator.clients import ClientPool, get_client_pool
+from alarm_investigator.coalescing import AlarmCoalescer, AlarmGroup
+from alarm_investigator.memoization import ReportMemo, evidence_snapshot
+from alarm_investigator.metrics import DEFAULT_NAMESPACE, MetricsRecorder
 from alarm_investigator.models import AlarmEvent
 from alarm_investigator.output import ReportFormatter
+from alarm_investigator.prefetch import EvidenceRouter
+from alarm_investigator.ratelimit import get_rate_limiter
+from alarm_investigator.rules import FastPathRules, RuleAction
+from alarm_investigator.singleflight import DynamoDBFlightStore, SingleFlight, alarm_fingerprint
 from alarm_investigator.tools.base import ToolRegistry
-from alarm_investigator.tools.cloudwatch import GetMetricsTool
+from alarm_investigator.tools.cache import ToolCache
+from alarm_investigator.tools.circuit import get_tool_guard
+from alarm_investigator.tools.cloudwatch import (
+    FindCorrelatedMetricsTool,
+    GetMetricsBatchTool,
+    GetMetricsTool,
+    MetricSeriesCache,
+)
 from alarm_investigator.tools.ec2 import DescribeEC2InstanceTool
 from alarm_investigator.tools.ecs import DescribeECSServiceTool
 from alarm_investigator.tools.lambda_ import DescribeLambdaFunctionTool
 from alarm_investigator.tools.rds import DescribeRDSInstanceTool
 
+logger = logging.getLogger(__name__)
+
+# Time kept back from the Lambda timeout for formatting and notifications
+DEADLINE_MARGIN_SECONDS = 10
+
+# Share of the remaining time a duplicate may spend waiting on the leader's
+# investigation, so it can still run its own if the leader never finishes
+FOLLOWER_WAIT_FRACTION = 0.5
+
+# Describe results and metric series are reused across warm invocations
+_tool_cache = ToolCache()
+_series_caches: dict[str, MetricSeriesCache] = {}
+_report_memo = ReportMemo()
+_fast_path = FastPathRules()
+_single_flight: SingleFlight | None = None
+_checkpoint_store: CheckpointStore | None = None
+
+
+def _get_single_flight() -> SingleFlight:
+    """Return the process-wide single-flight lock, shared through DynamoDB if configured."""
+    global _single_flight
+    if _single_flight is None:
+        table_name = os.environ.get("SINGLE_FLIGHT_TABLE")
+        store = None
+        if table_name:
+            store = DynamoDBFlightStore(boto3.resource("dynamodb").Table(table_name))
+        _single_flight = SingleFlight(store=store)
+    return _single_flight
+
+
+def _get_checkpoint_store() -> CheckpointStore | None:
+    """Return the checkpoint store if CHECKPOINT_DIR is configured."""
+    global _checkpoint_store
+    directory = os.environ.get("CHECKPOINT_DIR")
+    if directory and _checkpoint_store is None:
+        _checkpoint_store = FileCheckpointStore(directory)
+    return _checkpoint_store if directory else None
+
+
+def _build_registry(
+    alarm: AlarmEvent, pool: ClientPool, metrics: MetricsRecorder | None = None
+) -> ToolRegistry:
+    """Register tools for the alarm's account and region; each is built on first use."""
+    region = alarm.region
+    cache_namespace = f"{alarm.account_id}:{region}"
+    series_cache = _series_caches.setdefault(cache_namespace, MetricSeriesCache())
+    registry = ToolRegistry(
+        cache=_tool_cache,
+        cache_namespace=cache_namespace,
+        guard=get_tool_guard(),
+        metrics=metrics,
+    )
+    registry.register_factory(
+        GetMetricsTool,
+        lambda: GetMetricsTool(
+            cloudwatch_client=pool.get("cloudwatch", region), series_cache=series_cache
+        ),
+    )
+    registry.register_factory(
+        GetMetricsBatchTool,
+        lambda: GetMetricsBatchTool(cloudwatch_client=pool.get("cloudwatch", region)),
+    )
+    registry.register_factory(
+        FindCorrelatedMetricsTool,
+        lambda: FindCorrelatedMetricsTool(cloudwatch_client=pool.get("cloudwatch", region)),
+    )
+    registry.register_factory(
+        DescribeEC2InstanceTool,
+        lambda: DescribeEC2InstanceTool(ec2_client=pool.get("ec2", region)),
+    )
+    registry.register_factory(
+        DescribeRDSInstanceTool,
+        lambda: DescribeRDSInstanceTool(rds_client=pool.get("rds", region)),
+    )
+    registry.register_factory(
+        DescribeLambdaFunctionTool,
+        lambda: DescribeLambdaFunctionTool(lambda_client=pool.get("lambda", region)),
+    )
+    registry.register_factory(
+        DescribeECSServiceTool,
+        lambda: DescribeECSServiceTool(ecs_client=pool.get("ecs", region)),
+    )
+    return registry
+
+
+def _build_agent(
+    alarm: AlarmEvent, pool: ClientPool, metrics: MetricsRecorder | None = None
+) -> InvestigationAgent:
+    """Build an investigation agent for the alarm's region."""
+    return InvestigationAgent(
+        bedrock_client=pool.get("bedrock-runtime", alarm.region),
+        tool_registry=_build_registry(alarm, pool, metrics),
+        evidence_router=EvidenceRouter(),
+        checkpoint_store=_get_checkpoint_store(),
+        metrics=metrics,
+    )
+
+
+def _build_metrics(alarm: AlarmEvent) -> MetricsRecorder:
+    """Build the recorder for one investigation's embedded metrics."""
+    return MetricsRecorder(
+        namespace=os.environ.get("METRICS_NAMESPACE", DEFAULT_NAMESPACE),
+        properties={
+            "AlarmName": alarm.alarm_name,
+            "AccountId": alarm.account_id,
+            "Region": alarm.region,
+        },
+    )
+
+
+def _notify(alarm: AlarmEvent, analysis: str, pool: ClientPool) -> None:
+    """Send the report to SNS if a topic is configured."""
+    sns_topic_arn = os.environ.get("SNS_TOPIC_ARN")
+    if sns_topic_arn:
+        sns_client = pool.get("sns", alarm.region)
+        email_report = ReportFormatter().format_email(alarm, analysis)
+        sns_client.publish(
+            TopicArn=sns_topic_arn,
+            Subject=email_report["subject"][:100],  # SNS subject limit
+            Message=email_report["body"],
+        )
+
+
+def _deadline(context) -> float | None:
+    """Turn the invocation's remaining time into a ``time.monotonic()`` deadline."""
+    get_remaining = getattr(context, "get_remaining_time_in_millis", None)
+    if get_remaining is None:
+        return None
+    return time.monotonic() + get_remaining() / 1000 - DEADLINE_MARGIN_SECONDS
+
+
+def _follower_wait(deadline: float | None) -> float | None:
+    """How long to wait on a concurrent investigation before running our own."""
+    if deadline is None:
+        return None
+    return max((deadline - time.monotonic()) * FOLLOWER_WAIT_FRACTION, 0.0)
+
+
+def _handle_fast_path(alarm: AlarmEvent, pool: ClientPool) -> dict | None:
+    """Handle an alarm without the agent when a fast-path rule matches.
+
+    Returns the response report, or None if the alarm needs an investigation.
+    """
+    decision = _fast_path.evaluate(alarm)
+    if decision is None:
+        return None
+
+    logger.info("Fast path %s (%s) for %s", decision.rule, decision.action.value, alarm.alarm_name)
+    if decision.action == RuleAction.SKIP:
+        return {
+            "alarm_name": alarm.alarm_name,
+            "state": alarm.state.value,
+            "skipped": True,
+            "fast_path": decision.rule,
+        }
+
+    _notify(alarm, decision.summary, pool)
+    report = ReportFormatter().format_json(alarm, decision.summary)
+    report["fast_path"] = decision.rule
+    return report
+
+
+def _investigate(
+    alarm: AlarmEvent,
+    pool: ClientPool,
+    related_alarms: list[AlarmEvent] | None = None,
+    deadline: float | None = None,
+) -> dict:
+    """Investigate an alarm and notify for it and any related alarms.
+
+    A recent report for the same alarm is reused, without calling the
+    model, when the prefetched evidence shows no material change; a retry
+    with a checkpoint skips both the prefetch and the memo. Turn,
+    token and tool metrics are written as embedded metrics when it ends.
+    """
+    related_alarms = related_alarms or []
+    metrics = _build_metrics(alarm)
+    agent = _build_agent(alarm, pool, metrics)
+    key = checkpoint_key(alarm)
+    try:
+        evidence = snapshot = report = None
+        # A retry resumes its checkpoint, whose transcript already holds the evidence
+        if not agent.has_checkpoint(key):
+            evidence = agent.prefetch(alarm, deadline)
+            snapshot = evidence_snapshot(evidence)
+            report = _report_memo.lookup(alarm, snapshot)
+
+        if report is not None:
+            logger.info("Reused report for %s from %s", alarm.alarm_name, report["reused_from"])
+            metrics.put("ReportsReused", 1, "Count")
+            # Followers trust this field to know which alarms were notified this time
+            report["coalesced_with"] = [a.alarm_name for a in related_alarms]
+            analysis = report["analysis"]
+        else:
+            analysis = agent.investigate(
+                alarm,
+                related_alarms,
+                evidence=evidence,
+                deadline=deadline,
+                checkpoint_key=key,
+            )
+            report = ReportFormatter().format_json(
+                alarm, analysis, coalesced_with=[a.alarm_name for a in related_alarms]
+            )
+            # Reports cut short by the iteration limit or deadline are not worth reusing
+            if agent.stop_reason == "end_turn" and snapshot is not None:
+                _report_memo.store(alarm, report, snapshot)
+    finally:
+        metrics.flush()
+
+    for notified in [alarm, *related_alarms]:
+        _notify(notified, analysis, pool)
+    return report
+
 
 def lambda_handler(event: dict, context) -> dict:
     """Main Lambda entry point."""
@@ -27,43 +260,111 @@ def lambda_handler(event: dict, context) -> dict:
             "body": json.dumps({"error": str(e)}),
         }
 
-    # Initialize AWS clients
-    region = alarm.region
-    bedrock_client = boto3.client("bedrock-runtime", region_name=region)
-    cloudwatch_client = boto3.client("cloudwatch", region_name=region)
-    ec2_client = boto3.client("ec2", region_name=region)
-    rds_client = boto3.client("rds", region_name=region)
-    lambda_client = boto3.client("lambda", region_name=region)
-    ecs_client = boto3.client("ecs", region_name=region)
-
-    # Register tools
-    registry = ToolRegistry()
-    registry.register(GetMetricsTool(cloudwatch_client=cloudwatch_client))
-    registry.register(DescribeEC2InstanceTool(ec2_client=ec2_client))
-    registry.register(DescribeRDSInstanceTool(rds_client=rds_client))
-    registry.register(DescribeLambdaFunctionTool(lambda_client=lambda_client))
-    registry.register(DescribeECSServiceTool(ecs_client=ecs_client))
-
-    # Run investigation
-    agent = InvestigationAgent(bedrock_client=bedrock_client, tool_registry=registry)
-    analysis = agent.investigate(alarm)
-
-    # Format output
-    formatter = ReportFormatter()
-    report = formatter.format_json(alarm, analysis)
-
-    # Send SNS notification if configured
-    sns_topic_arn = os.environ.get("SNS_TOPIC_ARN")
-    if sns_topic_arn:
-        sns_client = boto3.client("sns", region_name=region)
-        email_report = formatter.format_email(alarm, analysis)
-        sns_client.publish(
-            TopicArn=sns_topic_arn,
-            Subject=email_report["subject"][:100],  # SNS subject limit
-            Message=email_report["body"],
+    deadline = _deadline(context)
+
+    # AWS clients are reused across warm invocations
+    pool = get_client_pool()
+
+    report = _handle_fast_path(alarm, pool)
+    if report is None:
+        # Duplicate deliveries reuse a concurrent investigation of the same alarm
+        report, shared = _get_single_flight().run(
+            alarm_fingerprint(alarm),
+            lambda: _investigate(alarm, pool, deadline=deadline),
+            wait_timeout=_follower_wait(deadline),
         )
+        if shared:
+            logger.info("Reused concurrent investigation of %s", alarm.alarm_name)
+
+    logger.info(
+        "Client pool stats: %s; rate limiter: %s; open circuits: %s",
+        pool.stats(),
+        get_rate_limiter().stats(),
+        get_tool_guard().open_circuits(),
+    )
+    get_rate_limiter().flush_metrics()
 
     return {
         "statusCode": 200,
         "body": json.dumps(report),
     }
+
+
+def sqs_handler(event: dict, context) -> dict:
+    """Entry point for SQS batches of EventBridge alarm events.
+
+    Alarms handled by a fast-path rule never reach the agent; the rest are
+    coalesced into one investigation per resource, and groups are
+    investigated concurrently on a bounded pool. Records whose
+    investigation fails are returned as ``batchItemFailures`` so SQS
+    redelivers only those; records that cannot be parsed would fail the
+    same way on every delivery, so they are logged and dropped.
+    """
+    deadline = _deadline(context)
+    pool = get_client_pool()
+    failures = []
+    alarms: list[AlarmEvent] = []
+    message_ids: dict[int, str] = {}
+
+    for record in event.get("Records", []):
+        message_id = record["messageId"]
+        try:
+            alarm = AlarmEvent.from_eventbridge(json.loads(record["body"]))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error("Dropping unparseable record %s: %s", message_id, e)
+            continue
+
+        try:
+            if _handle_fast_path(alarm, pool) is not None:
+                continue
+        except Exception:
+            logger.exception("Fast path failed for %s", alarm.alarm_name)
+            failures.append(message_id)
+            continue
+
+        alarms.append(alarm)
+        message_ids[id(alarm)] = message_id
+
+    window = float(os.environ.get("COALESCE_WINDOW_SECONDS", "60"))
+    groups = AlarmCoalescer(window_seconds=window).group(alarms)
+    single_flight = _get_single_flight()
+
+    def investigate_group(group: AlarmGroup) -> None:
+        report, shared = single_flight.run(
+            alarm_fingerprint(group.primary),
+            lambda: _investigate(group.primary, pool, group.related, deadline),
+            wait_timeout=_follower_wait(deadline),
+        )
+        if shared:
+            logger.info("Reused concurrent investigation of %s", group.primary.alarm_name)
+            # The leader notified for its own group; cover the alarms only ours holds
+            covered = set(report.get("coalesced_with", []))
+            for alarm in group.related:
+                if alarm.alarm_name not in covered:
+                    _notify(alarm, report["analysis"], pool)
+
+    max_workers = int(os.environ.get("MAX_CONCURRENT_INVESTIGATIONS", "4"))
+    if groups:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(groups))) as executor:
+            futures = {executor.submit(investigate_group, group): group for group in groups}
+            for future in as_completed(futures):
+                group = futures[future]
+                try:
+                    future.result()
+                except Exception:
+                    logger.exception("Investigation failed for %s", group.fingerprint)
+                    failures.extend(message_ids[id(alarm)] for alarm in group.alarms)
+
+    logger.info(
+        "Processed %d alarms in %d investigations, %d failed; client pool stats: %s; "
+        "rate limiter: %s; open circuits: %s",
+        len(alarms),
+        len(groups),
+        len(failures),
+        pool.stats(),
+        get_rate_limiter().stats(),
+        get_tool_guard().open_circuits(),
+    )
+    get_rate_limiter().flush_metrics()
+
+    return {"batchItemFailures": [{"itemIdentifier": message_id} for message_id in failures]}
@@ -0,0 +1,125 @@
+"""Reuse of recent investigation reports for flapping alarms."""
+
+import json
+import time
+
+from alarm_investigator.models import AlarmEvent
+from alarm_investigator.tools.cache import CacheBackend, CacheEntry, InMemoryCacheBackend, ToolCache
+
+# Result fields that change between calls without the resource changing
+VOLATILE_FIELDS = ("status", "cache")
+METRIC_STATISTICS = ("avg", "max")
+
+
+def evidence_snapshot(evidence: list[tuple[dict, dict]]) -> dict:
+    """Reduce prefetched evidence to what decides whether a report still holds.
+
+    Metric results keep their average and maximum; describe results keep
+    the resource configuration. Failed lookups are left out.
+    """
+    snapshot = {}
+    for tool_use, result in evidence:
+        if result.get("status") != "success":
+            continue
+        key = f"{tool_use['name']} {json.dumps(tool_use['input'], sort_keys=True)}"
+        if "statistics" in result:
+            statistics = result["statistics"]
+            snapshot[key] = {
+                "metric": {s: statistics[s] for s in METRIC_STATISTICS if s in statistics}
+            }
+        else:
+            snapshot[key] = {
+                "config": {k: v for k, v in result.items() if k not in VOLATILE_FIELDS}
+            }
+    return json.loads(json.dumps(snapshot, default=str))
+
+
+def has_material_change(before: dict, after: dict, tolerance: float = 0.2) -> bool:
+    """Compare two snapshots.
+
+    Any configuration difference is material; metric statistics are
+    material when they moved by more than ``tolerance`` relative to before.
+    """
+    if before.keys() != after.keys():
+        return True
+    for key, old in before.items():
+        new = after[key]
+        if "config" in old or "config" in new:
+            if old != new:
+                return True
+            continue
+        old_metric, new_metric = old.get("metric", {}), new.get("metric", {})
+        if old_metric.keys() != new_metric.keys():
+            return True
+        for statistic, old_value in old_metric.items():
+            scale = max(abs(old_value), 1e-9)
+            if abs(new_metric[statistic] - old_value) / scale > tolerance:
+                return True
+    return False
+
+
+class ReportMemo:
+    """Remembers reports per alarm, state, dimensions and coarse time bucket.
+
+    A stored report is reused for the same alarm in the same bucket as
+    long as a fresh evidence snapshot shows no material change. Alarms
+    without evidence to compare (an empty snapshot) are never memoized.
+    """
+
+    REUSED_NOTE = "_Reused from {timestamp}: no material change in metrics or configuration._"
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        bucket_seconds: float = 3600,
+        tolerance: float = 0.2,
+        clock=time.time,
+    ):
+        self._backend = backend or InMemoryCacheBackend(max_entries=256)
+        self._bucket_seconds = bucket_seconds
+        self._tolerance = tolerance
+        self._clock = clock
+
+    def key(self, alarm: AlarmEvent) -> str:
+        """Build the memo key for an alarm in the current time bucket."""
+        return ToolCache.make_key(
+            f"{alarm.account_id}:{alarm.region}",
+            "investigation",
+            {
+                "alarm_name": alarm.alarm_name,
+                "state": alarm.state.value,
+                "dimensions": alarm.dimensions or {},
+                "bucket": int(self._clock() // self._bucket_seconds),
+            },
+        )
+
+    def lookup(self, alarm: AlarmEvent, snapshot: dict) -> dict | None:
+        """Return a copy of the stored report marked as reused, if it still holds."""
+        if not snapshot:
+            return None
+        entry = self._backend.get(self.key(alarm))
+        if entry is None or entry.expires_at <= self._clock():
+            return None
+        if has_material_change(entry.value["snapshot"], snapshot, self._tolerance):
+            return None
+
+        report = dict(entry.value["report"])
+        reused_from = report.get("timestamp")
+        note = self.REUSED_NOTE.format(timestamp=reused_from)
+        report["analysis"] = f"{note}\n\n{report['analysis']}"
+        report["reused_from"] = reused_from
+        return report
+
+    def store(self, alarm: AlarmEvent, report: dict, snapshot: dict) -> None:
+        """Remember a fresh report with the evidence snapshot it was based on."""
+        if not snapshot:
+            return
+        now = self._clock()
+        self._backend.set(
+            self.key(alarm),
+            CacheEntry(
+                value={"report": report, "snapshot": snapshot},
+                stored_at=now,
+                expires_at=now + self._bucket_seconds,
+            ),
+        )
@@ -0,0 +1,110 @@
+"""Investigation telemetry emitted as CloudWatch Embedded Metric Format log lines."""
+
+import json
+import sys
+import threading
+import time
+from collections.abc import Callable
+
+DEFAULT_NAMESPACE = "AlarmInvestigator"
+
+# CloudWatch accepts at most this many values per metric in one EMF document
+MAX_VALUES_PER_METRIC = 100
+
+
+def _write_stdout(line: str) -> None:
+    # EMF lines must reach the log stream unprefixed, so bypass logging
+    sys.stdout.write(line + "\n")
+    sys.stdout.flush()
+
+
+class MetricsRecorder:
+    """Buffers metric values in memory and writes them as EMF documents on flush.
+
+    Recording only appends to a list, so it is cheap enough for every turn
+    and tool call; serialization happens once, in ``flush``. Values are
+    grouped into one document per set of extra dimensions, on top of the
+    recorder's base ``dimensions``. ``properties`` are written to every
+    document as searchable, non-metric fields.
+    """
+
+    def __init__(
+        self,
+        namespace: str = DEFAULT_NAMESPACE,
+        dimensions: dict[str, str] | None = None,
+        properties: dict | None = None,
+        emit: Callable[[str], None] = _write_stdout,
+        clock=time.time,
+    ):
+        self._namespace = namespace
+        self._dimensions = dimensions or {}
+        self.properties = dict(properties or {})
+        self._emit = emit
+        self._clock = clock
+        # (extra dimensions) -> metric name -> (unit, values)
+        self._values: dict[tuple, dict[str, tuple[str, list[float]]]] = {}
+        self._lock = threading.Lock()
+
+    def put(
+        self,
+        name: str,
+        value: float,
+        unit: str = "None",
+        dimensions: dict[str, str] | None = None,
+    ) -> None:
+        """Record one value of a metric, optionally under extra dimensions."""
+        key = tuple(sorted(dimensions.items())) if dimensions else ()
+        with self._lock:
+            metrics = self._values.setdefault(key, {})
+            if name not in metrics:
+                metrics[name] = (unit, [])
+            metrics[name][1].append(value)
+
+    def documents(self) -> list[dict]:
+        """Build the EMF documents for everything recorded so far."""
+        with self._lock:
+            groups = [(key, dict(metrics)) for key, metrics in self._values.items()]
+
+        timestamp = int(self._clock() * 1000)
+        documents = []
+        for key, metrics in groups:
+            dimensions = {**self._dimensions, **dict(key)}
+            longest = max(len(values) for _, values in metrics.values())
+            for start in range(0, longest, MAX_VALUES_PER_METRIC):
+                chunk = {
+                    name: (unit, values[start : start + MAX_VALUES_PER_METRIC])
+                    for name, (unit, values) in metrics.items()
+                    if len(values) > start
+                }
+                documents.append(
+                    {
+                        "_aws": {
+                            "Timestamp": timestamp,
+                            "CloudWatchMetrics": [
+                                {
+                                    "Namespace": self._namespace,
+                                    "Dimensions": [sorted(dimensions)],
+                                    "Metrics": [
+                                        {"Name": name, "Unit": unit}
+                                        for name, (unit, _) in chunk.items()
+                                    ],
+                                }
+                            ],
+                        },
+                        **self.properties,
+                        **dimensions,
+                        **{
+                            name: values[0] if len(values) == 1 else values
+                            for name, (_, values) in chunk.items()
+                        },
+                    }
+                )
+        return documents
+
+    def flush(self) -> None:
+        """Write recorded metrics as EMF log lines and start over."""
+        documents = self.documents()
+        with self._lock:
+            self._values.clear()
+        for document in documents:
+            self._emit(json.dumps(document, default=str, separators=(",", ":")))
@@ -73,9 +73,14 @@ class ReportFormatter:
             "content_type": "text/html",
         }
 
-    def format_json(self, alarm: AlarmEvent, analysis: str) -> dict:
-        """Format report as JSON."""
-        return {
+    def format_json(
+        self, alarm: AlarmEvent, analysis: str, coalesced_with: list[str] | None = None
+    ) -> dict:
+        """Format report as JSON.
+
+        ``coalesced_with`` names the other alarms a shared investigation covered.
+        """
+        report = {
             "alarm_name": alarm.alarm_name,
             "account_id": alarm.account_id,
             "region": alarm.region,
@@ -88,6 +93,9 @@ class ReportFormatter:
             "analysis": analysis,
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
+        if coalesced_with:
+            report["coalesced_with"] = coalesced_with
+        return report
 
     def _markdown_to_html(self, text: str) -> str:
         """Simple markdown to HTML conversion."""
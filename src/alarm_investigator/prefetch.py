@@ -0,0 +1,88 @@
+"""Deterministic evidence prefetch based on alarm dimensions."""
+
+from collections.abc import Callable, Container
+from dataclasses import dataclass
+
+from alarm_investigator.models import AlarmEvent
+
+
+@dataclass(frozen=True)
+class EvidenceRoute:
+    """Maps a set of alarm dimensions to the tool that describes the resource."""
+
+    tool_name: str
+    dimensions: tuple[str, ...]
+    arguments: Callable[[dict[str, str]], dict]
+
+
+DEFAULT_ROUTES = (
+    EvidenceRoute(
+        "describe_ec2_instance",
+        ("InstanceId",),
+        lambda d: {"instance_id": d["InstanceId"]},
+    ),
+    EvidenceRoute(
+        "describe_rds_instance",
+        ("DBInstanceIdentifier",),
+        lambda d: {"db_instance_identifier": d["DBInstanceIdentifier"]},
+    ),
+    EvidenceRoute(
+        "describe_lambda_function",
+        ("FunctionName",),
+        lambda d: {"function_name": d["FunctionName"]},
+    ),
+    EvidenceRoute(
+        "describe_ecs_service",
+        ("ClusterName", "ServiceName"),
+        lambda d: {"cluster": d["ClusterName"], "service": d["ServiceName"]},
+    ),
+)
+
+
+class EvidenceRouter:
+    """Plans the tool calls that nearly every investigation starts with.
+
+    These are the alarm's own metric and the describe call matching its
+    dimensions; running them up front saves the model round trips.
+    """
+
+    METRICS_TOOL = "get_cloudwatch_metrics"
+
+    def __init__(
+        self,
+        routes: tuple[EvidenceRoute, ...] = DEFAULT_ROUTES,
+        include_alarm_metric: bool = True,
+    ):
+        self._routes = routes
+        self._include_alarm_metric = include_alarm_metric
+
+    def plan(self, alarm: AlarmEvent, available: Container[str]) -> list[dict]:
+        """Return toolUse-shaped requests for the available tools."""
+        requests = []
+        dimensions = alarm.dimensions or {}
+
+        if (
+            self._include_alarm_metric
+            and self.METRICS_TOOL in available
+            and alarm.namespace
+            and alarm.metric_name
+        ):
+            requests.append(
+                (
+                    self.METRICS_TOOL,
+                    {
+                        "namespace": alarm.namespace,
+                        "metric_name": alarm.metric_name,
+                        "dimensions": dimensions,
+                    },
+                )
+            )
+
+        for route in self._routes:
+            if route.tool_name in available and all(d in dimensions for d in route.dimensions):
+                requests.append((route.tool_name, route.arguments(dimensions)))
+
+        return [
+            {"toolUseId": f"prefetch-{i}", "name": name, "input": arguments}
+            for i, (name, arguments) in enumerate(requests, start=1)
+        ]
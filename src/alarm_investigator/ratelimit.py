@@ -0,0 +1,215 @@
+"""Process-wide adaptive rate limiting of AWS API calls."""
+
+import logging
+import os
+import random
+import threading
+import time
+
+from alarm_investigator.metrics import DEFAULT_NAMESPACE, MetricsRecorder
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_CODES = frozenset(
+    {
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "RequestThrottled",
+        "RequestThrottledException",
+        "RequestLimitExceeded",
+        "TooManyRequestsException",
+        "ProvisionedThroughputExceededException",
+        "SlowDown",
+    }
+)
+
+# Requests per second to start from, keyed by (service, operation) or service
+DEFAULT_RATES: dict[tuple[str, str] | str, float] = {
+    ("bedrock-runtime", "Converse"): 2.0,
+    ("bedrock-runtime", "ConverseStream"): 2.0,
+    ("cloudwatch", "GetMetricData"): 40.0,
+    ("cloudwatch", "ListMetrics"): 20.0,
+}
+
+
+class AdaptiveTokenBucket:
+    """Token bucket that slows down on throttles and recovers on success.
+
+    A throttle halves the rate and makes every caller wait out a jittered,
+    exponentially growing cool-down; each success adds back a fraction of
+    the configured rate, which is also the ceiling.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float | None = None,
+        min_rate: float = 0.2,
+        decrease: float = 0.5,
+        increase: float = 0.05,
+        base_backoff: float = 0.2,
+        max_backoff: float = 10.0,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        self.max_rate = rate
+        self.rate = rate
+        self._burst = burst if burst is not None else max(rate, 1.0)
+        self._min_rate = min_rate
+        self._decrease = decrease
+        self._increase = increase * rate
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self._burst
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._consecutive_throttles = 0
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.throttles = 0
+        self.waited_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until it is available; returns the wait."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(self._blocked_until - now, 0.0) + max(-self._tokens, 0.0) / self.rate
+            if wait <= 0:
+                return 0.0
+            # Spread out callers queued behind the same token
+            wait += random.uniform(0, wait * 0.1)
+            self.waiting += 1
+
+        try:
+            self._sleep(wait)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+                self.waited_seconds += wait
+        return wait
+
+    def on_success(self) -> None:
+        """Recover additively toward the configured rate."""
+        with self._lock:
+            self._consecutive_throttles = 0
+            self.rate = min(self.max_rate, self.rate + self._increase)
+
+    def on_throttle(self) -> None:
+        """Cut the rate and hold all callers for a jittered back-off."""
+        with self._lock:
+            self.throttles += 1
+            self._consecutive_throttles += 1
+            self.rate = max(self._min_rate, self.rate * self._decrease)
+            ceiling = min(
+                self._max_backoff, self._base_backoff * 2 ** (self._consecutive_throttles - 1)
+            )
+            self._blocked_until = max(
+                self._blocked_until, self._clock() + random.uniform(0, ceiling)
+            )
+
+
+class RateLimiter:
+    """Shares one adaptive bucket per service and operation across all clients.
+
+    ``attach`` hooks a botocore client so that every request attempt,
+    including botocore's own retries, takes a token first and its outcome
+    adjusts the bucket's rate. With ``metrics``, each attempt records the
+    queue it found (``RateLimitQueueDepth``) and its wait for a token
+    (``RateLimitWait``) by ``Operation``, written on ``flush_metrics``.
+    """
+
+    def __init__(
+        self,
+        rates: dict[tuple[str, str] | str, float] | None = None,
+        default_rate: float = 20.0,
+        metrics: MetricsRecorder | None = None,
+        **bucket_options,
+    ):
+        self._rates = DEFAULT_RATES if rates is None else rates
+        self._default_rate = default_rate
+        self._metrics = metrics
+        self._bucket_options = bucket_options
+        self._buckets: dict[tuple[str, str], AdaptiveTokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, service: str, operation: str) -> AdaptiveTokenBucket:
+        """Return the bucket for an operation, creating it on first use."""
+        key = (service, operation)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    rate = self._rates.get(key, self._rates.get(service, self._default_rate))
+                    bucket = AdaptiveTokenBucket(rate, **self._bucket_options)
+                    self._buckets[key] = bucket
+        return bucket
+
+    @staticmethod
+    def _operation(event_name: str) -> tuple[str, str]:
+        # Event names look like "before-send.cloudwatch.GetMetricData"
+        _, service, operation = event_name.split(".", 2)
+        return service, operation
+
+    def _before_send(self, event_name: str, **kwargs) -> None:
+        service, operation = self._operation(event_name)
+        bucket = self.bucket(service, operation)
+        queued = bucket.waiting
+        waited = bucket.acquire()
+        if self._metrics is not None:
+            dimensions = {"Operation": f"{service}.{operation}"}
+            self._metrics.put("RateLimitQueueDepth", queued, "Count", dimensions)
+            self._metrics.put("RateLimitWait", waited * 1000, "Milliseconds", dimensions)
+
+    def _after_attempt(self, event_name: str, response=None, caught_exception=None, **kwargs):
+        if response is None:
+            return None
+        bucket = self.bucket(*self._operation(event_name))
+        error_code = response[1].get("Error", {}).get("Code")
+        if error_code in THROTTLE_CODES:
+            bucket.on_throttle()
+            logger.info("Throttled on %s, rate now %.2f/s", event_name, bucket.rate)
+        elif error_code is None:
+            bucket.on_success()
+        return None
+
+    def attach(self, client) -> None:
+        """Rate limit every request a botocore client sends."""
+        client.meta.events.register("before-send", self._before_send)
+        client.meta.events.register("needs-retry", self._after_attempt)
+
+    def flush_metrics(self) -> None:
+        """Write the queue depth and wait metrics recorded since the last flush."""
+        if self._metrics is not None:
+            self._metrics.flush()
+
+    def stats(self) -> dict:
+        """Return per-operation rate, queue depth, throttles and wait time."""
+        return {
+            f"{service}.{operation}": {
+                "rate": round(bucket.rate, 3),
+                "waiting": bucket.waiting,
+                "throttles": bucket.throttles,
+                "waited_seconds": round(bucket.waited_seconds, 3),
+            }
+            for (service, operation), bucket in list(self._buckets.items())
+        }
+
+
+_rate_limiter = RateLimiter(
+    metrics=MetricsRecorder(namespace=os.environ.get("METRICS_NAMESPACE", DEFAULT_NAMESPACE))
+)
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter."""
+    return _rate_limiter
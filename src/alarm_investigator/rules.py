@@ -0,0 +1,130 @@
+"""Declarative fast-path rules for alarm events that need no root-cause analysis."""
+
+import fnmatch
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+
+from alarm_investigator.models import AlarmEvent, AlarmState
+
+
+class RuleAction(Enum):
+    """What a matching rule does with an alarm event."""
+
+    SKIP = "skip"
+    SUMMARY = "summary"
+    CHECK = "check"
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Matches alarm events by state, name and namespace.
+
+    Empty criteria match anything. ``SUMMARY`` rules fill ``template`` with
+    the alarm fields; ``CHECK`` rules run ``check``, which returns a summary
+    or None to leave the event to the next rule and then the agent.
+    """
+
+    name: str
+    action: RuleAction
+    states: tuple[AlarmState, ...] = ()
+    previous_states: tuple[AlarmState, ...] = ()
+    alarm_name_pattern: str | None = None
+    namespaces: tuple[str, ...] = ()
+    template: str | None = None
+    check: Callable[[AlarmEvent], str | None] | None = None
+
+    def matches(self, alarm: AlarmEvent) -> bool:
+        """Return whether the alarm meets every criterion of the rule."""
+        return (
+            (not self.states or alarm.state in self.states)
+            and (not self.previous_states or alarm.previous_state in self.previous_states)
+            and (
+                self.alarm_name_pattern is None
+                or fnmatch.fnmatchcase(alarm.alarm_name, self.alarm_name_pattern)
+            )
+            and (not self.namespaces or alarm.namespace in self.namespaces)
+        )
+
+
+@dataclass(frozen=True)
+class RuleDecision:
+    """The outcome of the first rule that handled an event."""
+
+    rule: str
+    action: RuleAction
+    summary: str | None = None
+
+
+def template_fields(alarm: AlarmEvent) -> dict[str, str]:
+    """Alarm fields available to summary templates."""
+    return {
+        "alarm_name": alarm.alarm_name,
+        "state": alarm.state.value,
+        "previous_state": alarm.previous_state.value,
+        "reason": alarm.reason,
+        "namespace": alarm.namespace or "N/A",
+        "metric_name": alarm.metric_name or "N/A",
+        "dimensions": str(alarm.dimensions or {}),
+        "account_id": alarm.account_id,
+        "region": alarm.region,
+    }
+
+
+def missing_data_breach(alarm: AlarmEvent) -> str | None:
+    """Recognize alarms fired by missing datapoints treated as breaching."""
+    reason = alarm.reason.lower()
+    if "no datapoints were received" in reason and "treated as [breaching]" in reason:
+        return (
+            f"{alarm.alarm_name} went to ALARM because {alarm.metric_name or 'its metric'} "
+            "stopped reporting and missing data is treated as breaching, not because a "
+            "threshold was crossed. Check that the resource and its metric publisher "
+            f"are still running.\n\nReason: {alarm.reason}"
+        )
+    return None
+
+
+DEFAULT_RULES = (
+    Rule(
+        name="ok-recovery",
+        action=RuleAction.SUMMARY,
+        states=(AlarmState.OK,),
+        template=(
+            "{alarm_name} recovered: {previous_state} -> OK "
+            "({namespace}/{metric_name}, {dimensions}).\n\nReason: {reason}"
+        ),
+    ),
+    Rule(
+        name="insufficient-data",
+        action=RuleAction.SKIP,
+        states=(AlarmState.INSUFFICIENT_DATA,),
+    ),
+    Rule(
+        name="missing-data-breach",
+        action=RuleAction.CHECK,
+        states=(AlarmState.ALARM,),
+        check=missing_data_breach,
+    ),
+)
+
+
+class FastPathRules:
+    """Evaluates rules in order; the first rule that handles the event wins."""
+
+    def __init__(self, rules: tuple[Rule, ...] = DEFAULT_RULES):
+        self._rules = rules
+
+    def evaluate(self, alarm: AlarmEvent) -> RuleDecision | None:
+        """Return the decision for an event, or None if it needs an investigation."""
+        for rule in self._rules:
+            if not rule.matches(alarm):
+                continue
+            if rule.action == RuleAction.SKIP:
+                return RuleDecision(rule.name, rule.action)
+            if rule.action == RuleAction.SUMMARY:
+                summary = (rule.template or "").format_map(template_fields(alarm))
+                return RuleDecision(rule.name, rule.action, summary)
+            summary = rule.check(alarm) if rule.check else None
+            if summary is not None:
+                return RuleDecision(rule.name, rule.action, summary)
+        return None
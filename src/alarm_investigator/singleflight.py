@@ -0,0 +1,258 @@
+"""Single-flight deduplication of concurrent investigations for the same alarm."""
+
+import json
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from contextlib import closing
+from dataclasses import dataclass
+
+from botocore.exceptions import ClientError
+
+from alarm_investigator.models import AlarmEvent
+from alarm_investigator.storage import SQLiteStore
+
+
+def alarm_fingerprint(alarm: AlarmEvent) -> str:
+    """Key for investigations that would duplicate each other."""
+    return "|".join([alarm.account_id, alarm.region, alarm.alarm_name, alarm.state.value])
+
+
+@dataclass
+class FlightRecord:
+    """The current holder of a key and, once finished, its result.
+
+    ``expires_at`` is the leader's lease while running and the end of the
+    reuse window once ``result`` is set.
+    """
+
+    owner: str
+    expires_at: float
+    result: dict | None = None
+
+
+class FlightStore(ABC):
+    """Conditional-write storage backing a single-flight lock."""
+
+    @abstractmethod
+    def get(self, key: str) -> FlightRecord | None:
+        """Return the record for a key, if present."""
+        pass
+
+    @abstractmethod
+    def acquire(self, key: str, owner: str, now: float, expires_at: float) -> bool:
+        """Become leader unless an unexpired record exists for the key."""
+        pass
+
+    @abstractmethod
+    def complete(self, key: str, owner: str, result: dict, expires_at: float) -> None:
+        """Publish the leader's result, if the owner still holds the key."""
+        pass
+
+    @abstractmethod
+    def release(self, key: str, owner: str) -> None:
+        """Drop the owner's lease so another caller can lead."""
+        pass
+
+
+class InMemoryFlightStore(FlightStore):
+    """In-process store; deduplicates concurrent work within one container."""
+
+    def __init__(self):
+        self._records: dict[str, FlightRecord] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> FlightRecord | None:
+        with self._lock:
+            return self._records.get(key)
+
+    def acquire(self, key: str, owner: str, now: float, expires_at: float) -> bool:
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None and record.expires_at > now:
+                return False
+            self._records[key] = FlightRecord(owner=owner, expires_at=expires_at)
+            return True
+
+    def complete(self, key: str, owner: str, result: dict, expires_at: float) -> None:
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None and record.owner == owner:
+                self._records[key] = FlightRecord(owner, expires_at, result)
+
+    def release(self, key: str, owner: str) -> None:
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None and record.owner == owner:
+                del self._records[key]
+
+
+class SQLiteFlightStore(SQLiteStore, FlightStore):
+    """Leases in a SQLite table, deduplicating across processes on one host."""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS flights ("
+        "key TEXT PRIMARY KEY, owner TEXT NOT NULL, "
+        "expires_at REAL NOT NULL, result TEXT)"
+    )
+
+    def get(self, key: str) -> FlightRecord | None:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT owner, expires_at, result FROM flights WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        owner, expires_at, result = row
+        return FlightRecord(owner, expires_at, json.loads(result) if result else None)
+
+    def acquire(self, key: str, owner: str, now: float, expires_at: float) -> bool:
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO flights (key, owner, expires_at, result) VALUES (?, ?, ?, NULL) "
+                "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, "
+                "expires_at = excluded.expires_at, result = NULL "
+                "WHERE flights.expires_at <= ?",
+                (key, owner, expires_at, now),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, key: str, owner: str, result: dict, expires_at: float) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE flights SET result = ?, expires_at = ? WHERE key = ? AND owner = ?",
+                (json.dumps(result, default=str), expires_at, key, owner),
+            )
+
+    def release(self, key: str, owner: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM flights WHERE key = ? AND owner = ?", (key, owner))
+
+
+class DynamoDBFlightStore(FlightStore):
+    """Store sharing leases across containers through DynamoDB conditional writes.
+
+    The table needs a string partition key named ``flight_key``; enabling
+    DynamoDB TTL on ``expires_at`` lets finished records be removed server-side.
+    """
+
+    def __init__(self, table):
+        self._table = table
+
+    def get(self, key: str) -> FlightRecord | None:
+        item = self._table.get_item(Key={"flight_key": key}, ConsistentRead=True).get("Item")
+        if not item:
+            return None
+        result = item.get("result")
+        return FlightRecord(
+            owner=item["owner"],
+            expires_at=float(item["expires_at"]),
+            result=json.loads(result) if result else None,
+        )
+
+    def _conditional(self, operation: Callable[..., dict], **kwargs) -> bool:
+        try:
+            operation(**kwargs)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+        return True
+
+    def acquire(self, key: str, owner: str, now: float, expires_at: float) -> bool:
+        return self._conditional(
+            self._table.put_item,
+            # DynamoDB rejects floats, and TTL expects epoch seconds
+            Item={"flight_key": key, "owner": owner, "expires_at": int(expires_at)},
+            ConditionExpression="attribute_not_exists(flight_key) OR expires_at <= :now",
+            ExpressionAttributeValues={":now": int(now)},
+        )
+
+    def complete(self, key: str, owner: str, result: dict, expires_at: float) -> None:
+        self._conditional(
+            self._table.put_item,
+            Item={
+                "flight_key": key,
+                "owner": owner,
+                "expires_at": int(expires_at),
+                "result": json.dumps(result, default=str),
+            },
+            ConditionExpression="#owner = :owner",
+            ExpressionAttributeNames={"#owner": "owner"},
+            ExpressionAttributeValues={":owner": owner},
+        )
+
+    def release(self, key: str, owner: str) -> None:
+        self._conditional(
+            self._table.delete_item,
+            Key={"flight_key": key},
+            ConditionExpression="#owner = :owner",
+            ExpressionAttributeNames={"#owner": "owner"},
+            ExpressionAttributeValues={":owner": owner},
+        )
+
+
+class SingleFlight:
+    """Runs one investigation per key; concurrent callers share its result.
+
+    The first caller takes a lease and runs the work. Followers poll for
+    the leader's result, backing off from ``poll_interval`` to
+    ``max_poll_interval``, and reuse it for up to ``result_ttl`` seconds
+    after it finished. If the leader fails or its lease runs out, a follower
+    takes over; a follower that waits ``wait_timeout`` runs the work itself.
+    """
+
+    def __init__(
+        self,
+        store: FlightStore | None = None,
+        lease_seconds: float = 300,
+        result_ttl: float = 60,
+        wait_timeout: float = 240,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 5.0,
+        clock=time.time,
+        sleep=time.sleep,
+    ):
+        self._store = store or InMemoryFlightStore()
+        self._lease_seconds = lease_seconds
+        self._result_ttl = result_ttl
+        self._wait_timeout = wait_timeout
+        self._poll_interval = poll_interval
+        self._max_poll_interval = max_poll_interval
+        self._clock = clock
+        self._sleep = sleep
+
+    def run(
+        self, key: str, work: Callable[[], dict], wait_timeout: float | None = None
+    ) -> tuple[dict, bool]:
+        """Return the result for a key and whether it came from another caller.
+
+        ``wait_timeout`` overrides how long this caller may wait as a
+        follower, e.g. to leave it time to run the work itself.
+        """
+        owner = uuid.uuid4().hex
+        wait_timeout = self._wait_timeout if wait_timeout is None else wait_timeout
+        give_up_at = self._clock() + wait_timeout
+        poll_interval = self._poll_interval
+
+        while True:
+            now = self._clock()
+            record = self._store.get(key)
+            if record is not None and record.result is not None and record.expires_at > now:
+                return record.result, True
+
+            if self._store.acquire(key, owner, now, now + self._lease_seconds):
+                try:
+                    result = work()
+                except Exception:
+                    self._store.release(key, owner)
+                    raise
+                self._store.complete(key, owner, result, self._clock() + self._result_ttl)
+                return result, False
+
+            if now >= give_up_at:
+                return work(), False
+            self._sleep(min(poll_interval, give_up_at - now))
+            poll_interval = min(poll_interval * 2, self._max_poll_interval)
@@ -0,0 +1,38 @@
+"""Local file and SQLite helpers shared by the pluggable stores."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+
+def hashed_path(directory: str, key: str) -> str:
+    """Path of the JSON file holding a key, named by the key's digest."""
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return os.path.join(directory, f"{digest}.json")
+
+
+def write_atomic(path: str, data: str) -> None:
+    """Write a file so concurrent readers see the old or new contents, never a mix."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class SQLiteStore:
+    """Base for stores kept in a SQLite file, shared by processes on the same host.
+
+    Subclasses set ``SCHEMA`` to the statement creating their table.
+    """
+
+    SCHEMA = ""
+
+    def __init__(self, path: str):
+        self._path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=30)
@@ -0,0 +1,171 @@
+"""Vectorized summaries of metric series for the investigation model."""
+
+import warnings
+from datetime import datetime, timezone
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+Series = tuple[list[datetime], list[float]]
+
+
+def align_series(series: list[Series]) -> tuple[np.ndarray, np.ndarray]:
+    """Place series on a shared ascending timestamp grid.
+
+    Returns the grid as epoch seconds and a (series x timestamps) matrix
+    with NaN where a series has no datapoint.
+    """
+    epochs = np.array(sorted({ts.timestamp() for timestamps, _ in series for ts in timestamps}))
+    matrix = np.full((len(series), len(epochs)), np.nan)
+    for row, (timestamps, values) in enumerate(series):
+        if timestamps:
+            columns = np.searchsorted(epochs, [ts.timestamp() for ts in timestamps])
+            matrix[row, columns] = values
+    return epochs, matrix
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(float(epoch), tz=timezone.utc).isoformat()
+
+
+def analyze_series(
+    series: list[Series],
+    threshold: float | None = None,
+    above: bool = True,
+    zscore_window: int = 12,
+) -> list[dict]:
+    """Summarize one or many series in a single vectorized pass.
+
+    Each summary has min/max/avg/count, p50/p90/p99, the least-squares
+    slope per hour, the most likely mean-shift change point, the largest
+    rolling z-score against the preceding window and, when a threshold is
+    given, the first time it was crossed. Series without data get ``{}``.
+    """
+    if not series:
+        return []
+
+    epochs, matrix = align_series(series)
+    if not len(epochs):
+        return [{} for _ in series]
+
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+
+        present = ~np.isnan(matrix)
+        count = present.sum(axis=1)
+        minimum = np.nanmin(matrix, axis=1)
+        maximum = np.nanmax(matrix, axis=1)
+        mean = np.nanmean(matrix, axis=1)
+        percentiles = np.nanpercentile(matrix, [50, 90, 99], axis=1)
+
+        # Least-squares slope, ignoring missing points
+        hours = (epochs - epochs[0]) / 3600
+        hours_mean = (hours * present).sum(axis=1) / count
+        hours_dev = np.where(present, hours - hours_mean[:, None], 0.0)
+        value_dev = np.where(present, matrix - mean[:, None], 0.0)
+        slope = (hours_dev * value_dev).sum(axis=1) / (hours_dev**2).sum(axis=1)
+
+        # Single mean-shift change point: the split maximizing between-segment variance
+        filled = np.where(present, matrix, mean[:, None])
+        n = filled.shape[1]
+        change_index = change_before = change_after = None
+        if n >= 4:
+            sizes = np.arange(1, n)
+            cumulative = np.cumsum(filled, axis=1)
+            left = cumulative[:, :-1]
+            total = cumulative[:, -1:]
+            score = left**2 / sizes + (total - left) ** 2 / (n - sizes)
+            best = np.argmax(score, axis=1)
+            rows = np.arange(len(series))
+            change_index = best + 1
+            change_before = left[rows, best] / sizes[best]
+            change_after = (total[:, 0] - left[rows, best]) / (n - sizes[best])
+
+        # Rolling z-score of each point against the preceding window
+        window = min(zscore_window, n - 1)
+        z_value = z_index = None
+        if window >= 2:
+            windows = sliding_window_view(matrix, window, axis=1)[:, :-1, :]
+            window_mean = np.nanmean(windows, axis=2)
+            window_std = np.nanstd(windows, axis=2)
+            z = (matrix[:, window:] - window_mean) / np.where(window_std > 0, window_std, np.nan)
+            abs_z = np.where(np.isnan(z), -np.inf, np.abs(z))
+            z_index = np.argmax(abs_z, axis=1)
+            z_value = z[np.arange(len(series)), z_index]
+            z_index = z_index + window
+
+        crossed_index = crossed_any = None
+        if threshold is not None:
+            crossed = matrix > threshold if above else matrix < threshold
+            crossed_any = crossed.any(axis=1)
+            crossed_index = np.argmax(crossed, axis=1)
+
+    summaries = []
+    for row in range(len(series)):
+        if not count[row]:
+            summaries.append({})
+            continue
+
+        summary = {
+            "min": float(minimum[row]),
+            "max": float(maximum[row]),
+            "avg": float(mean[row]),
+            "count": int(count[row]),
+            "p50": float(percentiles[0, row]),
+            "p90": float(percentiles[1, row]),
+            "p99": float(percentiles[2, row]),
+        }
+        if np.isfinite(slope[row]):
+            summary["slope_per_hour"] = float(slope[row])
+        if change_index is not None:
+            summary["change_point"] = {
+                "timestamp": _iso(epochs[change_index[row]]),
+                "before_avg": float(change_before[row]),
+                "after_avg": float(change_after[row]),
+            }
+        if z_value is not None and np.isfinite(z_value[row]):
+            summary["max_zscore"] = {
+                "value": round(float(z_value[row]), 2),
+                "timestamp": _iso(epochs[z_index[row]]),
+            }
+        if crossed_any is not None:
+            summary["threshold_first_crossed"] = (
+                _iso(epochs[crossed_index[row]]) if crossed_any[row] else None
+            )
+        summaries.append(summary)
+
+    return summaries
+
+
+def correlate_with_lag(
+    matrix: np.ndarray, target_row: int = 0, max_lag: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find each row's strongest Pearson correlation with the target row.
+
+    Lags from 0 to ``max_lag`` steps are tried; a lag of ``k`` means the
+    row leads the target by ``k`` steps. Missing points are treated as the
+    row mean. Returns the best correlation (NaN for flat rows) and its lag.
+    """
+    rows, n = matrix.shape
+    best_corr = np.full(rows, np.nan)
+    best_lag = np.zeros(rows, dtype=int)
+
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+        centered = matrix - np.nanmean(matrix, axis=1, keepdims=True)
+        centered = np.where(np.isnan(centered), 0.0, centered)
+        target = centered[target_row]
+
+        for lag in range(min(max_lag, n - 3) + 1):
+            shifted_target = target[lag:]
+            leading = centered[:, : n - lag]
+            corr = (leading @ shifted_target) / np.sqrt(
+                (leading**2).sum(axis=1) * (shifted_target**2).sum()
+            )
+            better = np.nan_to_num(np.abs(corr), nan=-1.0) > np.nan_to_num(
+                np.abs(best_corr), nan=-1.0
+            )
+            best_corr = np.where(better, corr, best_corr)
+            best_lag = np.where(better, lag, best_lag)
+
+    return best_corr, best_lag
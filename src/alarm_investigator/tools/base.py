@@ -1,6 +1,25 @@
 """Base class and registry for investigation tools."""
 
+import asyncio
+import functools
+import json
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from alarm_investigator.metrics import MetricsRecorder
+from alarm_investigator.tools.cache import ToolCache
+from alarm_investigator.tools.circuit import ToolGuard
+
+# Coroutines run blocking tool calls here rather than on the event loop's
+# default executor, whose few workers (CPUs + 4) would queue the calls of
+# concurrent investigations while their timeouts are already running
+TOOL_EXECUTOR_WORKERS = 64
+_tool_executor = ThreadPoolExecutor(
+    max_workers=TOOL_EXECUTOR_WORKERS, thread_name_prefix="tool-executor"
+)
 
 
 class Tool(ABC):
@@ -8,9 +27,12 @@ class Tool(ABC):
 
     name: str = ""
     description: str = ""
+    cache_ttl: float = 0  # seconds results may be reused; 0 disables caching
+    timeout: float = 0  # seconds a call may take under a ToolGuard; 0 uses its default
 
+    @classmethod
     @abstractmethod
-    def get_parameters_schema(self) -> dict:
+    def get_parameters_schema(cls) -> dict:
         """Return JSON schema for tool parameters."""
         pass
 
@@ -19,6 +41,11 @@ class Tool(ABC):
         """Execute the tool with given parameters."""
         pass
 
+    async def aexecute(self, **kwargs) -> dict:
+        """Execute the tool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_tool_executor, functools.partial(self.execute, **kwargs))
+
     def to_bedrock_spec(self) -> dict:
         """Convert tool to Bedrock toolSpec format."""
         return {
@@ -29,25 +56,178 @@ class Tool(ABC):
             }
         }
 
+    @classmethod
+    def class_bedrock_spec(cls) -> dict:
+        """Build the Bedrock toolSpec from class-level metadata without instantiating."""
+        return {
+            "toolSpec": {
+                "name": cls.name,
+                "description": cls.description,
+                "inputSchema": {"json": cls.get_parameters_schema()},
+            }
+        }
+
 
 class ToolRegistry:
-    """Registry for managing investigation tools."""
+    """Registry for managing investigation tools.
+
+    With a ``guard``, every uncached call runs under a per-tool deadline and
+    circuit breaker shared by registries with the same namespace. With
+    ``metrics``, the latency and result size of every uncached call are
+    recorded per tool.
+    """
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache: ToolCache | None = None,
+        cache_namespace: str = "",
+        guard: ToolGuard | None = None,
+        metrics: MetricsRecorder | None = None,
+    ):
+        self._cache = cache
+        self._cache_namespace = cache_namespace
+        self._guard = guard
+        self._metrics = metrics
         self._tools: dict[str, Tool] = {}
+        self._factories: dict[str, tuple[type[Tool], Callable[[], Tool]]] = {}
+        self._order: list[str] = []
+        self._lock = threading.Lock()
 
     def register(self, tool: Tool) -> None:
         """Register a tool."""
+        if tool.name not in self._tools and tool.name not in self._factories:
+            self._order.append(tool.name)
+        self._factories.pop(tool.name, None)
         self._tools[tool.name] = tool
 
+    def register_factory(self, tool_cls: type[Tool], factory: Callable[[], Tool]) -> None:
+        """Register a tool that is only built (with its client) on first use."""
+        if tool_cls.name not in self._tools and tool_cls.name not in self._factories:
+            self._order.append(tool_cls.name)
+        self._tools.pop(tool_cls.name, None)
+        self._factories[tool_cls.name] = (tool_cls, factory)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tools or name in self._factories
+
     def get(self, name: str) -> Tool | None:
-        """Get a tool by name."""
-        return self._tools.get(name)
+        """Get a tool by name, building it if it was registered lazily."""
+        tool = self._tools.get(name)
+        if tool is not None or name not in self._factories:
+            return tool
+
+        with self._lock:
+            if name in self._tools:
+                return self._tools[name]
+            _, factory = self._factories[name]
+            tool = factory()
+            # Publish the tool before dropping the factory so lock-free readers
+            # always find one of the two
+            self._tools[name] = tool
+            del self._factories[name]
+            return tool
+
+    def execute(self, name: str, arguments: dict) -> dict:
+        """Execute a tool by name, serving cacheable results from the cache."""
+        tool = self.get(name)
+        if not tool:
+            return {"error": f"Unknown tool: {name}"}
+
+        ttl = self._cache.ttl_for(tool) if self._cache else 0
+        if ttl <= 0:
+            return self._run(tool, arguments)
+
+        key = self._cache.make_key(self._cache_namespace, name, arguments)
+        cached = self._cache.lookup(key)
+        if cached is not None:
+            return self._with_cache_metadata(*cached, hit=True)
+
+        result = self._run(tool, arguments)
+        if result.get("status") == "unavailable":
+            return result
+        self._cache.store(key, result, ttl)
+        return self._with_cache_metadata(result, 0.0, hit=False)
+
+    async def aexecute(self, name: str, arguments: dict) -> dict:
+        """Async variant of execute, awaiting the tool's aexecute."""
+        tool = self.get(name)
+        if not tool:
+            return {"error": f"Unknown tool: {name}"}
+
+        ttl = self._cache.ttl_for(tool) if self._cache else 0
+        if ttl <= 0:
+            return await self._arun(tool, arguments)
+
+        key = self._cache.make_key(self._cache_namespace, name, arguments)
+        cached = self._cache.lookup(key)
+        if cached is not None:
+            return self._with_cache_metadata(*cached, hit=True)
+
+        result = await self._arun(tool, arguments)
+        if result.get("status") == "unavailable":
+            return result
+        self._cache.store(key, result, ttl)
+        return self._with_cache_metadata(result, 0.0, hit=False)
+
+    def _run(self, tool: Tool, arguments: dict) -> dict:
+        """Call a tool, through the guard's deadline and circuit breaker if set."""
+        started = time.monotonic()
+        if self._guard is None:
+            result = tool.execute(**arguments)
+        else:
+            result = self._guard.call(
+                self._cache_namespace, tool, lambda: tool.execute(**arguments)
+            )
+        self._record_call(tool, result, started)
+        return result
+
+    async def _arun(self, tool: Tool, arguments: dict) -> dict:
+        """Async variant of _run."""
+        started = time.monotonic()
+        if self._guard is None:
+            result = await tool.aexecute(**arguments)
+        else:
+            result = await self._guard.acall(
+                self._cache_namespace, tool, lambda: tool.aexecute(**arguments)
+            )
+        self._record_call(tool, result, started)
+        return result
+
+    def _record_call(self, tool: Tool, result: dict, started: float) -> None:
+        """Record the latency and serialized size of a tool call."""
+        if self._metrics is None:
+            return
+        dimensions = {"Tool": tool.name}
+        self._metrics.put(
+            "ToolLatency", (time.monotonic() - started) * 1000, "Milliseconds", dimensions
+        )
+        self._metrics.put(
+            "ToolResultBytes", len(json.dumps(result, default=str)), "Bytes", dimensions
+        )
+
+    @staticmethod
+    def _with_cache_metadata(result: dict, age: float, hit: bool) -> dict:
+        """Return a copy of a result annotated with cache hit/miss details."""
+        metadata = {"hit": hit}
+        if hit:
+            metadata["age_seconds"] = round(age, 1)
+        return {**result, "cache": metadata}
 
     def get_all(self) -> list[Tool]:
-        """Get all registered tools."""
-        return list(self._tools.values())
+        """Get all registered tools, building any lazy ones."""
+        return [self.get(name) for name in self._order]
+
+    def is_built(self, name: str) -> bool:
+        """Check whether a registered tool has been instantiated."""
+        return name in self._tools
 
     def get_bedrock_config(self) -> dict:
         """Generate Bedrock tool configuration."""
-        return {"tools": [tool.to_bedrock_spec() for tool in self._tools.values()]}
+        specs = []
+        for name in self._order:
+            if name in self._tools:
+                specs.append(self._tools[name].to_bedrock_spec())
+            else:
+                tool_cls, _ = self._factories[name]
+                specs.append(tool_cls.class_bedrock_spec())
+        return {"tools": specs}
@@ -0,0 +1,181 @@
+"""TTL cache for tool results, shared across investigations."""
+
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from alarm_investigator.storage import hashed_path, write_atomic
+
+
+@dataclass
+class CacheEntry:
+    """A cached tool result and its lifetime."""
+
+    value: dict
+    stored_at: float
+    expires_at: float
+
+
+class CacheBackend(ABC):
+    """Storage for cached tool results."""
+
+    @abstractmethod
+    def get(self, key: str) -> CacheEntry | None:
+        """Return the entry for a key, if present."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry under a key."""
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """In-process LRU backend bounded by entry count and approximate size."""
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 8 * 1024 * 1024):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[CacheEntry, int]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate size of all cached values."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            self._entries.move_to_end(key)
+            return item[0]
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        size = len(json.dumps(entry.value, default=str))
+        if size > self._max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            self._entries[key] = (entry, size)
+            self._size += size
+
+            while len(self._entries) > self._max_entries or self._size > self._max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+
+class FileCacheBackend(CacheBackend):
+    """Backend storing one JSON file per key, e.g. under /tmp in Lambda."""
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> CacheEntry | None:
+        try:
+            with open(hashed_path(self._directory, key)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(
+            value=data["value"], stored_at=data["stored_at"], expires_at=data["expires_at"]
+        )
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        data = {"value": entry.value, "stored_at": entry.stored_at, "expires_at": entry.expires_at}
+        write_atomic(hashed_path(self._directory, key), json.dumps(data, default=str))
+
+
+class DynamoDBCacheBackend(CacheBackend):
+    """Backend sharing results across containers through a DynamoDB table.
+
+    The table needs a string partition key named ``cache_key``; enabling
+    DynamoDB TTL on ``expires_at`` lets expired items be removed server-side.
+    """
+
+    def __init__(self, table):
+        self._table = table
+
+    def get(self, key: str) -> CacheEntry | None:
+        item = self._table.get_item(Key={"cache_key": key}).get("Item")
+        if not item:
+            return None
+        return CacheEntry(
+            value=json.loads(item["value"]),
+            stored_at=float(item["stored_at"]),
+            expires_at=float(item["expires_at"]),
+        )
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self._table.put_item(
+            Item={
+                "cache_key": key,
+                "value": json.dumps(entry.value, default=str),
+                # DynamoDB rejects floats, and TTL expects epoch seconds
+                "stored_at": int(entry.stored_at),
+                "expires_at": int(entry.expires_at),
+            }
+        )
+
+
+class ToolCache:
+    """Caches tool results keyed on tool name and normalized arguments."""
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        ttls: dict[str, float] | None = None,
+        clock=time.time,
+    ):
+        self._backend = backend or InMemoryCacheBackend()
+        self._ttls = ttls or {}
+        self._clock = clock
+
+    def ttl_for(self, tool) -> float:
+        """Return the TTL for a tool, preferring explicit overrides."""
+        return self._ttls.get(tool.name, getattr(tool, "cache_ttl", 0))
+
+    @staticmethod
+    def make_key(namespace: str, name: str, arguments: dict) -> str:
+        """Build a cache key that ignores argument order."""
+        normalized = json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+        return f"{namespace}|{name}|{normalized}"
+
+    def lookup(self, key: str) -> tuple[dict, float] | None:
+        """Return a fresh cached result and its age in seconds, if any."""
+        try:
+            entry = self._backend.get(key)
+        except Exception:
+            return None
+
+        now = self._clock()
+        if entry is None or entry.expires_at <= now:
+            return None
+        return entry.value, now - entry.stored_at
+
+    def store(self, key: str, result: dict, ttl: float) -> None:
+        """Store a successful result; backend failures are ignored.
+
+        Results with per-item ``errors`` are partial, so they are not stored
+        either; the failed lookups would otherwise be replayed for the TTL.
+        """
+        if result.get("status") == "error" or "error" in result or result.get("errors"):
+            return
+
+        now = self._clock()
+        try:
+            self._backend.set(key, CacheEntry(value=result, stored_at=now, expires_at=now + ttl))
+        except Exception:
+            pass
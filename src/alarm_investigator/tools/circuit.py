@@ -0,0 +1,305 @@
+"""Per-tool deadlines and circuit breakers around tool execution."""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from enum import Enum
+
+from alarm_investigator.ratelimit import THROTTLE_CODES
+
+logger = logging.getLogger(__name__)
+
+# Fragments of error results that point at an unhealthy endpoint rather than
+# a bad request; tools report botocore errors as str(e)
+UNHEALTHY_ERROR_MARKERS = (
+    "timeout on endpoint",
+    "Could not connect to the endpoint",
+    "Connection was closed",
+    "(InternalError)",
+    "(InternalFailure)",
+    "(ServiceUnavailable)",
+    "(ServiceUnavailableException)",
+    *(f"({code})" for code in THROTTLE_CODES),
+)
+
+
+def is_unhealthy_result(result: dict) -> bool:
+    """Return whether a tool's result indicates an unhealthy endpoint.
+
+    Looks at the ``error`` of failed results and at the per-item ``errors``
+    of partially successful batch lookups.
+    """
+    errors = list((result.get("errors") or {}).values())
+    if result.get("status") == "error":
+        errors.append(result.get("error", ""))
+    return any(marker in str(error) for error in errors for marker in UNHEALTHY_ERROR_MARKERS)
+
+
+class CircuitState(Enum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and probes with one call after a cool-down.
+
+    While open every call is rejected. Once ``reset_timeout`` has passed a
+    single trial call goes through: success closes the circuit, failure
+    opens it again for another cool-down.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        clock=time.monotonic,
+    ):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    @property
+    def failures(self) -> int:
+        return self._failures
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a trial call through."""
+        if self._state == CircuitState.CLOSED:
+            return 0.0
+        return max(self._opened_at + self._reset_timeout - self._clock(), 0.0)
+
+    def allow(self) -> bool:
+        """Return whether a call may go through, claiming the trial slot if half-open."""
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.OPEN:
+                if self._clock() - self._opened_at < self._reset_timeout:
+                    return False
+                self._state = CircuitState.HALF_OPEN
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == CircuitState.HALF_OPEN or self._failures >= self._failure_threshold:
+                self._state = CircuitState.OPEN
+                self._opened_at = self._clock()
+
+
+class ToolGuard:
+    """Enforces a deadline on each tool call and trips a breaker per tool and namespace.
+
+    A call that overruns its deadline, raises, or returns an error from an
+    unhealthy endpoint counts as a failure. Calls to an open circuit return
+    an ``unavailable`` result immediately instead of waiting on the endpoint.
+
+    Every call runs on its own thread, so its deadline starts when it does.
+    A timed-out call is abandoned, not interrupted, and keeps counting
+    against ``max_in_flight`` for its tool and namespace until its thread
+    finishes; a hung endpoint thus fills only its own quota, never other
+    tools' capacity.
+    """
+
+    def __init__(
+        self,
+        default_timeout: float = 15.0,
+        timeouts: dict[str, float] | None = None,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        max_in_flight: int = 4,
+        clock=time.monotonic,
+    ):
+        self._default_timeout = default_timeout
+        self._timeouts = timeouts or {}
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._max_in_flight = max_in_flight
+        self._clock = clock
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._in_flight: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def timeout_for(self, tool) -> float:
+        """Return the deadline for a tool, preferring explicit overrides."""
+        return self._timeouts.get(tool.name, getattr(tool, "timeout", 0) or self._default_timeout)
+
+    def breaker(self, namespace: str, name: str) -> CircuitBreaker:
+        """Return the breaker for a tool in a namespace, creating it on first use."""
+        key = f"{namespace}|{name}"
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(key)
+                if breaker is None:
+                    breaker = CircuitBreaker(
+                        self._failure_threshold, self._reset_timeout, self._clock
+                    )
+                    self._breakers[key] = breaker
+        return breaker
+
+    def _reserve(self, key: str) -> bool:
+        """Take an in-flight slot for a tool and namespace, if one is free."""
+        with self._lock:
+            if self._in_flight.get(key, 0) >= self._max_in_flight:
+                return False
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+            return True
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            self._in_flight[key] -= 1
+
+    def _admit(self, namespace: str, tool) -> tuple[CircuitBreaker, dict | None]:
+        """Return the tool's breaker and, if the call may not run, its result."""
+        breaker = self.breaker(namespace, tool.name)
+        key = f"{namespace}|{tool.name}"
+        # Take the slot first so a rejected call never claims the half-open trial
+        if not self._reserve(key):
+            return breaker, self._saturated_result(tool.name)
+        if not breaker.allow():
+            self._release(key)
+            return breaker, self._unavailable_result(tool.name, breaker)
+        return breaker, None
+
+    def _start(self, key: str, execute: Callable[[], dict]) -> Future:
+        """Run a call on its own thread, releasing its slot when it really ends."""
+        future: Future = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(execute())
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                self._release(key)
+
+        threading.Thread(target=run, name="tool-guard", daemon=True).start()
+        return future
+
+    @staticmethod
+    def _unavailable_result(name: str, breaker: CircuitBreaker) -> dict:
+        return {
+            "status": "unavailable",
+            "error": (
+                f"Tool {name} is temporarily unavailable after {breaker.failures} "
+                "consecutive failures; use other evidence"
+            ),
+            "retry_after_seconds": round(breaker.retry_after(), 1),
+        }
+
+    def _saturated_result(self, name: str) -> dict:
+        return {
+            "status": "unavailable",
+            "error": (
+                f"Tool {name} already has {self._max_in_flight} calls waiting on its "
+                "endpoint; use other evidence"
+            ),
+        }
+
+    @staticmethod
+    def _timeout_result(name: str, timeout: float) -> dict:
+        return {
+            "status": "unavailable",
+            "error": f"Tool {name} did not respond within {timeout:g}s",
+        }
+
+    def _record(self, breaker: CircuitBreaker, namespace: str, name: str, ok: bool) -> None:
+        if ok:
+            breaker.record_success()
+            return
+        was_open = breaker.state == CircuitState.OPEN
+        breaker.record_failure()
+        if not was_open and breaker.state == CircuitState.OPEN:
+            logger.warning(
+                "Circuit opened for %s in %s after %d failures", name, namespace, breaker.failures
+            )
+
+    def call(self, namespace: str, tool, execute: Callable[[], dict]) -> dict:
+        """Run a tool call under its deadline and breaker."""
+        breaker, rejected = self._admit(namespace, tool)
+        if rejected is not None:
+            return rejected
+
+        timeout = self.timeout_for(tool)
+        future = self._start(f"{namespace}|{tool.name}", execute)
+        try:
+            result = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self._record(breaker, namespace, tool.name, ok=False)
+            return self._timeout_result(tool.name, timeout)
+        except Exception:
+            self._record(breaker, namespace, tool.name, ok=False)
+            raise
+        self._record(breaker, namespace, tool.name, ok=not is_unhealthy_result(result))
+        return result
+
+    async def acall(self, namespace: str, tool, execute: Callable[[], Awaitable[dict]]) -> dict:
+        """Async variant of call."""
+        breaker, rejected = self._admit(namespace, tool)
+        if rejected is not None:
+            return rejected
+
+        timeout = self.timeout_for(tool)
+        key = f"{namespace}|{tool.name}"
+        # Shielded, so an abandoned call holds its slot until it really finishes
+        task = asyncio.ensure_future(execute())
+
+        def finished(task: asyncio.Future) -> None:
+            self._release(key)
+            if not task.cancelled():
+                task.exception()  # mark an abandoned call's failure as retrieved
+
+        task.add_done_callback(finished)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+        except TimeoutError:
+            self._record(breaker, namespace, tool.name, ok=False)
+            return self._timeout_result(tool.name, timeout)
+        except Exception:
+            self._record(breaker, namespace, tool.name, ok=False)
+            raise
+        self._record(breaker, namespace, tool.name, ok=not is_unhealthy_result(result))
+        return result
+
+    def open_circuits(self) -> list[str]:
+        """Keys of breakers that are currently rejecting or probing calls."""
+        return [
+            key
+            for key, breaker in list(self._breakers.items())
+            if breaker.state != CircuitState.CLOSED
+        ]
+
+
+_tool_guard = ToolGuard()
+
+
+def get_tool_guard() -> ToolGuard:
+    """Return the process-wide tool guard."""
+    return _tool_guard
@@ -1,8 +1,127 @@
 """CloudWatch investigation tools."""
 
+import json
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 
 from alarm_investigator.tools.base import Tool
+from alarm_investigator.tools.downsample import encode_columnar, lttb, minmax
+
+SeriesKey = tuple[str, str, tuple[tuple[str, str], ...], str, int]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def align_to_period(moment: datetime, period_seconds: int) -> datetime:
+    """Round a timestamp down to the start of its period."""
+    epoch = int(moment.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % period_seconds, tz=timezone.utc)
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, assuming UTC when no offset is given."""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+@dataclass
+class _Segment:
+    """Contiguous range of a metric series that has been fetched."""
+
+    start: datetime
+    end: datetime
+    points: dict[datetime, float] = field(default_factory=dict)
+
+
+class MetricSeriesCache:
+    """Cache of fetched metric series segments, keyed by query.
+
+    Windows are period-aligned, so overlapping requests only need the
+    ranges that are not covered yet (usually the newest periods). Points
+    older than ``retention`` are dropped when a later request no longer
+    covers them, never from inside the window being requested.
+    """
+
+    def __init__(self, max_series: int = 256, retention: timedelta = timedelta(hours=24)):
+        self._max_series = max_series
+        self._retention = retention
+        self._segments: OrderedDict[SeriesKey, _Segment] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def missing_ranges(
+        self, key: SeriesKey, start: datetime, end: datetime, refresh: timedelta
+    ) -> list[tuple[datetime, datetime]]:
+        """Return the sub-ranges of [start, end) that must be fetched.
+
+        When the window extends past the cached range, the last ``refresh``
+        of cached data is fetched again, since CloudWatch may still be
+        aggregating the most recent datapoints.
+        """
+        with self._lock:
+            segment = self._segments.get(key)
+            if segment is None or start > segment.end or end < segment.start:
+                return [(start, end)]
+
+            self._segments.move_to_end(key)
+            horizon = min(start, end - self._retention)
+            if segment.start < horizon:
+                segment.start = horizon
+                for ts in [ts for ts in segment.points if ts < horizon]:
+                    del segment.points[ts]
+
+            ranges = []
+            if start < segment.start:
+                ranges.append((start, segment.start))
+            if end > segment.end:
+                ranges.append((max(start, segment.end - refresh), end))
+            return ranges
+
+    def merge(
+        self,
+        key: SeriesKey,
+        start: datetime,
+        end: datetime,
+        timestamps: list[datetime],
+        values: list[float],
+    ) -> None:
+        """Record fetched datapoints for [start, end)."""
+        with self._lock:
+            segment = self._segments.get(key)
+            if segment is None or start > segment.end or end < segment.start:
+                segment = _Segment(start=start, end=end)
+                self._segments[key] = segment
+            else:
+                for ts in [ts for ts in segment.points if start <= ts < end]:
+                    del segment.points[ts]
+                segment.start = min(segment.start, start)
+                segment.end = max(segment.end, end)
+
+            segment.points.update(zip(timestamps, values))
+            self._segments.move_to_end(key)
+
+            while len(self._segments) > self._max_series:
+                self._segments.popitem(last=False)
+
+    def points(
+        self, key: SeriesKey, start: datetime, end: datetime
+    ) -> list[tuple[datetime, float]]:
+        """Return cached datapoints in [start, end), newest first."""
+        with self._lock:
+            segment = self._segments.get(key)
+            if segment is None:
+                return []
+            return sorted(
+                ((ts, val) for ts, val in segment.points.items() if start <= ts < end),
+                reverse=True,
+            )
 
 
 class GetMetricsTool(Tool):
@@ -14,10 +133,21 @@ class GetMetricsTool(Tool):
         "Use this to analyze metric trends and values around the time of an alarm."
     )
 
-    def __init__(self, cloudwatch_client):
+    PERIOD_SECONDS = 300  # 5-minute granularity
+    STAT = "Average"
+
+    def __init__(
+        self,
+        cloudwatch_client,
+        series_cache: MetricSeriesCache | None = None,
+        clock: Callable[[], datetime] = _utcnow,
+    ):
         self._client = cloudwatch_client
+        self._series_cache = series_cache or MetricSeriesCache()
+        self._clock = clock
 
-    def get_parameters_schema(self) -> dict:
+    @classmethod
+    def get_parameters_schema(cls) -> dict:
         return {
             "type": "object",
             "properties": {
@@ -39,6 +169,53 @@ class GetMetricsTool(Tool):
                     "description": "How many minutes of data to retrieve (default: 60)",
                     "default": 60,
                 },
+                "threshold": {
+                    "type": "number",
+                    "description": "Optional alarm threshold; reports when it was first crossed",
+                },
+                "threshold_direction": {
+                    "type": "string",
+                    "enum": ["above", "below"],
+                    "description": "Whether crossing means going above or below (default: above)",
+                    "default": "above",
+                },
+                "start_time": {
+                    "type": "string",
+                    "description": (
+                        "Optional ISO 8601 window start; with end_time, overrides "
+                        "period_minutes to zoom into a narrow window"
+                    ),
+                },
+                "end_time": {
+                    "type": "string",
+                    "description": "Optional ISO 8601 window end (default: now)",
+                },
+                "max_points": {
+                    "type": "integer",
+                    "description": (
+                        "Downsample to at most this many points, preserving the series "
+                        "shape (default: 100). Use 0 for full resolution."
+                    ),
+                    "default": 100,
+                },
+                "downsample": {
+                    "type": "string",
+                    "enum": ["lttb", "minmax"],
+                    "description": (
+                        "Downsampling method: lttb keeps the visual shape, minmax keeps "
+                        "each bucket's extremes (default: lttb)"
+                    ),
+                    "default": "lttb",
+                },
+                "encoding": {
+                    "type": "string",
+                    "enum": ["points", "columnar"],
+                    "description": (
+                        "points returns timestamp/value objects; columnar returns a start "
+                        "time, a step and a value array, which is much smaller"
+                    ),
+                    "default": "points",
+                },
             },
             "required": ["namespace", "metric_name", "dimensions"],
         }
@@ -49,64 +226,558 @@ class GetMetricsTool(Tool):
         metric_name: str,
         dimensions: dict,
         period_minutes: int = 60,
+        start_time: str | None = None,
+        end_time: str | None = None,
+        max_points: int = 100,
+        downsample: str = "lttb",
+        encoding: str = "points",
+        threshold: float | None = None,
+        threshold_direction: str = "above",
         **kwargs,
     ) -> dict:
         """Retrieve metric data from CloudWatch."""
         try:
-            end_time = datetime.now(timezone.utc)
-            start_time = end_time - timedelta(minutes=period_minutes)
+            period = self.PERIOD_SECONDS
+            end = parse_timestamp(end_time) if end_time else self._clock()
+            end_time = align_to_period(end, period)
+            if start_time:
+                start_time = align_to_period(parse_timestamp(start_time), period)
+            else:
+                start_time = end_time - timedelta(minutes=period_minutes)
 
             dimension_list = [{"Name": k, "Value": v} for k, v in dimensions.items()]
+            key = (
+                namespace,
+                metric_name,
+                tuple(sorted(dimensions.items())),
+                self.STAT,
+                period,
+            )
 
-            response = self._client.get_metric_data(
-                MetricDataQueries=[
-                    {
-                        "Id": "m1",
-                        "MetricStat": {
-                            "Metric": {
-                                "Namespace": namespace,
-                                "MetricName": metric_name,
-                                "Dimensions": dimension_list,
+            # Only fetch what the series cache does not already cover
+            for fetch_start, fetch_end in self._series_cache.missing_ranges(
+                key, start_time, end_time, refresh=timedelta(seconds=period)
+            ):
+                timestamps, values = self._fetch(
+                    namespace, metric_name, dimension_list, fetch_start, fetch_end
+                )
+                self._series_cache.merge(key, fetch_start, fetch_end, timestamps, values)
+
+            series = self._series_cache.points(key, start_time, end_time)
+            # NumPy is imported on first analysis so the handler loads without it
+            from alarm_investigator.tools.analysis import analyze_series
+
+            statistics = analyze_series(
+                [([ts for ts, _ in series], [val for _, val in series])],
+                threshold=threshold,
+                above=threshold_direction != "below",
+            )[0]
+
+            result = {
+                "status": "success",
+                "namespace": namespace,
+                "metric_name": metric_name,
+                "statistics": statistics,
+            }
+            result.update(self._encode_series(series, period, max_points, downsample, encoding))
+            return result
+
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+
+    def _encode_series(
+        self,
+        series: list[tuple[datetime, float]],
+        period: int,
+        max_points: int,
+        downsample: str,
+        encoding: str,
+    ) -> dict:
+        """Downsample and encode newest-first datapoints for the response."""
+        ascending = series[::-1]
+        sampled = ascending
+        if max_points and len(ascending) > max_points:
+            method = minmax if downsample == "minmax" else lttb
+            sampled = method(ascending, max_points)
+
+        if encoding == "columnar":
+            encoded = {"series": encode_columnar(sampled, period)}
+        else:
+            encoded = {
+                "datapoints": [
+                    {"timestamp": ts.isoformat(), "value": val} for ts, val in reversed(sampled)
+                ]
+            }
+
+        if sampled is not ascending or encoding == "columnar":
+            original_bytes = len(
+                json.dumps([{"timestamp": ts.isoformat(), "value": val} for ts, val in series])
+            )
+            returned_bytes = len(json.dumps(encoded))
+            encoded["compression"] = {
+                "method": downsample if sampled is not ascending else None,
+                "original_points": len(series),
+                "returned_points": len(sampled),
+                "ratio": round(original_bytes / returned_bytes, 1),
+            }
+        return encoded
+
+    def _fetch(
+        self,
+        namespace: str,
+        metric_name: str,
+        dimension_list: list[dict],
+        start_time: datetime,
+        end_time: datetime,
+    ) -> tuple[list[datetime], list[float]]:
+        """Fetch one metric's datapoints for a time range."""
+        response = self._client.get_metric_data(
+            MetricDataQueries=[
+                {
+                    "Id": "m1",
+                    "MetricStat": {
+                        "Metric": {
+                            "Namespace": namespace,
+                            "MetricName": metric_name,
+                            "Dimensions": dimension_list,
+                        },
+                        "Period": self.PERIOD_SECONDS,
+                        "Stat": self.STAT,
+                    },
+                    "ReturnData": True,
+                }
+            ],
+            StartTime=start_time,
+            EndTime=end_time,
+        )
+
+        results = response.get("MetricDataResults", [])
+        if not results:
+            return [], []
+        return results[0].get("Timestamps", []), results[0].get("Values", [])
+
+
+class GetMetricsBatchTool(Tool):
+    """Tool to retrieve many CloudWatch metrics and expressions in one call."""
+
+    name = "get_cloudwatch_metrics_batch"
+    description = (
+        "Retrieve several CloudWatch metrics at once, each with its own statistic "
+        "(e.g. Average, Maximum, Sum, p50, p90, p99), plus metric math expressions "
+        "that reference other queries by id. Prefer this over repeated "
+        "get_cloudwatch_metrics calls when comparing related metrics."
+    )
+    # Up to 500 queries per call, paginated, all behind the rate limiter
+    timeout = 20
+
+    MAX_QUERIES_PER_CALL = 500
+    ID_PATTERN = re.compile(r"^[a-z][a-zA-Z0-9_]*$")
+
+    def __init__(
+        self,
+        cloudwatch_client,
+        clock: Callable[[], datetime] = _utcnow,
+    ):
+        self._client = cloudwatch_client
+        self._clock = clock
+
+    @classmethod
+    def get_parameters_schema(cls) -> dict:
+        return {
+            "type": "object",
+            "properties": {
+                "queries": {
+                    "type": "array",
+                    "description": (
+                        "Metrics and expressions to retrieve. Give either namespace, "
+                        "metric_name and dimensions, or an expression such as 'errors / "
+                        "requests * 100' that references other query ids."
+                    ),
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {
+                                "type": "string",
+                                "description": "Query id (lowercase first letter, e.g. cpu_p99)",
+                            },
+                            "namespace": {"type": "string"},
+                            "metric_name": {"type": "string"},
+                            "dimensions": {
+                                "type": "object",
+                                "additionalProperties": {"type": "string"},
                             },
-                            "Period": 300,  # 5-minute granularity
-                            "Stat": "Average",
+                            "stat": {
+                                "type": "string",
+                                "description": "Statistic (default: Average)",
+                                "default": "Average",
+                            },
+                            "expression": {"type": "string"},
+                            "label": {"type": "string"},
                         },
-                        "ReturnData": True,
+                    },
+                },
+                "period_minutes": {
+                    "type": "integer",
+                    "description": "How many minutes of data to retrieve (default: 60)",
+                    "default": 60,
+                },
+                "period_seconds": {
+                    "type": "integer",
+                    "description": "Datapoint granularity in seconds (default: 300)",
+                    "default": 300,
+                },
+            },
+            "required": ["queries"],
+        }
+
+    def execute(
+        self,
+        queries: list[dict],
+        period_minutes: int = 60,
+        period_seconds: int = 300,
+        **kwargs,
+    ) -> dict:
+        """Retrieve all requested metrics with as few API calls as possible."""
+        try:
+            metric_queries = self._build_queries(queries, period_seconds)
+            end_time = align_to_period(self._clock(), period_seconds)
+            start_time = end_time - timedelta(minutes=period_minutes)
+
+            series, messages, api_calls = self._fetch_all(metric_queries, start_time, end_time)
+
+            from alarm_investigator.tools.analysis import analyze_series
+
+            # One vectorized pass summarizes every returned series
+            summaries = analyze_series(
+                [(entry["timestamps"], entry["values"]) for entry in series.values()]
+            )
+            results = []
+            for (query_id, entry), statistics in zip(series.items(), summaries):
+                results.append(
+                    {
+                        "id": query_id,
+                        "label": entry["label"],
+                        "status_code": entry.get("status_code"),
+                        "datapoints": [
+                            {"timestamp": ts.isoformat(), "value": val}
+                            for ts, val in zip(entry["timestamps"], entry["values"])
+                        ],
+                        "statistics": statistics,
                     }
-                ],
-                StartTime=start_time,
-                EndTime=end_time,
+                )
+
+            response = {"status": "success", "results": results, "api_calls": api_calls}
+            if messages:
+                response["messages"] = messages
+            return response
+
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+
+    def _fetch_all(
+        self, metric_queries: list[dict], start_time: datetime, end_time: datetime
+    ) -> tuple[dict[str, dict], list[str], int]:
+        """Run packed get_metric_data calls, following NextToken pagination.
+
+        Returns the series per query id, any API messages and the call count.
+        """
+        series: dict[str, dict] = {
+            q["Id"]: {"label": q.get("Label"), "timestamps": [], "values": []}
+            for q in metric_queries
+        }
+        messages = []
+        api_calls = 0
+
+        for chunk in self._pack(metric_queries):
+            next_token = None
+            while True:
+                params = {
+                    "MetricDataQueries": chunk,
+                    "StartTime": start_time,
+                    "EndTime": end_time,
+                }
+                if next_token:
+                    params["NextToken"] = next_token
+                response = self._client.get_metric_data(**params)
+                api_calls += 1
+
+                for result in response.get("MetricDataResults", []):
+                    entry = series[result["Id"]]
+                    entry["label"] = result.get("Label") or entry["label"]
+                    entry["status_code"] = result.get("StatusCode")
+                    entry["timestamps"].extend(result.get("Timestamps", []))
+                    entry["values"].extend(result.get("Values", []))
+                messages.extend(m.get("Value") for m in response.get("Messages", []))
+
+                next_token = response.get("NextToken")
+                if not next_token:
+                    break
+
+        return series, messages, api_calls
+
+    def _build_queries(self, queries: list[dict], period_seconds: int) -> list[dict]:
+        """Convert tool input into MetricDataQueries entries."""
+        if not queries:
+            raise ValueError("At least one query is required")
+
+        metric_queries = []
+        for index, query in enumerate(queries, start=1):
+            query_id = query.get("id") or f"q{index}"
+            if not self.ID_PATTERN.match(query_id):
+                raise ValueError(
+                    f"Invalid query id {query_id!r}: must start with a lowercase letter "
+                    "and contain only letters, digits and underscores"
+                )
+
+            if query.get("expression"):
+                entry = {
+                    "Id": query_id,
+                    "Expression": query["expression"],
+                    "Period": period_seconds,
+                }
+            else:
+                dimensions = query.get("dimensions") or {}
+                entry = {
+                    "Id": query_id,
+                    "MetricStat": {
+                        "Metric": {
+                            "Namespace": query["namespace"],
+                            "MetricName": query["metric_name"],
+                            "Dimensions": [{"Name": k, "Value": v} for k, v in dimensions.items()],
+                        },
+                        "Period": period_seconds,
+                        "Stat": query.get("stat", "Average"),
+                    },
+                }
+            entry["ReturnData"] = True
+            if query.get("label"):
+                entry["Label"] = query["label"]
+            metric_queries.append(entry)
+
+        ids = [q["Id"] for q in metric_queries]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Query ids must be unique")
+        return metric_queries
+
+    def _pack(self, metric_queries: list[dict]) -> list[list[dict]]:
+        """Split queries into API calls, keeping expressions with their inputs."""
+        limit = self.MAX_QUERIES_PER_CALL
+        if len(metric_queries) <= limit:
+            return [metric_queries]
+
+        expressions = [q["Expression"] for q in metric_queries if "Expression" in q]
+        referenced = {
+            token for expression in expressions for token in re.findall(r"\b\w+\b", expression)
+        }
+        linked = [q for q in metric_queries if "Expression" in q or q["Id"] in referenced]
+        linked_ids = {q["Id"] for q in linked}
+        independent = [q for q in metric_queries if q["Id"] not in linked_ids]
+        if len(linked) > limit:
+            raise ValueError(
+                f"Expressions and the metrics they reference exceed {limit} queries per call"
             )
 
-            results = response.get("MetricDataResults", [])
-            if not results:
-                return {"status": "success", "datapoints": [], "statistics": {}}
+        first = linked + independent[: limit - len(linked)]
+        rest = independent[limit - len(linked) :]
+        return [first] + [rest[i : i + limit] for i in range(0, len(rest), limit)]
 
-            metric_result = results[0]
-            timestamps = metric_result.get("Timestamps", [])
-            values = metric_result.get("Values", [])
 
-            datapoints = [
-                {"timestamp": ts.isoformat(), "value": val}
-                for ts, val in zip(timestamps, values)
-            ]
+class FindCorrelatedMetricsTool(GetMetricsBatchTool):
+    """Tool to rank a resource's metrics by correlation with the alarm metric."""
+
+    name = "find_correlated_metrics"
+    description = (
+        "Discover which other CloudWatch metrics of the alarmed resource moved "
+        "together with the alarm metric. Lists every metric sharing the given "
+        "dimensions, fetches them in bulk over the same window and ranks them "
+        "by correlation, including metrics that lead the alarm metric in time. "
+        "Use this instead of guessing metric names one at a time."
+    )
+    # Pages through list_metrics, then bulk-fetches up to MAX_CANDIDATES series;
+    # kept below the agent's 30s tool timeout so the guard reports it first
+    timeout = 25
+
+    MAX_CANDIDATES = 200
+    PERIOD_SECONDS = 300
+
+    @classmethod
+    def get_parameters_schema(cls) -> dict:
+        return {
+            "type": "object",
+            "properties": {
+                "namespace": {
+                    "type": "string",
+                    "description": "Namespace of the alarm metric (e.g., AWS/EC2)",
+                },
+                "metric_name": {
+                    "type": "string",
+                    "description": "Name of the alarm metric",
+                },
+                "dimensions": {
+                    "type": "object",
+                    "description": "The alarm's dimensions; candidates must share them",
+                    "additionalProperties": {"type": "string"},
+                },
+                "stat": {
+                    "type": "string",
+                    "description": "Statistic used for every metric (default: Average)",
+                    "default": "Average",
+                },
+                "search_namespace": {
+                    "type": "string",
+                    "description": "Only consider metrics in this namespace (default: all)",
+                },
+                "period_minutes": {
+                    "type": "integer",
+                    "description": "How many minutes of data to compare (default: 180)",
+                    "default": 180,
+                },
+                "max_lag_minutes": {
+                    "type": "integer",
+                    "description": "Largest lead time to test (default: 30)",
+                    "default": 30,
+                },
+                "top_n": {
+                    "type": "integer",
+                    "description": "How many metrics to return (default: 10)",
+                    "default": 10,
+                },
+            },
+            "required": ["namespace", "metric_name", "dimensions"],
+        }
 
-            statistics = {}
-            if values:
-                statistics = {
-                    "min": min(values),
-                    "max": max(values),
-                    "avg": sum(values) / len(values),
-                    "count": len(values),
+    def execute(
+        self,
+        namespace: str,
+        metric_name: str,
+        dimensions: dict,
+        stat: str = "Average",
+        search_namespace: str | None = None,
+        period_minutes: int = 180,
+        max_lag_minutes: int = 30,
+        top_n: int = 10,
+        **kwargs,
+    ) -> dict:
+        """Rank the resource's metrics by correlation with the alarm metric."""
+        try:
+            period = self.PERIOD_SECONDS
+            candidates, list_calls = self._list_candidates(dimensions, search_namespace)
+            candidates = [
+                c
+                for c in candidates
+                if (c["namespace"], c["metric_name"]) != (namespace, metric_name)
+            ]
+            truncated = len(candidates) > self.MAX_CANDIDATES
+            candidates = candidates[: self.MAX_CANDIDATES]
+            if not candidates:
+                return {
+                    "status": "success",
+                    "candidates_evaluated": 0,
+                    "correlated_metrics": [],
                 }
 
-            return {
-                "status": "success",
+            target = {
+                "id": "target",
                 "namespace": namespace,
                 "metric_name": metric_name,
-                "datapoints": datapoints,
-                "statistics": statistics,
+                "dimensions": dimensions,
+                "stat": stat,
+            }
+            queries = [target] + [
+                {**candidate, "id": f"c{i}", "stat": stat} for i, candidate in enumerate(candidates)
+            ]
+            metric_queries = self._build_queries(queries, period)
+
+            end_time = align_to_period(self._clock(), period)
+            start_time = end_time - timedelta(minutes=period_minutes)
+            series, _, api_calls = self._fetch_all(metric_queries, start_time, end_time)
+
+            import numpy as np
+
+            from alarm_investigator.tools.analysis import (
+                align_series,
+                analyze_series,
+                correlate_with_lag,
+            )
+
+            ordered = [series[q["Id"]] for q in metric_queries]
+            _, matrix = align_series([(e["timestamps"], e["values"]) for e in ordered])
+            if not matrix.shape[1] or not ordered[0]["values"]:
+                return {"status": "error", "error": f"No data for {namespace}/{metric_name}"}
+
+            correlations, lags = correlate_with_lag(matrix, 0, max_lag_minutes * 60 // period)
+            summaries = analyze_series([(e["timestamps"], e["values"]) for e in ordered[1:]])
+
+            ranked = []
+            for index in np.argsort(-np.nan_to_num(np.abs(correlations[1:]), nan=-1.0)):
+                if np.isnan(correlations[index + 1]) or len(ranked) >= top_n:
+                    break
+                candidate = candidates[index]
+                summary = summaries[index]
+                ranked.append(
+                    {
+                        **candidate,
+                        "correlation": round(float(correlations[index + 1]), 3),
+                        "lead_minutes": int(lags[index + 1]) * period // 60,
+                        "statistics": {
+                            key: summary[key] for key in ("min", "max", "avg") if key in summary
+                        },
+                    }
+                )
+
+            result = {
+                "status": "success",
+                "candidates_evaluated": len(candidates),
+                "api_calls": list_calls + api_calls,
+                "correlated_metrics": ranked,
             }
+            if truncated:
+                result["note"] = f"Only the first {self.MAX_CANDIDATES} metrics were evaluated"
+            return result
 
         except Exception as e:
             return {"status": "error", "error": str(e)}
+
+    def _list_candidates(
+        self, dimensions: dict, search_namespace: str | None
+    ) -> tuple[list[dict], int]:
+        """List recently active metrics sharing the dimensions, following pagination."""
+        params = {
+            "Dimensions": [{"Name": k, "Value": v} for k, v in dimensions.items()],
+            "RecentlyActive": "PT3H",
+        }
+        if search_namespace:
+            params["Namespace"] = search_namespace
+
+        candidates = []
+        seen = set()
+        calls = 0
+        next_token = None
+        while True:
+            if next_token:
+                params["NextToken"] = next_token
+            response = self._client.list_metrics(**params)
+            calls += 1
+
+            for metric in response.get("Metrics", []):
+                metric_dimensions = {d["Name"]: d["Value"] for d in metric.get("Dimensions", [])}
+                key = (
+                    metric["Namespace"],
+                    metric["MetricName"],
+                    tuple(sorted(metric_dimensions.items())),
+                )
+                if key not in seen:
+                    seen.add(key)
+                    candidates.append(
+                        {
+                            "namespace": metric["Namespace"],
+                            "metric_name": metric["MetricName"],
+                            "dimensions": metric_dimensions,
+                        }
+                    )
+
+            next_token = response.get("NextToken")
+            if not next_token:
+                break
+
+        return candidates, calls
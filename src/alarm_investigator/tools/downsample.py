@@ -0,0 +1,90 @@
+"""Shape-preserving downsampling and compact encodings for metric series."""
+
+from datetime import datetime
+
+Point = tuple[datetime, float]
+
+
+def lttb(points: list[Point], threshold: int) -> list[Point]:
+    """Downsample with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last points and, per bucket, the point forming the
+    largest triangle with its neighbours, which preserves spikes and trends.
+    Points must be in ascending time order.
+    """
+    if threshold >= len(points) or threshold < 3:
+        return list(points)
+
+    xs = [ts.timestamp() for ts, _ in points]
+    ys = [val for _, val in points]
+    bucket_size = (len(points) - 2) / (threshold - 2)
+
+    sampled = [points[0]]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        # Average of the next bucket is the third triangle vertex
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, len(points))
+        if next_start >= next_end:
+            avg_x, avg_y = xs[-1], ys[-1]
+        else:
+            count = next_end - next_start
+            avg_x = sum(xs[next_start:next_end]) / count
+            avg_y = sum(ys[next_start:next_end]) / count
+
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+
+        sampled.append(points[best])
+        a = best
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def minmax(points: list[Point], threshold: int) -> list[Point]:
+    """Downsample by keeping the minimum and maximum point of each bucket.
+
+    Points must be in ascending time order; the result stays in that order.
+    """
+    if threshold >= len(points) or threshold < 2:
+        return list(points)
+
+    buckets = threshold // 2
+    bucket_size = len(points) / buckets
+    sampled = []
+    for i in range(buckets):
+        bucket = points[int(i * bucket_size) : int((i + 1) * bucket_size)]
+        if not bucket:
+            continue
+        low = min(bucket, key=lambda p: p[1])
+        high = max(bucket, key=lambda p: p[1])
+        sampled.extend(sorted({low, high}))
+    return sampled
+
+
+def encode_columnar(points: list[Point], step_seconds: int) -> dict:
+    """Encode ascending points as a start time, a step and a value array.
+
+    ``offsets`` (in steps from ``start``) is only included when the points
+    are not one contiguous run, e.g. after downsampling or with gaps.
+    """
+    if not points:
+        return {"start": None, "step_seconds": step_seconds, "values": []}
+
+    start = points[0][0]
+    offsets = [round((ts - start).total_seconds() / step_seconds) for ts, _ in points]
+    encoded = {
+        "start": start.isoformat(),
+        "step_seconds": step_seconds,
+        "values": [val for _, val in points],
+    }
+    if offsets != list(range(len(points))):
+        encoded["offsets"] = offsets
+    return encoded
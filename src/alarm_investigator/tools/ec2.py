@@ -4,33 +4,49 @@ from alarm_investigator.tools.base import Tool
 
 
 class DescribeEC2InstanceTool(Tool):
-    """Tool to describe an EC2 instance."""
+    """Tool to describe one or more EC2 instances."""
 
     name = "describe_ec2_instance"
     description = (
         "Get detailed information about an EC2 instance including its state, "
         "type, network configuration, and tags. Use this to understand the "
-        "current state and configuration of an instance related to an alarm."
+        "current state and configuration of an instance related to an alarm. "
+        "Pass instance_ids to describe several instances in one call."
     )
+    cache_ttl = 300
+
+    MAX_IDS_PER_FILTER = 200
 
     def __init__(self, ec2_client):
         self._client = ec2_client
 
-    def get_parameters_schema(self) -> dict:
+    @classmethod
+    def get_parameters_schema(cls) -> dict:
         return {
             "type": "object",
             "properties": {
                 "instance_id": {
                     "type": "string",
                     "description": "The EC2 instance ID (e.g., i-1234567890abcdef0)",
-                }
+                },
+                "instance_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Several EC2 instance IDs; results are keyed by ID",
+                },
             },
-            "required": ["instance_id"],
         }
 
-    def execute(self, instance_id: str, **kwargs) -> dict:
-        """Describe an EC2 instance."""
+    def execute(
+        self, instance_id: str | None = None, instance_ids: list[str] | None = None, **kwargs
+    ) -> dict:
+        """Describe an EC2 instance, or several keyed by ID."""
         try:
+            if instance_ids:
+                return self._describe_many(instance_ids)
+            if not instance_id:
+                return {"status": "error", "error": "instance_id or instance_ids is required"}
+
             response = self._client.describe_instances(InstanceIds=[instance_id])
 
             reservations = response.get("Reservations", [])
@@ -39,30 +55,61 @@ class DescribeEC2InstanceTool(Tool):
 
             instance = reservations[0]["Instances"][0]
 
-            # Extract name from tags
-            name = None
-            for tag in instance.get("Tags", []):
-                if tag["Key"] == "Name":
-                    name = tag["Value"]
-                    break
-
-            return {
-                "status": "success",
-                "instance": {
-                    "instance_id": instance["InstanceId"],
-                    "instance_type": instance.get("InstanceType"),
-                    "state": instance.get("State", {}).get("Name"),
-                    "launch_time": str(instance.get("LaunchTime", "")),
-                    "private_ip": instance.get("PrivateIpAddress"),
-                    "public_ip": instance.get("PublicIpAddress"),
-                    "vpc_id": instance.get("VpcId"),
-                    "subnet_id": instance.get("SubnetId"),
-                    "name": name,
-                    "tags": {
-                        tag["Key"]: tag["Value"] for tag in instance.get("Tags", [])
-                    },
-                },
-            }
+            return {"status": "success", "instance": self._format_instance(instance)}
 
         except Exception as e:
             return {"status": "error", "error": str(e)}
+
+    def _describe_many(self, instance_ids: list[str]) -> dict:
+        """Describe instances with as few paginated calls as possible.
+
+        An instance-id filter is used instead of InstanceIds so unknown IDs
+        are reported as not found rather than failing the whole call.
+        """
+        unique_ids = list(dict.fromkeys(instance_ids))
+        instances = {}
+
+        for i in range(0, len(unique_ids), self.MAX_IDS_PER_FILTER):
+            params = {
+                "Filters": [
+                    {"Name": "instance-id", "Values": unique_ids[i : i + self.MAX_IDS_PER_FILTER]}
+                ]
+            }
+            while True:
+                response = self._client.describe_instances(**params)
+                for reservation in response.get("Reservations", []):
+                    for instance in reservation.get("Instances", []):
+                        instances[instance["InstanceId"]] = self._format_instance(instance)
+
+                next_token = response.get("NextToken")
+                if not next_token:
+                    break
+                params["NextToken"] = next_token
+
+        return {
+            "status": "success",
+            "instances": instances,
+            "not_found": [i for i in unique_ids if i not in instances],
+        }
+
+    def _format_instance(self, instance: dict) -> dict:
+        """Extract the fields relevant to an investigation."""
+        # Extract name from tags
+        name = None
+        for tag in instance.get("Tags", []):
+            if tag["Key"] == "Name":
+                name = tag["Value"]
+                break
+
+        return {
+            "instance_id": instance["InstanceId"],
+            "instance_type": instance.get("InstanceType"),
+            "state": instance.get("State", {}).get("Name"),
+            "launch_time": str(instance.get("LaunchTime", "")),
+            "private_ip": instance.get("PrivateIpAddress"),
+            "public_ip": instance.get("PublicIpAddress"),
+            "vpc_id": instance.get("VpcId"),
+            "subnet_id": instance.get("SubnetId"),
+            "name": name,
+            "tags": {tag["Key"]: tag["Value"] for tag in instance.get("Tags", [])},
+        }
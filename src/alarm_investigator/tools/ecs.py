@@ -4,19 +4,24 @@ from alarm_investigator.tools.base import Tool
 
 
 class DescribeECSServiceTool(Tool):
-    """Tool to describe an ECS service."""
+    """Tool to describe one or more ECS services."""
 
     name = "describe_ecs_service"
     description = (
         "Get detailed information about an ECS service including its status, "
         "task counts, and deployment state. Use this to understand service "
-        "health and configuration related to an alarm."
+        "health and configuration related to an alarm. "
+        "Pass services to describe several services of the cluster in one call."
     )
+    cache_ttl = 300
+
+    MAX_SERVICES_PER_CALL = 10
 
     def __init__(self, ecs_client):
         self._client = ecs_client
 
-    def get_parameters_schema(self) -> dict:
+    @classmethod
+    def get_parameters_schema(cls) -> dict:
         return {
             "type": "object",
             "properties": {
@@ -28,49 +33,83 @@ class DescribeECSServiceTool(Tool):
                     "type": "string",
                     "description": "The ECS service name or ARN",
                 },
+                "services": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Several ECS service names or ARNs; results are keyed by name",
+                },
             },
-            "required": ["cluster", "service"],
+            "required": ["cluster"],
         }
 
-    def execute(self, cluster: str, service: str, **kwargs) -> dict:
-        """Describe an ECS service."""
+    def execute(
+        self,
+        cluster: str,
+        service: str | None = None,
+        services: list[str] | None = None,
+        **kwargs,
+    ) -> dict:
+        """Describe an ECS service, or several keyed by the requested name."""
         try:
+            if services:
+                return self._describe_many(cluster, services)
+            if not service:
+                return {"status": "error", "error": "service or services is required"}
+
             response = self._client.describe_services(
                 cluster=cluster, services=[service]
             )
 
-            services = response.get("services", [])
-            if not services:
+            found = response.get("services", [])
+            if not found:
                 return {
                     "status": "error",
                     "error": f"Service {service} not found in cluster {cluster}",
                 }
 
-            svc = services[0]
-            deployments = svc.get("deployments", [])
-
-            return {
-                "status": "success",
-                "service": {
-                    "name": svc["serviceName"],
-                    "arn": svc.get("serviceArn"),
-                    "status": svc.get("status"),
-                    "desired_count": svc.get("desiredCount"),
-                    "running_count": svc.get("runningCount"),
-                    "pending_count": svc.get("pendingCount"),
-                    "launch_type": svc.get("launchType"),
-                    "deployments": [
-                        {
-                            "id": d.get("id"),
-                            "status": d.get("status"),
-                            "desired": d.get("desiredCount"),
-                            "running": d.get("runningCount"),
-                            "rollout_state": d.get("rolloutState"),
-                        }
-                        for d in deployments
-                    ],
-                },
-            }
+            return {"status": "success", "service": self._format_service(found[0])}
 
         except Exception as e:
             return {"status": "error", "error": str(e)}
+
+    def _describe_many(self, cluster: str, services: list[str]) -> dict:
+        """Describe services in chunks of the per-call API limit."""
+        unique_names = list(dict.fromkeys(services))
+        described = {}
+
+        for i in range(0, len(unique_names), self.MAX_SERVICES_PER_CALL):
+            chunk = unique_names[i : i + self.MAX_SERVICES_PER_CALL]
+            response = self._client.describe_services(cluster=cluster, services=chunk)
+            for svc in response.get("services", []):
+                # Key by what was requested, which may be a name or an ARN
+                arn = svc.get("serviceArn")
+                key = arn if arn in chunk else svc["serviceName"]
+                described[key] = self._format_service(svc)
+
+        return {
+            "status": "success",
+            "services": described,
+            "not_found": [name for name in unique_names if name not in described],
+        }
+
+    def _format_service(self, svc: dict) -> dict:
+        """Extract the fields relevant to an investigation."""
+        return {
+            "name": svc["serviceName"],
+            "arn": svc.get("serviceArn"),
+            "status": svc.get("status"),
+            "desired_count": svc.get("desiredCount"),
+            "running_count": svc.get("runningCount"),
+            "pending_count": svc.get("pendingCount"),
+            "launch_type": svc.get("launchType"),
+            "deployments": [
+                {
+                    "id": d.get("id"),
+                    "status": d.get("status"),
+                    "desired": d.get("desiredCount"),
+                    "running": d.get("runningCount"),
+                    "rollout_state": d.get("rolloutState"),
+                }
+                for d in svc.get("deployments", [])
+            ],
+        }
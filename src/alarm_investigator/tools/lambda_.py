@@ -1,55 +1,113 @@
 """Lambda investigation tools."""
 
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.exceptions import ClientError
+
 from alarm_investigator.tools.base import Tool
 
 
 class DescribeLambdaFunctionTool(Tool):
-    """Tool to describe a Lambda function."""
+    """Tool to describe one or more Lambda functions."""
 
     name = "describe_lambda_function"
     description = (
         "Get detailed information about a Lambda function including its "
         "configuration, memory, timeout, and state. Use this to understand "
-        "function settings related to an alarm."
+        "function settings related to an alarm. "
+        "Pass function_names to describe several functions in one call."
     )
+    cache_ttl = 300
+
+    MAX_PARALLEL_CALLS = 8
 
     def __init__(self, lambda_client):
         self._client = lambda_client
 
-    def get_parameters_schema(self) -> dict:
+    @classmethod
+    def get_parameters_schema(cls) -> dict:
         return {
             "type": "object",
             "properties": {
                 "function_name": {
                     "type": "string",
                     "description": "The Lambda function name or ARN",
-                }
+                },
+                "function_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": (
+                        "Several Lambda function names or ARNs; results are keyed by name"
+                    ),
+                },
             },
-            "required": ["function_name"],
         }
 
-    def execute(self, function_name: str, **kwargs) -> dict:
-        """Describe a Lambda function."""
+    def execute(
+        self, function_name: str | None = None, function_names: list[str] | None = None, **kwargs
+    ) -> dict:
+        """Describe a Lambda function, or several keyed by the requested name."""
         try:
+            if function_names:
+                return self._describe_many(function_names)
+            if not function_name:
+                return {"status": "error", "error": "function_name or function_names is required"}
+
             response = self._client.get_function(FunctionName=function_name)
 
-            config = response.get("Configuration", {})
-            env_vars = config.get("Environment", {}).get("Variables", {})
-
-            return {
-                "status": "success",
-                "function": {
-                    "name": config["FunctionName"],
-                    "arn": config.get("FunctionArn"),
-                    "runtime": config.get("Runtime"),
-                    "handler": config.get("Handler"),
-                    "memory_mb": config.get("MemorySize"),
-                    "timeout_seconds": config.get("Timeout"),
-                    "state": config.get("State"),
-                    "last_modified": config.get("LastModified"),
-                    "environment_variables": list(env_vars.keys()),
-                },
-            }
+            return {"status": "success", "function": self._format_function(response)}
 
         except Exception as e:
             return {"status": "error", "error": str(e)}
+
+    def _describe_many(self, function_names: list[str]) -> dict:
+        """Describe functions concurrently.
+
+        Lambda has no batch describe API, so get_function calls are fanned
+        out over a small thread pool instead.
+        """
+        unique_names = list(dict.fromkeys(function_names))
+
+        def describe(name: str) -> tuple[str, dict | None, str | None]:
+            try:
+                response = self._client.get_function(FunctionName=name)
+                return name, self._format_function(response), None
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") == "ResourceNotFoundException":
+                    return name, None, None
+                return name, None, str(e)
+            except Exception as e:
+                return name, None, str(e)
+
+        functions, not_found, errors = {}, [], {}
+        workers = min(self.MAX_PARALLEL_CALLS, len(unique_names))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for name, function, error in executor.map(describe, unique_names):
+                if function is not None:
+                    functions[name] = function
+                elif error is not None:
+                    errors[name] = error
+                else:
+                    not_found.append(name)
+
+        result = {"status": "success", "functions": functions, "not_found": not_found}
+        if errors:
+            result["errors"] = errors
+        return result
+
+    def _format_function(self, response: dict) -> dict:
+        """Extract the fields relevant to an investigation."""
+        config = response.get("Configuration", {})
+        env_vars = config.get("Environment", {}).get("Variables", {})
+
+        return {
+            "name": config["FunctionName"],
+            "arn": config.get("FunctionArn"),
+            "runtime": config.get("Runtime"),
+            "handler": config.get("Handler"),
+            "memory_mb": config.get("MemorySize"),
+            "timeout_seconds": config.get("Timeout"),
+            "state": config.get("State"),
+            "last_modified": config.get("LastModified"),
+            "environment_variables": list(env_vars.keys()),
+        }
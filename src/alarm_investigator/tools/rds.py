@@ -4,33 +4,55 @@ from alarm_investigator.tools.base import Tool
 
 
 class DescribeRDSInstanceTool(Tool):
-    """Tool to describe an RDS database instance."""
+    """Tool to describe one or more RDS database instances."""
 
     name = "describe_rds_instance"
     description = (
         "Get detailed information about an RDS database instance including its "
         "status, configuration, storage, and endpoint. Use this to understand "
-        "database health and configuration related to an alarm."
+        "database health and configuration related to an alarm. "
+        "Pass db_instance_identifiers to describe several instances in one call."
     )
+    cache_ttl = 300
+
+    MAX_IDS_PER_FILTER = 100
 
     def __init__(self, rds_client):
         self._client = rds_client
 
-    def get_parameters_schema(self) -> dict:
+    @classmethod
+    def get_parameters_schema(cls) -> dict:
         return {
             "type": "object",
             "properties": {
                 "db_instance_identifier": {
                     "type": "string",
                     "description": "The RDS DB instance identifier",
-                }
+                },
+                "db_instance_identifiers": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Several RDS DB instance identifiers; results are keyed by ID",
+                },
             },
-            "required": ["db_instance_identifier"],
         }
 
-    def execute(self, db_instance_identifier: str, **kwargs) -> dict:
-        """Describe an RDS DB instance."""
+    def execute(
+        self,
+        db_instance_identifier: str | None = None,
+        db_instance_identifiers: list[str] | None = None,
+        **kwargs,
+    ) -> dict:
+        """Describe an RDS DB instance, or several keyed by identifier."""
         try:
+            if db_instance_identifiers:
+                return self._describe_many(db_instance_identifiers)
+            if not db_instance_identifier:
+                return {
+                    "status": "error",
+                    "error": "db_instance_identifier or db_instance_identifiers is required",
+                }
+
             response = self._client.describe_db_instances(
                 DBInstanceIdentifier=db_instance_identifier
             )
@@ -42,25 +64,55 @@ class DescribeRDSInstanceTool(Tool):
                     "error": f"DB instance {db_instance_identifier} not found",
                 }
 
-            db = instances[0]
-            endpoint = db.get("Endpoint", {})
-
-            return {
-                "status": "success",
-                "db_instance": {
-                    "identifier": db["DBInstanceIdentifier"],
-                    "instance_class": db.get("DBInstanceClass"),
-                    "engine": db.get("Engine"),
-                    "engine_version": db.get("EngineVersion"),
-                    "status": db.get("DBInstanceStatus"),
-                    "allocated_storage_gb": db.get("AllocatedStorage"),
-                    "storage_type": db.get("StorageType"),
-                    "multi_az": db.get("MultiAZ", False),
-                    "endpoint": endpoint.get("Address"),
-                    "port": endpoint.get("Port"),
-                    "arn": db.get("DBInstanceArn"),
-                },
-            }
+            return {"status": "success", "db_instance": self._format_instance(instances[0])}
 
         except Exception as e:
             return {"status": "error", "error": str(e)}
+
+    def _describe_many(self, identifiers: list[str]) -> dict:
+        """Describe instances with a db-instance-id filter, following Marker pages."""
+        unique_ids = list(dict.fromkeys(identifiers))
+        instances = {}
+
+        for i in range(0, len(unique_ids), self.MAX_IDS_PER_FILTER):
+            params = {
+                "Filters": [
+                    {
+                        "Name": "db-instance-id",
+                        "Values": unique_ids[i : i + self.MAX_IDS_PER_FILTER],
+                    }
+                ]
+            }
+            while True:
+                response = self._client.describe_db_instances(**params)
+                for db in response.get("DBInstances", []):
+                    instances[db["DBInstanceIdentifier"]] = self._format_instance(db)
+
+                marker = response.get("Marker")
+                if not marker:
+                    break
+                params["Marker"] = marker
+
+        return {
+            "status": "success",
+            "db_instances": instances,
+            "not_found": [i for i in unique_ids if i not in instances],
+        }
+
+    def _format_instance(self, db: dict) -> dict:
+        """Extract the fields relevant to an investigation."""
+        endpoint = db.get("Endpoint", {})
+
+        return {
+            "identifier": db["DBInstanceIdentifier"],
+            "instance_class": db.get("DBInstanceClass"),
+            "engine": db.get("Engine"),
+            "engine_version": db.get("EngineVersion"),
+            "status": db.get("DBInstanceStatus"),
+            "allocated_storage_gb": db.get("AllocatedStorage"),
+            "storage_type": db.get("StorageType"),
+            "multi_az": db.get("MultiAZ", False),
+            "endpoint": endpoint.get("Address"),
+            "port": endpoint.get("Port"),
+            "arn": db.get("DBInstanceArn"),
+        }
@@ -1,9 +1,12 @@
 """Pytest configuration and fixtures."""
 
 import os
+from collections.abc import Callable
 
 import pytest
 
+from alarm_investigator.models import AlarmEvent, AlarmState
+
 
 @pytest.fixture(autouse=True)
 def aws_credentials():
@@ -13,3 +16,46 @@ def aws_credentials():
     os.environ["AWS_SECURITY_TOKEN"] = "testing"
     os.environ["AWS_SESSION_TOKEN"] = "testing"
     os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+
+class FakeClock:
+    """Manually advanced clock whose sleep advances time."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """A fake clock to pass as a ``clock`` (and its ``sleep``) dependency."""
+    return FakeClock()
+
+
+@pytest.fixture
+def alarm_event() -> Callable[..., AlarmEvent]:
+    """Factory for an EC2 CPU alarm event; keyword arguments override its fields."""
+
+    def create(**overrides) -> AlarmEvent:
+        fields = {
+            "alarm_name": "HighCPU",
+            "account_id": "123456789012",
+            "region": "us-east-1",
+            "state": AlarmState.ALARM,
+            "previous_state": AlarmState.OK,
+            "reason": "Threshold Crossed: CPU > 80%",
+            "namespace": "AWS/EC2",
+            "metric_name": "CPUUtilization",
+            "dimensions": {"InstanceId": "i-1234567890abcdef0"},
+            "raw_event": {},
+        }
+        return AlarmEvent(**{**fields, **overrides})
+
+    return create
@@ -1,9 +1,19 @@
 """Tests for the Bedrock agent orchestrator."""
 
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import replace
 from unittest.mock import MagicMock
 
-from alarm_investigator.agent import InvestigationAgent
+import pytest
+
+from alarm_investigator.agent import AsyncInvestigationAgent, InvestigationAgent
+from alarm_investigator.checkpoint import FileCheckpointStore
+from alarm_investigator.metrics import MetricsRecorder
 from alarm_investigator.models import AlarmEvent, AlarmState
+from alarm_investigator.prefetch import EvidenceRoute, EvidenceRouter
 from alarm_investigator.tools.base import Tool, ToolRegistry
 
 
@@ -17,7 +27,8 @@ class MockTool(Tool):
         self.call_count = 0
         self.last_args = None
 
-    def get_parameters_schema(self) -> dict:
+    @classmethod
+    def get_parameters_schema(cls) -> dict:
         return {
             "type": "object",
             "properties": {"value": {"type": "string"}},
@@ -30,6 +41,76 @@ class MockTool(Tool):
         return {"result": "mock_result"}
 
 
+class SlowTool(Tool):
+    """Tool that sleeps before answering, optionally failing."""
+
+    description = "A slow tool"
+
+    def __init__(self, name: str, delay: float, fail: bool = False):
+        self.name = name
+        self._delay = delay
+        self._fail = fail
+
+    @classmethod
+    def get_parameters_schema(cls) -> dict:
+        return {"type": "object", "properties": {}}
+
+    def execute(self, **kwargs) -> dict:
+        time.sleep(self._delay)
+        if self._fail:
+            raise RuntimeError(f"{self.name} failed")
+        return {"result": self.name}
+
+
+def tool_use_response(*names: str) -> dict:
+    """Build a Bedrock response requesting the named tools."""
+    return {
+        "stopReason": "tool_use",
+        "output": {
+            "message": {
+                "role": "assistant",
+                "content": [
+                    {"toolUse": {"toolUseId": f"id-{name}", "name": name, "input": {}}}
+                    for name in names
+                ],
+            }
+        },
+    }
+
+
+def stream_response(*events: dict) -> dict:
+    """Wrap converse_stream events in a response dict."""
+    return {"stream": iter(events)}
+
+
+def stream_text(index: int, *chunks: str) -> list[dict]:
+    """Build the stream events for a text content block."""
+    return [
+        *(
+            {"contentBlockDelta": {"contentBlockIndex": index, "delta": {"text": c}}}
+            for c in chunks
+        ),
+        {"contentBlockStop": {"contentBlockIndex": index}},
+    ]
+
+
+def stream_tool_use(index: int, tool_use_id: str, name: str, *input_chunks: str) -> list[dict]:
+    """Build the stream events for a toolUse content block."""
+    return [
+        {
+            "contentBlockStart": {
+                "contentBlockIndex": index,
+                "start": {"toolUse": {"toolUseId": tool_use_id, "name": name}},
+            }
+        },
+        *(
+            {"contentBlockDelta": {"contentBlockIndex": index, "delta": {"toolUse": {"input": c}}}}
+            for c in input_chunks
+        ),
+        {"contentBlockStop": {"contentBlockIndex": index}},
+    ]
+
+
 class TestInvestigationAgent:
     """Tests for InvestigationAgent."""
 
@@ -61,6 +142,18 @@ class TestInvestigationAgent:
         assert "CPUUtilization" in prompt
         assert "root cause" in prompt.lower()
 
+    def test_agent_prompt_lists_related_alarms(self):
+        """Test coalesced alarms are listed in the alarm context block."""
+        agent = InvestigationAgent(bedrock_client=MagicMock(), tool_registry=ToolRegistry())
+        related = self.create_alarm_event()
+        related.alarm_name = "StatusCheckFailed"
+
+        blocks = agent._build_system_blocks(self.create_alarm_event(), [related])
+
+        assert "## Related Alarms" in blocks[2]["text"]
+        assert "StatusCheckFailed" in blocks[2]["text"]
+        assert "Related Alarms" not in agent._build_system_prompt(self.create_alarm_event())
+
     def test_agent_handles_tool_use_response(self):
         """Test agent executes tools when Bedrock requests them."""
         registry = ToolRegistry()
@@ -164,3 +257,615 @@ class TestInvestigationAgent:
 
         assert mock_tool.call_count == 3
         assert "max iterations" in result.lower() or len(result) > 0
+
+    def test_agent_runs_turn_tools_in_parallel_in_order(self):
+        """Test tools of one turn run concurrently and keep toolUseId order."""
+        registry = ToolRegistry()
+        registry.register(SlowTool("slow_a", delay=0.3))
+        registry.register(SlowTool("slow_b", delay=0.1))
+        registry.register(SlowTool("slow_c", delay=0.3))
+
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.side_effect = [
+            tool_use_response("slow_a", "slow_b", "slow_c"),
+            {
+                "stopReason": "end_turn",
+                "output": {"message": {"role": "assistant", "content": [{"text": "Done"}]}},
+            },
+        ]
+
+        agent = InvestigationAgent(bedrock_client=mock_bedrock, tool_registry=registry)
+        started = time.monotonic()
+        agent.investigate(self.create_alarm_event())
+        elapsed = time.monotonic() - started
+
+        messages = mock_bedrock.converse.call_args_list[1].kwargs["messages"]
+        results = [block["toolResult"] for block in messages[-2]["content"]]
+        assert [r["toolUseId"] for r in results] == ["id-slow_a", "id-slow_b", "id-slow_c"]
+        assert [r["content"][0]["json"]["result"] for r in results] == [
+            "slow_a",
+            "slow_b",
+            "slow_c",
+        ]
+        assert elapsed < 0.6
+
+    def test_agent_isolates_tool_failures_and_timeouts(self):
+        """Test a failing or hanging tool does not stop the others."""
+        registry = ToolRegistry()
+        registry.register(SlowTool("broken", delay=0, fail=True))
+        registry.register(SlowTool("hanging", delay=1.0))
+        registry.register(SlowTool("healthy", delay=0))
+
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.side_effect = [
+            tool_use_response("broken", "hanging", "healthy"),
+            {
+                "stopReason": "end_turn",
+                "output": {"message": {"role": "assistant", "content": [{"text": "Done"}]}},
+            },
+        ]
+
+        agent = InvestigationAgent(
+            bedrock_client=mock_bedrock, tool_registry=registry, tool_timeout=0.2
+        )
+        agent.investigate(self.create_alarm_event())
+
+        messages = mock_bedrock.converse.call_args_list[1].kwargs["messages"]
+        results = [block["toolResult"]["content"][0]["json"] for block in messages[-2]["content"]]
+        assert results[0] == {"status": "error", "error": "broken failed"}
+        assert "timed out" in results[1]["error"]
+        assert results[2] == {"result": "healthy"}
+
+    def test_agent_times_tools_from_their_start_not_their_queueing(self):
+        """Test calls queued behind busy workers still get their full timeout."""
+        registry = ToolRegistry()
+        names = [f"slow_{i}" for i in range(5)]
+        for name in names:
+            registry.register(SlowTool(name, delay=0.5))
+
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.side_effect = [
+            tool_use_response(*names),
+            {
+                "stopReason": "end_turn",
+                "output": {"message": {"role": "assistant", "content": [{"text": "Done"}]}},
+            },
+        ]
+
+        agent = InvestigationAgent(
+            bedrock_client=mock_bedrock,
+            tool_registry=registry,
+            max_parallel_tools=4,
+            tool_timeout=0.8,
+        )
+        agent.investigate(self.create_alarm_event())
+
+        messages = mock_bedrock.converse.call_args_list[1].kwargs["messages"]
+        results = [block["toolResult"]["content"][0]["json"] for block in messages[-2]["content"]]
+        assert results == [{"result": name} for name in names]
+
+    def test_agent_does_not_poll_once_every_call_has_started(self, monkeypatch):
+        """Test waiting on running calls wakes for results, not every poll interval."""
+        registry = ToolRegistry()
+        registry.register(SlowTool("slow", delay=0.5))
+        waits = []
+
+        def counting_wait(futures, timeout, return_when):
+            waits.append(timeout)
+            return wait(futures, timeout=timeout, return_when=return_when)
+
+        monkeypatch.setattr("alarm_investigator.agent.wait", counting_wait)
+        agent = InvestigationAgent(bedrock_client=MagicMock(), tool_registry=registry)
+        results = agent._execute_tools([{"toolUseId": "id-slow", "name": "slow", "input": {}}])
+
+        assert results[0]["toolResult"]["content"][0]["json"] == {"result": "slow"}
+        # A few short polls at most, while the call waits to start
+        assert len(waits) < 5
+
+    def test_agent_abandoned_tool_does_not_block_later_turns(self):
+        """Test a timed-out call gives its worker slot back to the next turn."""
+        registry = ToolRegistry()
+        registry.register(SlowTool("hanging", delay=1.0))
+        registry.register(SlowTool("healthy", delay=0))
+
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.side_effect = [
+            tool_use_response("hanging"),
+            tool_use_response("healthy"),
+            {
+                "stopReason": "end_turn",
+                "output": {"message": {"role": "assistant", "content": [{"text": "Done"}]}},
+            },
+        ]
+
+        agent = InvestigationAgent(
+            bedrock_client=mock_bedrock,
+            tool_registry=registry,
+            max_parallel_tools=1,
+            tool_timeout=0.2,
+        )
+        started = time.monotonic()
+        agent.investigate(self.create_alarm_event())
+
+        assert time.monotonic() - started < 0.6
+        messages = mock_bedrock.converse.call_args_list[2].kwargs["messages"]
+        assert messages[-2]["content"][0]["toolResult"]["content"][0]["json"] == {
+            "result": "healthy"
+        }
+
+    def test_agent_caps_tools_and_forces_final_report_at_deadline(self):
+        """Test tool calls are cut to the deadline and the next turn must report."""
+        registry = ToolRegistry()
+        registry.register(SlowTool("hanging", delay=1.0))
+
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.side_effect = [
+            tool_use_response("hanging"),
+            {
+                "stopReason": "end_turn",
+                "output": {"message": {"role": "assistant", "content": [{"text": "Partial"}]}},
+            },
+        ]
+
+        agent = InvestigationAgent(
+            bedrock_client=mock_bedrock, tool_registry=registry, final_report_reserve=5.0
+        )
+        started = time.monotonic()
+        report = agent.investigate(self.create_alarm_event(), deadline=started + 5.2)
+
+        assert report == "Partial"
+        assert time.monotonic() - started < 0.8
+        messages = mock_bedrock.converse.call_args_list[1].kwargs["messages"]
+        assert "timed out" in messages[2]["content"][0]["toolResult"]["content"][0]["json"]["error"]
+        assert messages[2]["content"][-1] == {"text": InvestigationAgent.FINAL_REPORT_PROMPT}
+        assert agent.timings.forced_final_report
+        assert agent.timings.turns == 2
+
+    def test_agent_keeps_text_when_final_turn_requests_tools(self):
+        """Test a forced final turn never runs more tools."""
+        registry = ToolRegistry()
+        tool = MockTool()
+        registry.register(tool)
+
+        mock_bedrock = MagicMock()
+        response = tool_use_response("mock_tool")
+        response["output"]["message"]["content"].insert(0, {"text": "CPU spiked after deploy."})
+        mock_bedrock.converse.return_value = response
+
+        agent = InvestigationAgent(bedrock_client=mock_bedrock, tool_registry=registry)
+        report = agent.investigate(self.create_alarm_event(), deadline=time.monotonic() + 1)
+
+        assert report == "CPU spiked after deploy."
+        assert tool.call_count == 0
+        assert mock_bedrock.converse.call_count == 1
+
+    def test_agent_gives_up_on_converse_at_deadline(self):
+        """Test a converse call still running at the deadline is abandoned."""
+
+        def slow_converse(**kwargs):
+            time.sleep(1.0)
+            return {
+                "stopReason": "end_turn",
+                "output": {"message": {"role": "assistant", "content": [{"text": "Late"}]}},
+            }
+
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.side_effect = slow_converse
+        agent = InvestigationAgent(bedrock_client=mock_bedrock, tool_registry=ToolRegistry())
+
+        started = time.monotonic()
+        report = agent.investigate(self.create_alarm_event(), deadline=started + 0.2)
+
+        assert report == InvestigationAgent.DEADLINE_REPORT
+        assert agent.stop_reason == "deadline"
+        assert time.monotonic() - started < 0.6
+
+    def test_agent_resets_usage_and_timings_per_investigation(self):
+        """Test a reused agent reports each investigation on its own."""
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.return_value = {
+            "stopReason": "end_turn",
+            "usage": {"inputTokens": 100, "outputTokens": 10},
+            "output": {"message": {"role": "assistant", "content": [{"text": "Done"}]}},
+        }
+        agent = InvestigationAgent(bedrock_client=mock_bedrock, tool_registry=ToolRegistry())
+
+        agent.investigate(self.create_alarm_event())
+        agent.investigate(self.create_alarm_event())
+
+        assert agent.usage.input_tokens == 100
+        assert agent.timings.turns == 1
+
+    def test_agent_resumes_from_checkpoint_after_failure(self, tmp_path):
+        """Test a retry continues from the last completed turn without redoing tools."""
+        registry = ToolRegistry()
+        tool = MockTool()
+        registry.register(tool)
+        store = FileCheckpointStore(str(tmp_path))
+
+        throttled = MagicMock()
+        throttled.converse.side_effect = [
+            tool_use_response("mock_tool"),
+            RuntimeError("ThrottlingException"),
+        ]
+        agent = InvestigationAgent(
+            bedrock_client=throttled, tool_registry=registry, checkpoint_store=store
+        )
+        with pytest.raises(RuntimeError):
+            agent.investigate(self.create_alarm_event(), checkpoint_key="event-1")
+
+        assert store.load("event-1").iteration == 1
+
+        retried = MagicMock()
+        retried.converse.return_value = {
+            "stopReason": "end_turn",
+            "output": {"message": {"role": "assistant", "content": [{"text": "Done"}]}},
+        }
+        agent = InvestigationAgent(
+            bedrock_client=retried, tool_registry=registry, checkpoint_store=store
+        )
+        report = agent.investigate(self.create_alarm_event(), checkpoint_key="event-1")
+
+        assert report == "Done"
+        assert tool.call_count == 1
+        assert retried.converse.call_count == 1
+        messages = retried.converse.call_args.kwargs["messages"]
+        assert "toolResult" in messages[2]["content"][0]
+        assert store.load("event-1") is None
+
+    def test_agent_inserts_prompt_cache_checkpoints(self):
+        """Test static instructions, alarm details and tools are cache-checkpointed."""
+        registry = ToolRegistry()
+        registry.register(MockTool())
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.return_value = {
+            "stopReason": "end_turn",
+            "output": {"message": {"role": "assistant", "content": [{"text": "Done"}]}},
+        }
+
+        agent = InvestigationAgent(bedrock_client=mock_bedrock, tool_registry=registry)
+        agent.investigate(self.create_alarm_event())
+
+        call = mock_bedrock.converse.call_args.kwargs
+        cache_point = {"cachePoint": {"type": "default"}}
+        system = call["system"]
+        assert system[0]["text"] == InvestigationAgent.INSTRUCTIONS
+        assert "HighCPU" not in system[0]["text"]
+        assert system[1] == cache_point
+        assert "HighCPU" in system[2]["text"]
+        assert system[3] == cache_point
+        assert call["toolConfig"]["tools"][-1] == cache_point
+
+    def test_agent_without_prompt_caching_sends_plain_prompt(self):
+        """Test prompt caching can be disabled."""
+        registry = ToolRegistry()
+        registry.register(MockTool())
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.return_value = {
+            "stopReason": "end_turn",
+            "output": {"message": {"role": "assistant", "content": [{"text": "Done"}]}},
+        }
+
+        agent = InvestigationAgent(
+            bedrock_client=mock_bedrock, tool_registry=registry, prompt_caching=False
+        )
+        agent.investigate(self.create_alarm_event())
+
+        call = mock_bedrock.converse.call_args.kwargs
+        assert call["system"] == [{"text": agent._build_system_prompt(self.create_alarm_event())}]
+        assert len(call["toolConfig"]["tools"]) == 1
+
+    def test_agent_records_cache_token_usage(self):
+        """Test usage, including cache reads and writes, is accumulated."""
+        registry = ToolRegistry()
+        registry.register(MockTool())
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.side_effect = [
+            {
+                **tool_use_response("mock_tool"),
+                "usage": {
+                    "inputTokens": 100,
+                    "outputTokens": 20,
+                    "cacheWriteInputTokens": 1500,
+                },
+            },
+            {
+                "stopReason": "end_turn",
+                "output": {"message": {"role": "assistant", "content": [{"text": "Done"}]}},
+                "usage": {
+                    "inputTokens": 150,
+                    "outputTokens": 300,
+                    "cacheReadInputTokens": 1500,
+                },
+            },
+        ]
+
+        agent = InvestigationAgent(bedrock_client=mock_bedrock, tool_registry=registry)
+        agent.investigate(self.create_alarm_event())
+
+        assert agent.usage.input_tokens == 250
+        assert agent.usage.output_tokens == 320
+        assert agent.usage.cache_write_tokens == 1500
+        assert agent.usage.cache_read_tokens == 1500
+
+    def test_agent_records_turn_token_and_tool_metrics(self):
+        """Test turns, tokens, tool calls and the stop reason are recorded as metrics."""
+        metrics = MetricsRecorder(emit=lambda line: None)
+        registry = ToolRegistry(metrics=metrics)
+        registry.register(MockTool())
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.side_effect = [
+            {**tool_use_response("mock_tool"), "usage": {"inputTokens": 100, "outputTokens": 20}},
+            {
+                "stopReason": "end_turn",
+                "output": {"message": {"role": "assistant", "content": [{"text": "Done"}]}},
+                "usage": {"inputTokens": 150, "outputTokens": 300, "cacheReadInputTokens": 90},
+            },
+        ]
+
+        agent = InvestigationAgent(
+            bedrock_client=mock_bedrock, tool_registry=registry, metrics=metrics
+        )
+        agent.investigate(self.create_alarm_event())
+
+        documents = {
+            tuple(doc["_aws"]["CloudWatchMetrics"][0]["Dimensions"][0]): doc
+            for doc in metrics.documents()
+        }
+        turn = documents[()]
+        assert len(turn["TurnLatency"]) == 2
+        assert turn["InputTokens"] == [100, 150]
+        assert turn["CacheReadTokens"] == [0, 90]
+        assert turn["Iterations"] == 2
+        assert documents[("StopReason",)]["StopReason"] == "end_turn"
+        tool = documents[("Tool",)]
+        assert tool["Tool"] == "mock_tool"
+        assert tool["ToolResultBytes"] == len('{"result": "mock_result"}')
+
+    def test_agent_streams_text_tool_events_and_report(self):
+        """Test streaming mode yields deltas, tool events and the final report."""
+        registry = ToolRegistry()
+        mock_tool = MockTool()
+        registry.register(mock_tool)
+
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse_stream.side_effect = [
+            stream_response(
+                {"messageStart": {"role": "assistant"}},
+                *stream_text(0, "Checking ", "metrics."),
+                *stream_tool_use(1, "tool-1", "mock_tool", '{"val', 'ue": "x"}'),
+                {"messageStop": {"stopReason": "tool_use"}},
+                {"metadata": {"usage": {"inputTokens": 10, "outputTokens": 5}}},
+            ),
+            stream_response(
+                {"messageStart": {"role": "assistant"}},
+                *stream_text(0, "## Root Cause", "\nHigh load."),
+                {"messageStop": {"stopReason": "end_turn"}},
+            ),
+        ]
+
+        agent = InvestigationAgent(bedrock_client=mock_bedrock, tool_registry=registry)
+        events = list(agent.investigate_stream(self.create_alarm_event()))
+
+        assert [e["type"] for e in events] == [
+            "text",
+            "text",
+            "tool_use",
+            "tool_result",
+            "text",
+            "text",
+            "report",
+        ]
+        assert events[2]["tool_use"]["input"] == {"value": "x"}
+        assert events[3]["tool_result"]["toolUseId"] == "tool-1"
+        assert events[-1]["text"] == "## Root Cause\nHigh load."
+        assert mock_tool.last_args == {"value": "x"}
+        assert agent.usage.input_tokens == 10
+
+        second_call = mock_bedrock.converse_stream.call_args_list[1].kwargs
+        assistant_message = second_call["messages"][1]
+        assert assistant_message["content"] == [
+            {"text": "Checking metrics."},
+            {"toolUse": {"toolUseId": "tool-1", "name": "mock_tool", "input": {"value": "x"}}},
+        ]
+
+    def test_agent_stream_starts_tools_before_message_ends(self):
+        """Test a tool starts as soon as its input block is complete."""
+        registry = ToolRegistry()
+        mock_tool = MockTool()
+        registry.register(mock_tool)
+        seen_before_stop = []
+
+        def first_stream():
+            yield from stream_tool_use(0, "tool-1", "mock_tool", '{"value": "x"}')
+            time.sleep(0.1)
+            seen_before_stop.append(mock_tool.call_count)
+            yield {"messageStop": {"stopReason": "tool_use"}}
+
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse_stream.side_effect = [
+            {"stream": first_stream()},
+            stream_response(*stream_text(0, "Done"), {"messageStop": {"stopReason": "end_turn"}}),
+        ]
+
+        agent = InvestigationAgent(bedrock_client=mock_bedrock, tool_registry=registry)
+        list(agent.investigate_stream(self.create_alarm_event()))
+
+        assert seen_before_stop == [1]
+
+    def test_agent_prefetches_evidence_into_first_message(self):
+        """Test routed evidence is gathered before the first model turn."""
+        registry = ToolRegistry()
+        mock_tool = MockTool()
+        registry.register(mock_tool)
+        router = EvidenceRouter(
+            routes=(EvidenceRoute("mock_tool", ("InstanceId",), lambda d: {"value": "x"}),),
+        )
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.return_value = {
+            "stopReason": "end_turn",
+            "output": {"message": {"role": "assistant", "content": [{"text": "Done"}]}},
+        }
+
+        agent = InvestigationAgent(
+            bedrock_client=mock_bedrock, tool_registry=registry, evidence_router=router
+        )
+        agent.investigate(self.create_alarm_event())
+
+        first_message = mock_bedrock.converse.call_args.kwargs["messages"][0]
+        assert mock_tool.call_count == 1
+        assert len(first_message["content"]) == 2
+        assert '### mock_tool {"value": "x"}' in first_message["content"][1]["text"]
+        assert "mock_result" in first_message["content"][1]["text"]
+
+    def test_agent_caps_prefetch_at_deadline(self):
+        """Test prefetch lookups are cut short to leave the final-report reserve."""
+        registry = ToolRegistry()
+        registry.register(SlowTool("hanging", delay=1.0))
+        router = EvidenceRouter(
+            routes=(EvidenceRoute("hanging", ("InstanceId",), lambda d: {}),),
+            include_alarm_metric=False,
+        )
+        agent = InvestigationAgent(
+            bedrock_client=MagicMock(),
+            tool_registry=registry,
+            evidence_router=router,
+            final_report_reserve=5.0,
+        )
+
+        started = time.monotonic()
+        evidence = agent.prefetch(self.create_alarm_event(), deadline=started + 5.2)
+
+        assert time.monotonic() - started < 0.8
+        assert "timed out" in evidence[0][1]["error"]
+
+
+class TestAsyncInvestigationAgent:
+    """Tests for AsyncInvestigationAgent."""
+
+    def create_alarm_event(self) -> AlarmEvent:
+        """Create a test alarm event."""
+        return TestInvestigationAgent().create_alarm_event()
+
+    def test_async_agent_runs_tool_loop(self):
+        """Test async agent executes tools and returns the final report."""
+        registry = ToolRegistry()
+        mock_tool = MockTool()
+        registry.register(mock_tool)
+
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.side_effect = [
+            tool_use_response("mock_tool"),
+            {
+                "stopReason": "end_turn",
+                "output": {
+                    "message": {"role": "assistant", "content": [{"text": "Root cause found"}]}
+                },
+            },
+        ]
+
+        agent = AsyncInvestigationAgent(bedrock_client=mock_bedrock, tool_registry=registry)
+        result = asyncio.run(agent.investigate(self.create_alarm_event()))
+
+        assert result == "Root cause found"
+        assert mock_tool.call_count == 1
+
+    def test_async_agent_drives_investigations_concurrently(self):
+        """Test several investigations overlap on one event loop."""
+        registry = ToolRegistry()
+        registry.register(SlowTool("slow_a", delay=0.2))
+        registry.register(SlowTool("broken", delay=0, fail=True))
+
+        def converse(**kwargs):
+            if len(kwargs["messages"]) == 1:
+                return tool_use_response("slow_a", "broken")
+            return {
+                "stopReason": "end_turn",
+                "output": {"message": {"role": "assistant", "content": [{"text": "Done"}]}},
+            }
+
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.side_effect = converse
+        agent = AsyncInvestigationAgent(bedrock_client=mock_bedrock, tool_registry=registry)
+
+        async def run_all():
+            alarm = self.create_alarm_event()
+            return await asyncio.gather(*(agent.investigate(alarm) for _ in range(5)))
+
+        started = time.monotonic()
+        results = asyncio.run(run_all())
+        elapsed = time.monotonic() - started
+
+        assert results == ["Done"] * 5
+        assert elapsed < 0.8
+
+    def test_async_agent_does_not_queue_on_default_executor(self):
+        """Test converse and tool calls run while the loop's default executor is busy."""
+        registry = ToolRegistry()
+        mock_tool = MockTool()
+        registry.register(mock_tool)
+
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.side_effect = [
+            tool_use_response("mock_tool"),
+            {
+                "stopReason": "end_turn",
+                "output": {"message": {"role": "assistant", "content": [{"text": "Done"}]}},
+            },
+        ]
+        agent = AsyncInvestigationAgent(bedrock_client=mock_bedrock, tool_registry=registry)
+
+        async def run_with_busy_default_executor():
+            loop = asyncio.get_running_loop()
+            loop.set_default_executor(ThreadPoolExecutor(max_workers=1))
+            release = threading.Event()
+            busy = loop.run_in_executor(None, release.wait)
+            try:
+                return await asyncio.wait_for(
+                    agent.investigate(self.create_alarm_event()), timeout=2
+                )
+            finally:
+                release.set()
+                await busy
+
+        assert asyncio.run(run_with_busy_default_executor()) == "Done"
+        assert mock_tool.call_count == 1
+
+    def test_concurrent_investigations_keep_their_own_outcome(self):
+        """Test stop reason and usage are returned per call, not shared on the agent."""
+
+        def converse(**kwargs):
+            if "FirstAlarm" in str(kwargs["system"]):
+                time.sleep(0.1)
+                return {
+                    "stopReason": "end_turn",
+                    "usage": {"inputTokens": 100, "outputTokens": 10},
+                    "output": {"message": {"role": "assistant", "content": [{"text": "A"}]}},
+                }
+            return {
+                "stopReason": "max_tokens",
+                "usage": {"inputTokens": 7, "outputTokens": 3},
+                "output": {"message": {"role": "assistant", "content": [{"text": "B"}]}},
+            }
+
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.side_effect = converse
+        agent = AsyncInvestigationAgent(
+            bedrock_client=mock_bedrock, tool_registry=ToolRegistry(), max_iterations=1
+        )
+
+        async def run_both():
+            return await asyncio.gather(
+                agent.investigate_with_outcome(
+                    replace(self.create_alarm_event(), alarm_name="FirstAlarm")
+                ),
+                agent.investigate_with_outcome(
+                    replace(self.create_alarm_event(), alarm_name="SecondAlarm")
+                ),
+            )
+
+        first, second = asyncio.run(run_both())
+
+        assert (first.report, first.stop_reason, first.usage.input_tokens) == ("A", "end_turn", 100)
+        assert second.stop_reason == "max_tokens"
+        assert second.usage.input_tokens == 7
@@ -0,0 +1,67 @@
+"""Tests for investigation checkpoints."""
+
+import pytest
+
+from alarm_investigator.checkpoint import (
+    Checkpoint,
+    FileCheckpointStore,
+    SQLiteCheckpointStore,
+    checkpoint_key,
+)
+
+MESSAGES = [
+    {"role": "user", "content": [{"text": "Investigate"}]},
+    {"role": "assistant", "content": [{"toolUse": {"toolUseId": "a", "name": "m", "input": {}}}]},
+    {"role": "user", "content": [{"toolResult": {"toolUseId": "a", "content": [{"json": {}}]}}]},
+]
+
+
+class TestCheckpointKey:
+    """Tests for checkpoint_key."""
+
+    def test_prefers_the_eventbridge_event_id(self, alarm_event):
+        """Test retries of one event share a key via its id."""
+        assert checkpoint_key(alarm_event(raw_event={"id": "event-1"})) == "event:event-1"
+
+    def test_falls_back_to_state_change_timestamp(self, alarm_event):
+        """Test events without an id are keyed by their state change."""
+        first = alarm_event(raw_event={"detail": {"state": {"timestamp": "T1"}}})
+        second = alarm_event(raw_event={"detail": {"state": {"timestamp": "T2"}}})
+
+        assert checkpoint_key(first) != checkpoint_key(second)
+
+
+class TestCheckpointStores:
+    """Tests for the checkpoint stores."""
+
+    @pytest.fixture(params=["file", "sqlite"])
+    def make_store(self, request, tmp_path):
+        """Build a store of each kind with the given clock."""
+
+        def make(clock):
+            if request.param == "file":
+                return FileCheckpointStore(str(tmp_path / "checkpoints"), clock=clock)
+            return SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"), clock=clock)
+
+        return make
+
+    def test_round_trip_replace_and_delete(self, make_store, clock):
+        """Test checkpoints are replaced per key and removed on delete."""
+        store = make_store(clock)
+
+        store.save("key", Checkpoint(MESSAGES[:1], 0, clock.now))
+        store.save("key", Checkpoint(MESSAGES, 1, clock.now))
+
+        assert store.load("key") == Checkpoint(MESSAGES, 1, clock.now)
+        store.delete("key")
+        assert store.load("key") is None
+        store.delete("key")
+
+    def test_stale_checkpoints_are_ignored(self, make_store, clock):
+        """Test checkpoints older than the maximum age are not resumed."""
+        store = make_store(clock)
+        store.save("key", Checkpoint(MESSAGES, 1, clock.now))
+
+        clock.now += 3601
+
+        assert store.load("key") is None
@@ -0,0 +1,70 @@
+"""Tests for the shared AWS client pool."""
+
+from unittest.mock import MagicMock
+
+from alarm_investigator.clients import DEFAULT_CLIENT_CONFIG, ClientPool
+
+
+class TestClientPool:
+    """Tests for ClientPool."""
+
+    def test_reuses_client_for_same_service_and_region(self):
+        """Test repeated lookups return the cached client."""
+        session = MagicMock()
+        pool = ClientPool(session=session)
+
+        first = pool.get("ec2", "us-east-1")
+        second = pool.get("ec2", "us-east-1")
+
+        assert first is second
+        session.client.assert_called_once_with(
+            "ec2", region_name="us-east-1", config=DEFAULT_CLIENT_CONFIG
+        )
+        assert pool.stats() == {"hits": 1, "misses": 1, "clients": 1}
+
+    def test_clients_are_keyed_by_region(self):
+        """Test different regions get different clients."""
+        session = MagicMock()
+        session.client.side_effect = lambda service, **kwargs: MagicMock()
+        pool = ClientPool(session=session)
+
+        east = pool.get("rds", "us-east-1")
+        west = pool.get("rds", "us-west-2")
+
+        assert east is not west
+        assert pool.misses == 2
+        assert pool.hits == 0
+
+    def test_attaches_rate_limiter_to_new_clients(self):
+        """Test each created client is hooked into the rate limiter once."""
+        session = MagicMock()
+        rate_limiter = MagicMock()
+        pool = ClientPool(session=session, rate_limiter=rate_limiter)
+
+        client = pool.get("cloudwatch", "us-east-1")
+        pool.get("cloudwatch", "us-east-1")
+
+        rate_limiter.attach.assert_called_once_with(client)
+
+    def test_clear_resets_pool(self):
+        """Test clearing drops clients and counters."""
+        session = MagicMock()
+        pool = ClientPool(session=session)
+        pool.get("ecs", "us-east-1")
+        pool.get("ecs", "us-east-1")
+
+        pool.clear()
+        pool.get("ecs", "us-east-1")
+
+        assert session.client.call_count == 2
+        assert pool.stats() == {"hits": 0, "misses": 1, "clients": 1}
+
+    def test_creates_real_clients_with_tuned_config(self):
+        """Test default session builds clients with keep-alive enabled."""
+        pool = ClientPool()
+
+        client = pool.get("cloudwatch", "eu-west-1")
+
+        assert client.meta.region_name == "eu-west-1"
+        assert client.meta.config.tcp_keepalive is True
+        assert client.meta.config.max_pool_connections == 25
@@ -0,0 +1,82 @@
+"""Tests for alarm storm coalescing."""
+
+from alarm_investigator.coalescing import AlarmCoalescer, resource_fingerprint
+from alarm_investigator.models import AlarmState
+
+
+class TestResourceFingerprint:
+    """Tests for resource_fingerprint."""
+
+    def test_ignores_non_resource_dimensions(self, alarm_event):
+        """Test alarms on different facets of one instance share a fingerprint."""
+        cpu = alarm_event(alarm_name="cpu", dimensions={"InstanceId": "i-1"})
+        disk = alarm_event(
+            alarm_name="disk", dimensions={"InstanceId": "i-1", "path": "/", "device": "xvda1"}
+        )
+
+        assert resource_fingerprint(cpu) == resource_fingerprint(disk)
+
+    def test_alarms_without_dimensions_are_distinct(self, alarm_event):
+        """Test dimensionless alarms are keyed by their own name."""
+        a = alarm_event(alarm_name="composite-a", dimensions=None)
+        b = alarm_event(alarm_name="composite-b", dimensions=None)
+
+        assert resource_fingerprint(a) != resource_fingerprint(b)
+
+
+class TestAlarmCoalescer:
+    """Tests for AlarmCoalescer."""
+
+    def test_groups_same_resource_within_window(self, alarm_event):
+        """Test a burst for one resource becomes one group, others stay apart."""
+        alarms = [
+            alarm_event(
+                alarm_name="cpu",
+                dimensions={"InstanceId": "i-1"},
+                raw_event={"time": "2026-01-15T10:00:00Z"},
+            ),
+            alarm_event(
+                alarm_name="db",
+                dimensions={"DBInstanceIdentifier": "db-1"},
+                raw_event={"time": "2026-01-15T10:00:10Z"},
+            ),
+            alarm_event(
+                alarm_name="status",
+                dimensions={"InstanceId": "i-1"},
+                raw_event={"time": "2026-01-15T10:00:30Z"},
+            ),
+            alarm_event(
+                alarm_name="cpu-late",
+                dimensions={"InstanceId": "i-1"},
+                raw_event={"time": "2026-01-15T10:05:00Z"},
+            ),
+        ]
+
+        groups = AlarmCoalescer(window_seconds=60).group(alarms)
+
+        assert [[a.alarm_name for a in g.alarms] for g in groups] == [
+            ["cpu", "status"],
+            ["db"],
+            ["cpu-late"],
+        ]
+
+    def test_primary_is_first_alarm_state_event(self, alarm_event):
+        """Test the group is framed around an ALARM event over an OK one."""
+        alarms = [
+            alarm_event(
+                alarm_name="recovered",
+                dimensions={"InstanceId": "i-1"},
+                raw_event={"time": "2026-01-15T10:00:00Z"},
+                state=AlarmState.OK,
+            ),
+            alarm_event(
+                alarm_name="cpu",
+                dimensions={"InstanceId": "i-1"},
+                raw_event={"time": "2026-01-15T10:00:05Z"},
+            ),
+        ]
+
+        (group,) = AlarmCoalescer().group(alarms)
+
+        assert group.primary.alarm_name == "cpu"
+        assert [a.alarm_name for a in group.related] == ["recovered"]
@@ -0,0 +1,90 @@
+"""Tests for conversation compaction."""
+
+from alarm_investigator.compaction import ConversationCompactor, estimate_tokens
+
+
+def tool_turn(tool_use_id: str, points: int) -> list[dict]:
+    """Build an assistant tool request and the user message with its result."""
+    return [
+        {
+            "role": "assistant",
+            "content": [{"toolUse": {"toolUseId": tool_use_id, "name": "metrics", "input": {}}}],
+        },
+        {
+            "role": "user",
+            "content": [
+                {
+                    "toolResult": {
+                        "toolUseId": tool_use_id,
+                        "content": [
+                            {
+                                "json": {
+                                    "status": "success",
+                                    "datapoints": [
+                                        {"timestamp": f"t{i}", "value": float(i)}
+                                        for i in range(points)
+                                    ],
+                                    "statistics": {"max": float(points - 1)},
+                                }
+                            }
+                        ],
+                    }
+                }
+            ],
+        },
+    ]
+
+
+def conversation(*turns: tuple[str, int]) -> list[dict]:
+    """Build a conversation from (toolUseId, datapoint count) pairs."""
+    messages = [{"role": "user", "content": [{"text": "Investigate"}]}]
+    for tool_use_id, points in turns:
+        messages.extend(tool_turn(tool_use_id, points))
+    return messages
+
+
+def result_content(messages: list[dict], index: int) -> list[dict]:
+    return messages[index]["content"][0]["toolResult"]["content"]
+
+
+class TestConversationCompactor:
+    """Tests for ConversationCompactor."""
+
+    def test_leaves_small_conversations_untouched(self):
+        """Test nothing changes while under the token budget."""
+        messages = conversation(("a", 5), ("b", 5))
+
+        stats = ConversationCompactor(token_budget=10_000).compact(messages)
+
+        assert stats.bytes_saved == 0
+        assert "datapoints" in result_content(messages, 2)[0]["json"]
+
+    def test_digests_consumed_results_but_not_latest(self):
+        """Test consumed results become digests and the newest stays raw."""
+        messages = conversation(("a", 200), ("b", 200))
+
+        stats = ConversationCompactor(token_budget=3_000).compact(messages)
+
+        digest = result_content(messages, 2)[0]["json"]
+        assert digest == {
+            "status": "success",
+            "datapoints": "<200 items elided>",
+            "statistics": {"max": 199.0},
+            "compacted": True,
+        }
+        assert len(result_content(messages, 4)[0]["json"]["datapoints"]) == 200
+        assert stats.digested == 1
+        assert stats.bytes_saved > 0
+        assert stats.tokens_saved == estimate_tokens(stats.bytes_saved)
+
+    def test_elides_digests_when_still_over_budget(self):
+        """Test results are elided to references, keeping their toolUseId."""
+        messages = conversation(("a", 10), ("b", 10), ("c", 10))
+
+        stats = ConversationCompactor(token_budget=200).compact(messages)
+
+        for index, tool_use_id in ((2, "a"), (4, "b")):
+            assert messages[index]["content"][0]["toolResult"]["toolUseId"] == tool_use_id
+            assert result_content(messages, index)[0]["text"].startswith("[elided")
+        assert "json" in result_content(messages, 6)[0]
+        assert stats.elided == 2
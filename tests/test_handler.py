@@ -1,9 +1,84 @@
 """Tests for Lambda handler."""
 
 import json
+import time
 from unittest.mock import MagicMock, patch
 
-from alarm_investigator.handler import lambda_handler
+import pytest
+
+from alarm_investigator import handler
+from alarm_investigator.agent import InvestigationAgent
+from alarm_investigator.checkpoint import Checkpoint, FileCheckpointStore
+from alarm_investigator.handler import lambda_handler, sqs_handler
+from alarm_investigator.memoization import ReportMemo
+from alarm_investigator.models import AlarmEvent
+from alarm_investigator.tools.cache import ToolCache
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_state():
+    """Keep reports from one test from being reused by the next."""
+    handler._single_flight = None
+    handler._report_memo = ReportMemo()
+    handler._checkpoint_store = None
+    yield
+    handler._single_flight = None
+    handler._report_memo = ReportMemo()
+    handler._checkpoint_store = None
+
+
+def create_eventbridge_event(
+    alarm_name: str = "HighCPU", instance_id: str = "i-1234567890abcdef0"
+) -> dict:
+    """Create a test EventBridge event for an EC2 CPU alarm."""
+    return {
+        "version": "0",
+        "id": "event-123",
+        "detail-type": "CloudWatch Alarm State Change",
+        "source": "aws.cloudwatch",
+        "account": "123456789012",
+        "time": "2026-01-29T10:00:00Z",
+        "region": "us-east-1",
+        "resources": ["arn:aws:cloudwatch:us-east-1:123456789012:alarm:HighCPU"],
+        "detail": {
+            "alarmName": alarm_name,
+            "state": {
+                "value": "ALARM",
+                "reason": "Threshold Crossed",
+                "timestamp": "2026-01-29T10:00:00.000+0000",
+            },
+            "previousState": {
+                "value": "OK",
+                "reason": "All good",
+                "timestamp": "2026-01-29T09:00:00.000+0000",
+            },
+            "configuration": {
+                "metrics": [
+                    {
+                        "id": "m1",
+                        "metricStat": {
+                            "metric": {
+                                "namespace": "AWS/EC2",
+                                "name": "CPUUtilization",
+                                "dimensions": {"InstanceId": instance_id},
+                            },
+                            "period": 300,
+                            "stat": "Average",
+                        },
+                        "returnData": True,
+                    }
+                ]
+            },
+        },
+    }
+
+
+def end_turn_response(text: str = "Analysis complete.") -> dict:
+    """Create a Bedrock response that ends the investigation."""
+    return {
+        "stopReason": "end_turn",
+        "output": {"message": {"role": "assistant", "content": [{"text": text}]}},
+    }
 
 
 class TestLambdaHandler:
@@ -11,49 +86,10 @@ class TestLambdaHandler:
 
     def create_eventbridge_event(self) -> dict:
         """Create a test EventBridge event."""
-        return {
-            "version": "0",
-            "id": "event-123",
-            "detail-type": "CloudWatch Alarm State Change",
-            "source": "aws.cloudwatch",
-            "account": "123456789012",
-            "time": "2026-01-29T10:00:00Z",
-            "region": "us-east-1",
-            "resources": ["arn:aws:cloudwatch:us-east-1:123456789012:alarm:HighCPU"],
-            "detail": {
-                "alarmName": "HighCPU",
-                "state": {
-                    "value": "ALARM",
-                    "reason": "Threshold Crossed",
-                    "timestamp": "2026-01-29T10:00:00.000+0000",
-                },
-                "previousState": {
-                    "value": "OK",
-                    "reason": "All good",
-                    "timestamp": "2026-01-29T09:00:00.000+0000",
-                },
-                "configuration": {
-                    "metrics": [
-                        {
-                            "id": "m1",
-                            "metricStat": {
-                                "metric": {
-                                    "namespace": "AWS/EC2",
-                                    "name": "CPUUtilization",
-                                    "dimensions": {"InstanceId": "i-1234567890abcdef0"},
-                                },
-                                "period": 300,
-                                "stat": "Average",
-                            },
-                            "returnData": True,
-                        }
-                    ]
-                },
-            },
-        }
+        return create_eventbridge_event()
 
-    @patch("alarm_investigator.handler.boto3")
-    def test_handler_processes_alarm_event(self, mock_boto3):
+    @patch("alarm_investigator.handler.get_client_pool")
+    def test_handler_processes_alarm_event(self, mock_get_pool):
         """Test handler processes alarm event successfully."""
         mock_bedrock = MagicMock()
         mock_bedrock.converse.return_value = {
@@ -71,7 +107,7 @@ class TestLambdaHandler:
         mock_ec2 = MagicMock()
         mock_ec2.describe_instances.return_value = {"Reservations": []}
 
-        def get_client(service, **kwargs):
+        def get_client(service, region):
             clients = {
                 "bedrock-runtime": mock_bedrock,
                 "sns": mock_sns,
@@ -80,7 +116,7 @@ class TestLambdaHandler:
             }
             return clients.get(service, MagicMock())
 
-        mock_boto3.client.side_effect = get_client
+        mock_get_pool.return_value.get.side_effect = get_client
 
         event = self.create_eventbridge_event()
         result = lambda_handler(event, None)
@@ -90,8 +126,8 @@ class TestLambdaHandler:
         assert body["alarm_name"] == "HighCPU"
         assert "analysis" in body
 
-    @patch("alarm_investigator.handler.boto3")
-    def test_handler_sends_sns_notification(self, mock_boto3):
+    @patch("alarm_investigator.handler.get_client_pool")
+    def test_handler_sends_sns_notification(self, mock_get_pool):
         """Test handler sends SNS notification when topic configured."""
         mock_bedrock = MagicMock()
         mock_bedrock.converse.return_value = {
@@ -107,7 +143,7 @@ class TestLambdaHandler:
         mock_sns = MagicMock()
         mock_cloudwatch = MagicMock()
 
-        def get_client(service, **kwargs):
+        def get_client(service, region):
             clients = {
                 "bedrock-runtime": mock_bedrock,
                 "sns": mock_sns,
@@ -115,7 +151,7 @@ class TestLambdaHandler:
             }
             return clients.get(service, MagicMock())
 
-        mock_boto3.client.side_effect = get_client
+        mock_get_pool.return_value.get.side_effect = get_client
 
         sns_arn = "arn:aws:sns:us-east-1:123456789012:alerts"
         with patch.dict("os.environ", {"SNS_TOPIC_ARN": sns_arn}):
@@ -124,8 +160,195 @@ class TestLambdaHandler:
 
         mock_sns.publish.assert_called_once()
 
-    @patch("alarm_investigator.handler.boto3")
-    def test_handler_returns_error_on_invalid_event(self, mock_boto3):
+    @patch("alarm_investigator.handler.get_client_pool")
+    def test_handler_builds_tool_clients_lazily(self, mock_get_pool):
+        """Test handler only creates clients for tools the model uses."""
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.return_value = {
+            "stopReason": "end_turn",
+            "output": {
+                "message": {
+                    "role": "assistant",
+                    "content": [{"text": "Analysis complete."}],
+                }
+            },
+        }
+        mock_get_pool.return_value.get.return_value = mock_bedrock
+
+        with patch.dict("os.environ", {}, clear=True):
+            lambda_handler(self.create_eventbridge_event(), None)
+
+        # Only the prefetched EC2 alarm evidence needs clients besides Bedrock
+        requested = {c.args[0] for c in mock_get_pool.return_value.get.call_args_list}
+        assert requested == {"bedrock-runtime", "cloudwatch", "ec2"}
+
+    @patch("alarm_investigator.handler.get_client_pool")
+    def test_handler_reuses_report_for_duplicate_delivery(self, mock_get_pool):
+        """Test a duplicate event reuses the finished report without notifying again."""
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.return_value = end_turn_response()
+        mock_sns = MagicMock()
+        mock_get_pool.return_value.get.side_effect = lambda service, region: {
+            "bedrock-runtime": mock_bedrock,
+            "sns": mock_sns,
+        }.get(service, MagicMock())
+
+        sns_arn = "arn:aws:sns:us-east-1:123456789012:alerts"
+        with patch.dict("os.environ", {"SNS_TOPIC_ARN": sns_arn}):
+            first = lambda_handler(self.create_eventbridge_event(), None)
+            second = lambda_handler(self.create_eventbridge_event(), None)
+
+        assert second == first
+        assert mock_bedrock.converse.call_count == 1
+        mock_sns.publish.assert_called_once()
+
+    @patch("alarm_investigator.handler.get_client_pool")
+    def test_handler_reuses_report_for_flapping_alarm(self, mock_get_pool):
+        """Test a repeat of the alarm reuses the report until the evidence changes."""
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.return_value = end_turn_response("Root cause: deploy.")
+        mock_ec2 = MagicMock()
+        mock_ec2.describe_instances.return_value = {
+            "Reservations": [{"Instances": [{"InstanceId": "i-1", "InstanceType": "t3.small"}]}]
+        }
+        mock_get_pool.return_value.get.side_effect = lambda service, region: {
+            "bedrock-runtime": mock_bedrock,
+            "ec2": mock_ec2,
+        }.get(service, MagicMock())
+
+        with patch.dict("os.environ", {}, clear=True):
+            lambda_handler(self.create_eventbridge_event(), None)
+            handler._single_flight = None  # past the single-flight reuse window
+            reused = json.loads(lambda_handler(self.create_eventbridge_event(), None)["body"])
+
+            handler._single_flight = None
+            mock_ec2.describe_instances.return_value["Reservations"][0]["Instances"][0][
+                "InstanceType"
+            ] = "t3.large"
+            with patch.object(handler, "_tool_cache", ToolCache()):
+                event = self.create_eventbridge_event()
+                resized = json.loads(lambda_handler(event, None)["body"])
+
+        assert mock_bedrock.converse.call_count == 2
+        assert reused["analysis"].startswith("_Reused from")
+        assert reused["reused_from"]
+        assert "reused_from" not in resized
+
+    @patch("alarm_investigator.handler.get_client_pool")
+    def test_reused_report_lists_alarms_notified_now(self, mock_get_pool):
+        """Test a reused report names the current related alarms, not the stored ones."""
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.return_value = end_turn_response("Root cause: deploy.")
+        mock_ec2 = MagicMock()
+        mock_ec2.describe_instances.return_value = {
+            "Reservations": [{"Instances": [{"InstanceId": "i-1", "InstanceType": "t3.small"}]}]
+        }
+        mock_get_pool.return_value.get.side_effect = lambda service, region: {
+            "bedrock-runtime": mock_bedrock,
+            "ec2": mock_ec2,
+        }.get(service, MagicMock())
+        alarm = AlarmEvent.from_eventbridge(create_eventbridge_event("HighCPU", "i-1"))
+        status = AlarmEvent.from_eventbridge(create_eventbridge_event("StatusCheck", "i-1"))
+        disk = AlarmEvent.from_eventbridge(create_eventbridge_event("DiskFull", "i-1"))
+
+        with patch.dict("os.environ", {}, clear=True):
+            first = handler._investigate(alarm, mock_get_pool.return_value, [status])
+            reused = handler._investigate(alarm, mock_get_pool.return_value, [disk])
+
+        assert mock_bedrock.converse.call_count == 1
+        assert first["coalesced_with"] == ["StatusCheck"]
+        assert reused["reused_from"]
+        assert reused["coalesced_with"] == ["DiskFull"]
+
+    @patch("alarm_investigator.handler.get_client_pool")
+    def test_handler_does_not_reuse_unfinished_report(self, mock_get_pool):
+        """Test a report cut short at the iteration limit is not reused for a flap."""
+        tool_use = {
+            "stopReason": "tool_use",
+            "output": {
+                "message": {
+                    "role": "assistant",
+                    "content": [{"toolUse": {"toolUseId": "t1", "name": "unknown", "input": {}}}],
+                }
+            },
+        }
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.side_effect = [tool_use] * 10 + [end_turn_response("Done.")]
+        mock_get_pool.return_value.get.side_effect = lambda service, region: (
+            mock_bedrock if service == "bedrock-runtime" else MagicMock()
+        )
+
+        with patch.dict("os.environ", {}, clear=True):
+            first = json.loads(lambda_handler(self.create_eventbridge_event(), None)["body"])
+            handler._single_flight = None  # past the single-flight reuse window
+            second = json.loads(lambda_handler(self.create_eventbridge_event(), None)["body"])
+
+        assert first["analysis"] == InvestigationAgent.MAX_ITERATIONS_REPORT
+        assert second["analysis"] == "Done."
+        assert "reused_from" not in second
+
+    @patch("alarm_investigator.handler.get_client_pool")
+    def test_handler_resumes_checkpoint_without_prefetching(self, mock_get_pool, tmp_path):
+        """Test a retried event resumes its transcript instead of repeating AWS calls."""
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.return_value = end_turn_response("Resumed.")
+        mock_get_pool.return_value.get.side_effect = lambda service, region: (
+            mock_bedrock if service == "bedrock-runtime" else MagicMock()
+        )
+        messages = [{"role": "user", "content": [{"text": "Please investigate."}]}]
+        FileCheckpointStore(str(tmp_path)).save(
+            "event:event-123", Checkpoint(messages, iteration=0, saved_at=time.time())
+        )
+
+        with patch.dict("os.environ", {"CHECKPOINT_DIR": str(tmp_path)}, clear=True):
+            result = lambda_handler(self.create_eventbridge_event(), None)
+
+        assert json.loads(result["body"])["analysis"] == "Resumed."
+        requested = {c.args[0] for c in mock_get_pool.return_value.get.call_args_list}
+        assert requested == {"bedrock-runtime"}
+
+    @patch("alarm_investigator.handler.get_client_pool")
+    def test_handler_summarizes_recovery_without_bedrock(self, mock_get_pool):
+        """Test an OK recovery is answered by a fast-path rule."""
+        mock_sns = MagicMock()
+        mock_get_pool.return_value.get.side_effect = lambda service, region: (
+            mock_sns if service == "sns" else MagicMock()
+        )
+        event = self.create_eventbridge_event()
+        event["detail"]["state"]["value"] = "OK"
+        event["detail"]["previousState"]["value"] = "ALARM"
+
+        sns_arn = "arn:aws:sns:us-east-1:123456789012:alerts"
+        with patch.dict("os.environ", {"SNS_TOPIC_ARN": sns_arn}):
+            result = lambda_handler(event, None)
+
+        body = json.loads(result["body"])
+        assert body["fast_path"] == "ok-recovery"
+        assert "recovered" in body["analysis"]
+        requested = {c.args[0] for c in mock_get_pool.return_value.get.call_args_list}
+        assert requested == {"sns"}
+        mock_sns.publish.assert_called_once()
+
+    @patch("alarm_investigator.handler.get_client_pool")
+    def test_handler_budgets_investigation_from_context(self, mock_get_pool):
+        """Test little remaining invocation time goes straight to the final report."""
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.return_value = end_turn_response("Short report.")
+        mock_get_pool.return_value.get.side_effect = lambda service, region: (
+            mock_bedrock if service == "bedrock-runtime" else MagicMock()
+        )
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 20_000
+
+        with patch.dict("os.environ", {}, clear=True):
+            result = lambda_handler(self.create_eventbridge_event(), context)
+
+        assert json.loads(result["body"])["analysis"] == "Short report."
+        messages = mock_bedrock.converse.call_args.kwargs["messages"]
+        assert messages[0]["content"][-1] == {"text": InvestigationAgent.FINAL_REPORT_PROMPT}
+
+    @patch("alarm_investigator.handler.get_client_pool")
+    def test_handler_returns_error_on_invalid_event(self, mock_get_pool):
         """Test handler returns error for invalid events."""
         event = {"invalid": "event"}
         result = lambda_handler(event, None)
@@ -133,3 +356,99 @@ class TestLambdaHandler:
         assert result["statusCode"] == 400
         body = json.loads(result["body"])
         assert "error" in body
+
+
+class TestSqsHandler:
+    """Tests for the SQS batch handler."""
+
+    def sqs_event(self, *bodies) -> dict:
+        """Wrap message bodies in an SQS batch event."""
+        return {
+            "Records": [
+                {
+                    "messageId": f"msg-{i}",
+                    "body": body if isinstance(body, str) else json.dumps(body),
+                }
+                for i, body in enumerate(bodies)
+            ]
+        }
+
+    @patch("alarm_investigator.handler.get_client_pool")
+    def test_coalesces_and_notifies_every_alarm(self, mock_get_pool):
+        """Test one investigation per resource with a notification per alarm."""
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.return_value = end_turn_response()
+        mock_sns = MagicMock()
+
+        def get_client(service, region):
+            return {"bedrock-runtime": mock_bedrock, "sns": mock_sns}.get(service, MagicMock())
+
+        mock_get_pool.return_value.get.side_effect = get_client
+
+        event = self.sqs_event(
+            create_eventbridge_event("HighCPU", "i-1"),
+            create_eventbridge_event("StatusCheck", "i-1"),
+            create_eventbridge_event("HighCPU-2", "i-2"),
+        )
+        sns_arn = "arn:aws:sns:us-east-1:123456789012:alerts"
+        with patch.dict("os.environ", {"SNS_TOPIC_ARN": sns_arn}):
+            result = sqs_handler(event, None)
+
+        assert result == {"batchItemFailures": []}
+        assert mock_bedrock.converse.call_count == 2
+        assert mock_sns.publish.call_count == 3
+
+    @patch("alarm_investigator.handler.get_client_pool")
+    def test_follower_notifies_related_alarms_of_its_own_group(self, mock_get_pool):
+        """Test a shared result still notifies the related alarms the leader did not cover."""
+        mock_bedrock = MagicMock()
+        mock_bedrock.converse.return_value = end_turn_response()
+        mock_sns = MagicMock()
+        mock_get_pool.return_value.get.side_effect = lambda service, region: {
+            "bedrock-runtime": mock_bedrock,
+            "sns": mock_sns,
+        }.get(service, MagicMock())
+
+        sns_arn = "arn:aws:sns:us-east-1:123456789012:alerts"
+        with patch.dict("os.environ", {"SNS_TOPIC_ARN": sns_arn}):
+            sqs_handler(self.sqs_event(create_eventbridge_event("HighCPU", "i-1")), None)
+            result = sqs_handler(
+                self.sqs_event(
+                    create_eventbridge_event("HighCPU", "i-1"),
+                    create_eventbridge_event("StatusCheck", "i-1"),
+                ),
+                None,
+            )
+
+        assert result == {"batchItemFailures": []}
+        assert mock_bedrock.converse.call_count == 1
+        subjects = [c.kwargs["Subject"] for c in mock_sns.publish.call_args_list]
+        assert len(subjects) == 2
+        assert "StatusCheck" in subjects[1]
+
+    @patch("alarm_investigator.handler.get_client_pool")
+    def test_reports_partial_batch_failures(self, mock_get_pool):
+        """Test failed investigations are retried alone and unparseable records dropped."""
+        mock_bedrock = MagicMock()
+
+        def converse(**kwargs):
+            if "i-bad" in kwargs["system"][2]["text"]:
+                raise RuntimeError("Bedrock throttled")
+            return end_turn_response()
+
+        mock_bedrock.converse.side_effect = converse
+        mock_get_pool.return_value.get.side_effect = lambda service, region: (
+            mock_bedrock if service == "bedrock-runtime" else MagicMock()
+        )
+
+        event = self.sqs_event(
+            create_eventbridge_event("HighCPU-good", "i-good"),
+            "not json",
+            create_eventbridge_event("HighCPU-bad", "i-bad"),
+            {"invalid": "event"},
+        )
+        with patch.dict("os.environ", {}, clear=True):
+            result = sqs_handler(event, None)
+
+        failed = sorted(f["itemIdentifier"] for f in result["batchItemFailures"])
+        assert failed == ["msg-2"]
@@ -0,0 +1,92 @@
+"""Tests for report memoization."""
+
+from alarm_investigator.memoization import ReportMemo, evidence_snapshot, has_material_change
+from alarm_investigator.models import AlarmState
+
+
+def snapshot(cpu_max: float, instance_type: str = "t3.small") -> dict:
+    """Build a snapshot from metric and describe evidence."""
+    return evidence_snapshot(
+        [
+            (
+                {"name": "get_cloudwatch_metrics", "input": {"metric_name": "CPUUtilization"}},
+                {
+                    "status": "success",
+                    "datapoints": [{"value": cpu_max}],
+                    "statistics": {"avg": 50.0, "max": cpu_max, "min": 1.0},
+                    "cache": {"hit": False},
+                },
+            ),
+            (
+                {"name": "describe_ec2_instance", "input": {"instance_id": "i-1"}},
+                {"status": "success", "instance": {"instance_type": instance_type}},
+            ),
+            (
+                {"name": "describe_rds_instance", "input": {}},
+                {"status": "error", "error": "denied"},
+            ),
+        ]
+    )
+
+
+REPORT = {"alarm_name": "HighCPU", "analysis": "Root cause: deploy.", "timestamp": "T0"}
+
+
+class TestMaterialChange:
+    """Tests for evidence snapshots and their comparison."""
+
+    def test_snapshot_keeps_only_deciding_fields(self):
+        """Test datapoints, cache info and failed lookups are dropped."""
+        assert snapshot(90.0) == {
+            'get_cloudwatch_metrics {"metric_name": "CPUUtilization"}': {
+                "metric": {"avg": 50.0, "max": 90.0}
+            },
+            'describe_ec2_instance {"instance_id": "i-1"}': {
+                "config": {"instance": {"instance_type": "t3.small"}}
+            },
+        }
+
+    def test_small_metric_moves_are_not_material(self):
+        """Test metrics within tolerance count as unchanged."""
+        assert not has_material_change(snapshot(90.0), snapshot(95.0), tolerance=0.2)
+        assert has_material_change(snapshot(90.0), snapshot(40.0), tolerance=0.2)
+
+    def test_config_changes_are_material(self):
+        """Test any configuration difference counts as a change."""
+        assert has_material_change(snapshot(90.0), snapshot(90.0, "t3.large"))
+
+
+class TestReportMemo:
+    """Tests for ReportMemo."""
+
+    def test_reuses_report_marked_with_its_timestamp(self, alarm_event, clock):
+        """Test an unchanged repeat gets the stored report with a reuse marker."""
+        memo = ReportMemo(clock=clock)
+        memo.store(alarm_event(), REPORT, snapshot(90.0))
+
+        report = memo.lookup(alarm_event(), snapshot(92.0))
+
+        assert report["reused_from"] == "T0"
+        assert report["analysis"].startswith("_Reused from T0")
+        assert report["analysis"].endswith("Root cause: deploy.")
+        assert REPORT["analysis"] == "Root cause: deploy."
+
+    def test_misses_on_change_state_or_new_bucket(self, alarm_event, clock):
+        """Test material changes, other states and later buckets are not reused."""
+        clock.now = 3600 * 1000
+        memo = ReportMemo(bucket_seconds=3600, clock=clock)
+        memo.store(alarm_event(), REPORT, snapshot(90.0))
+
+        assert memo.lookup(alarm_event(), snapshot(90.0, "t3.large")) is None
+        assert memo.lookup(alarm_event(state=AlarmState.OK), snapshot(90.0)) is None
+        clock.now += 3600
+        assert memo.lookup(alarm_event(), snapshot(90.0)) is None
+
+    def test_alarms_without_evidence_are_not_memoized(self, alarm_event, clock):
+        """Test an empty snapshot neither stores nor reuses a report."""
+        memo = ReportMemo(clock=clock)
+        memo.store(alarm_event(), REPORT, {})
+
+        assert memo.lookup(alarm_event(), {}) is None
+        memo.store(alarm_event(), REPORT, snapshot(90.0))
+        assert memo.lookup(alarm_event(), {}) is None
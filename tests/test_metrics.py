@@ -0,0 +1,56 @@
+"""Tests for embedded metric format telemetry."""
+
+import json
+
+from alarm_investigator.metrics import MAX_VALUES_PER_METRIC, MetricsRecorder
+
+
+class TestMetricsRecorder:
+    """Tests for MetricsRecorder."""
+
+    def test_flush_writes_one_document_per_dimension_set(self):
+        """Test values are grouped by extra dimensions into EMF documents."""
+        lines = []
+        metrics = MetricsRecorder(
+            namespace="Test",
+            properties={"AlarmName": "HighCPU"},
+            emit=lines.append,
+            clock=lambda: 1_700_000_000.5,
+        )
+
+        metrics.put("TurnLatency", 120.0, "Milliseconds")
+        metrics.put("TurnLatency", 80.0, "Milliseconds")
+        metrics.put("ToolLatency", 15.0, "Milliseconds", {"Tool": "get_metrics"})
+        metrics.flush()
+
+        turn, tool = (json.loads(line) for line in lines)
+        assert turn["_aws"] == {
+            "Timestamp": 1_700_000_000_500,
+            "CloudWatchMetrics": [
+                {
+                    "Namespace": "Test",
+                    "Dimensions": [[]],
+                    "Metrics": [{"Name": "TurnLatency", "Unit": "Milliseconds"}],
+                }
+            ],
+        }
+        assert turn["TurnLatency"] == [120.0, 80.0]
+        assert turn["AlarmName"] == "HighCPU"
+        assert tool["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["Tool"]]
+        assert tool["Tool"] == "get_metrics"
+        assert tool["ToolLatency"] == 15.0
+
+    def test_flush_splits_long_series_and_resets(self):
+        """Test metrics beyond the per-document value limit span documents."""
+        lines = []
+        metrics = MetricsRecorder(emit=lines.append)
+
+        for i in range(MAX_VALUES_PER_METRIC + 1):
+            metrics.put("ToolResultBytes", i, "Bytes")
+        metrics.flush()
+        metrics.flush()
+
+        assert len(lines) == 2
+        first, second = (json.loads(line) for line in lines)
+        assert len(first["ToolResultBytes"]) == MAX_VALUES_PER_METRIC
+        assert second["ToolResultBytes"] == MAX_VALUES_PER_METRIC
@@ -64,3 +64,13 @@ Application processing spike due to batch job."""
         assert result["state"] == "ALARM"
         assert result["analysis"] == "Test analysis"
         assert "timestamp" in result
+        assert "coalesced_with" not in result
+
+    def test_format_json_lists_coalesced_alarms(self):
+        """Test a shared report names the other alarms it covered."""
+        formatter = ReportFormatter()
+        result = formatter.format_json(
+            self.create_alarm_event(), "Test analysis", coalesced_with=["StatusCheckFailed"]
+        )
+
+        assert result["coalesced_with"] == ["StatusCheckFailed"]
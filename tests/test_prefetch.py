@@ -0,0 +1,67 @@
+"""Tests for deterministic evidence prefetch."""
+
+from alarm_investigator.prefetch import EvidenceRouter
+
+ALL_TOOLS = {
+    "get_cloudwatch_metrics",
+    "describe_ec2_instance",
+    "describe_rds_instance",
+    "describe_lambda_function",
+    "describe_ecs_service",
+}
+
+
+class TestEvidenceRouter:
+    """Tests for EvidenceRouter."""
+
+    def test_plans_metric_and_ec2_describe(self, alarm_event):
+        """Test an EC2 alarm prefetches its metric and instance."""
+        alarm = alarm_event(
+            namespace="AWS/EC2", metric_name="CPUUtilization", dimensions={"InstanceId": "i-123"}
+        )
+
+        plan = EvidenceRouter().plan(alarm, ALL_TOOLS)
+
+        assert plan == [
+            {
+                "toolUseId": "prefetch-1",
+                "name": "get_cloudwatch_metrics",
+                "input": {
+                    "namespace": "AWS/EC2",
+                    "metric_name": "CPUUtilization",
+                    "dimensions": {"InstanceId": "i-123"},
+                },
+            },
+            {
+                "toolUseId": "prefetch-2",
+                "name": "describe_ec2_instance",
+                "input": {"instance_id": "i-123"},
+            },
+        ]
+
+    def test_ecs_route_needs_cluster_and_service(self, alarm_event):
+        """Test the ECS describe is only planned with both dimensions."""
+        router = EvidenceRouter(include_alarm_metric=False)
+        full = alarm_event(
+            namespace="AWS/ECS",
+            metric_name="CPUUtilization",
+            dimensions={"ClusterName": "prod", "ServiceName": "api"},
+        )
+        partial = alarm_event(
+            namespace="AWS/ECS", metric_name="CPUUtilization", dimensions={"ClusterName": "prod"}
+        )
+
+        assert router.plan(full, ALL_TOOLS)[0]["input"] == {"cluster": "prod", "service": "api"}
+        assert router.plan(partial, ALL_TOOLS) == []
+
+    def test_skips_unavailable_tools(self, alarm_event):
+        """Test only registered tools are planned."""
+        alarm = alarm_event(
+            namespace="AWS/RDS",
+            metric_name="CPUUtilization",
+            dimensions={"DBInstanceIdentifier": "db-1"},
+        )
+
+        plan = EvidenceRouter().plan(alarm, {"describe_rds_instance"})
+
+        assert [p["name"] for p in plan] == ["describe_rds_instance"]
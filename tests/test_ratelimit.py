@@ -0,0 +1,115 @@
+"""Tests for the adaptive rate limiter."""
+
+import json
+
+import boto3
+from moto import mock_aws
+
+from alarm_investigator.metrics import MetricsRecorder
+from alarm_investigator.ratelimit import AdaptiveTokenBucket, RateLimiter
+
+
+class TestAdaptiveTokenBucket:
+    """Tests for AdaptiveTokenBucket."""
+
+    def test_waits_once_burst_is_spent(self, clock):
+        """Test calls beyond the burst wait for the refill, with a little jitter."""
+        bucket = AdaptiveTokenBucket(rate=2.0, burst=2, clock=clock, sleep=clock.sleep)
+
+        waits = [bucket.acquire() for _ in range(3)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert 0.5 <= waits[2] <= 0.55
+        assert bucket.waited_seconds == waits[2]
+
+    def test_throttle_cuts_rate_and_success_recovers(self, clock):
+        """Test multiplicative decrease on throttles and additive recovery."""
+        bucket = AdaptiveTokenBucket(rate=10.0, clock=clock, sleep=clock.sleep)
+
+        bucket.on_throttle()
+        bucket.on_throttle()
+        assert bucket.rate == 2.5
+        assert bucket.throttles == 2
+
+        for _ in range(100):
+            bucket.on_success()
+        assert bucket.rate == 10.0
+
+    def test_throttle_holds_callers_for_backoff(self, monkeypatch, clock):
+        """Test callers wait out the exponential cool-down, capped at the maximum."""
+        monkeypatch.setattr("alarm_investigator.ratelimit.random.uniform", lambda a, b: b)
+        bucket = AdaptiveTokenBucket(
+            rate=100.0, base_backoff=1.0, max_backoff=10.0, clock=clock, sleep=clock.sleep
+        )
+
+        bucket.on_throttle()
+        bucket.acquire()
+        for _ in range(4):
+            bucket.on_throttle()
+        bucket.acquire()
+
+        # 1s then the 10s cap (1 * 2**4 = 16), each plus 10% queue jitter
+        assert clock.sleeps == [1.1, 11.0]
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter."""
+
+    def test_buckets_are_per_operation_with_configured_rates(self):
+        """Test operations get their own bucket and configured starting rate."""
+        limiter = RateLimiter(rates={("cloudwatch", "GetMetricData"): 40.0, "ec2": 5.0})
+
+        assert limiter.bucket("cloudwatch", "GetMetricData").rate == 40.0
+        assert limiter.bucket("ec2", "DescribeInstances").rate == 5.0
+        assert limiter.bucket("rds", "DescribeDBInstances").rate == 20.0
+        assert limiter.bucket("ec2", "DescribeInstances") is limiter.bucket(
+            "ec2", "DescribeInstances"
+        )
+
+    def test_records_queue_depth_and_wait_per_request(self, clock):
+        """Test each request records the queue it found and its wait for a token."""
+        lines = []
+        queued = []
+
+        def sleep(seconds):
+            # A third request arrives while the second one waits
+            queued.append(limiter.bucket("ec2", "DescribeInstances").waiting)
+            if len(queued) == 1:
+                limiter._before_send("before-send.ec2.DescribeInstances")
+            clock.sleep(seconds)
+
+        limiter = RateLimiter(
+            rates={},
+            default_rate=1.0,
+            metrics=MetricsRecorder(emit=lines.append, clock=clock),
+            clock=clock,
+            sleep=sleep,
+        )
+        limiter._before_send("before-send.ec2.DescribeInstances")
+        limiter._before_send("before-send.ec2.DescribeInstances")
+        limiter.flush_metrics()
+
+        (document,) = [json.loads(line) for line in lines]
+        assert queued == [1, 2]
+        assert document["Operation"] == "ec2.DescribeInstances"
+        # The third request finishes waiting, and records, before the second
+        assert document["RateLimitQueueDepth"] == [0, 1, 0]
+        assert document["RateLimitWait"][0] == 0.0
+        assert all(wait > 0 for wait in document["RateLimitWait"][1:])
+
+    @mock_aws
+    def test_attached_client_calls_take_tokens_and_adapt(self):
+        """Test a hooked client is metered and throttling responses slow it down."""
+        limiter = RateLimiter()
+        client = boto3.client("cloudwatch", region_name="us-east-1")
+        limiter.attach(client)
+
+        client.list_metrics()
+        limiter._after_attempt(
+            "needs-retry.cloudwatch.ListMetrics",
+            response=(None, {"Error": {"Code": "Throttling"}}),
+        )
+
+        stats = limiter.stats()["cloudwatch.ListMetrics"]
+        assert stats["throttles"] == 1
+        assert stats["rate"] == 10.0
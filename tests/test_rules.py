@@ -0,0 +1,53 @@
+"""Tests for fast-path rules."""
+
+from alarm_investigator.models import AlarmState
+from alarm_investigator.rules import FastPathRules, Rule, RuleAction
+
+MISSING_DATA_REASON = (
+    "Threshold Crossed: no datapoints were received for 1 period and 1 missing "
+    "datapoint was treated as [Breaching]."
+)
+
+
+class TestFastPathRules:
+    """Tests for FastPathRules."""
+
+    def test_ok_recovery_gets_templated_summary(self, alarm_event):
+        """Test an OK transition is summarized from the template."""
+        alarm = alarm_event(
+            state=AlarmState.OK, previous_state=AlarmState.ALARM, reason="Back to normal"
+        )
+
+        decision = FastPathRules().evaluate(alarm)
+
+        assert (decision.rule, decision.action) == ("ok-recovery", RuleAction.SUMMARY)
+        assert decision.summary.startswith("HighCPU recovered: ALARM -> OK (AWS/EC2/CPUUtilization")
+        assert "Back to normal" in decision.summary
+
+    def test_insufficient_data_is_skipped(self, alarm_event):
+        """Test INSUFFICIENT_DATA blips are skipped."""
+        decision = FastPathRules().evaluate(alarm_event(state=AlarmState.INSUFFICIENT_DATA))
+
+        assert decision.action == RuleAction.SKIP
+
+    def test_missing_data_breach_check(self, alarm_event):
+        """Test the check summarizes missing-data alarms and passes real breaches on."""
+        rules = FastPathRules()
+
+        decision = rules.evaluate(alarm_event(reason=MISSING_DATA_REASON))
+
+        assert decision.rule == "missing-data-breach"
+        assert "stopped reporting" in decision.summary
+        assert rules.evaluate(alarm_event()) is None
+
+    def test_custom_rules_match_on_name_pattern_in_order(self, alarm_event):
+        """Test the first matching rule wins and patterns are glob-style."""
+        rules = FastPathRules(
+            (
+                Rule("canary", RuleAction.SKIP, alarm_name_pattern="canary-*"),
+                Rule("all", RuleAction.SUMMARY, template="{alarm_name} is {state}"),
+            )
+        )
+
+        assert rules.evaluate(alarm_event(alarm_name="canary-eu")).rule == "canary"
+        assert rules.evaluate(alarm_event()).summary == "HighCPU is ALARM"
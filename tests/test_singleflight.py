@@ -0,0 +1,129 @@
+"""Tests for single-flight deduplication."""
+
+import threading
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from alarm_investigator.singleflight import (
+    DynamoDBFlightStore,
+    InMemoryFlightStore,
+    SingleFlight,
+    SQLiteFlightStore,
+)
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    def test_concurrent_callers_share_the_leaders_result(self):
+        """Test followers wait for the leader instead of running the work."""
+        started = threading.Event()
+        finish = threading.Event()
+        calls = []
+
+        def work():
+            calls.append(1)
+            started.set()
+            finish.wait(5)
+            return {"analysis": "root cause"}
+
+        flight = SingleFlight(poll_interval=0.01)
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.run("key", work)))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=lambda: results.append(flight.run("key", work)))
+        follower.start()
+        finish.set()
+        leader.join()
+        follower.join()
+
+        assert len(calls) == 1
+        assert sorted(shared for _, shared in results) == [False, True]
+        assert all(result == {"analysis": "root cause"} for result, _ in results)
+
+    def test_result_is_reused_until_it_expires(self, clock):
+        """Test a finished result is reused only within its reuse window."""
+        flight = SingleFlight(result_ttl=60, clock=clock)
+
+        flight.run("key", lambda: {"n": 1})
+        clock.now += 30
+        assert flight.run("key", lambda: {"n": 2}) == ({"n": 1}, True)
+        clock.now += 31
+        assert flight.run("key", lambda: {"n": 3}) == ({"n": 3}, False)
+
+    def test_failed_leader_releases_the_key(self):
+        """Test the next caller leads after the leader raises."""
+        flight = SingleFlight()
+
+        def fail():
+            raise RuntimeError("throttled")
+
+        with pytest.raises(RuntimeError):
+            flight.run("key", fail)
+
+        assert flight.run("key", lambda: {"n": 1}) == ({"n": 1}, False)
+
+    def test_follower_runs_work_after_waiting_too_long(self, clock):
+        """Test a follower stops waiting on a stuck leader."""
+        store = InMemoryFlightStore()
+        store.acquire("key", "stuck-leader", clock.now, clock.now + 300)
+        flight = SingleFlight(store=store, wait_timeout=10, clock=clock, sleep=clock.sleep)
+
+        assert flight.run("key", lambda: {"n": 1}) == ({"n": 1}, False)
+        assert clock.now >= 1_000_010
+
+    def test_wait_timeout_override_and_poll_backoff(self, clock):
+        """Test a caller's own wait limit bounds the backed-off polling."""
+        store = InMemoryFlightStore()
+        store.acquire("key", "stuck-leader", clock.now, clock.now + 300)
+        flight = SingleFlight(
+            store=store, wait_timeout=240, max_poll_interval=4, clock=clock, sleep=clock.sleep
+        )
+
+        assert flight.run("key", lambda: {"n": 1}, wait_timeout=12) == ({"n": 1}, False)
+        assert clock.sleeps == [1, 2, 4, 4, 1]
+        assert clock.now == 1_000_012
+
+
+class TestFlightStores:
+    """Tests for the conditional-write flight stores."""
+
+    def check_store(self, store):
+        """Exercise the acquire, complete and release contract."""
+        assert store.acquire("key", "a", now=100, expires_at=400)
+        assert not store.acquire("key", "b", now=200, expires_at=500)
+
+        store.complete("key", "b", {"n": 2}, expires_at=500)
+        assert store.get("key").result is None
+
+        store.complete("key", "a", {"n": 1}, expires_at=460)
+        record = store.get("key")
+        assert (record.owner, record.result) == ("a", {"n": 1})
+
+        assert store.acquire("key", "b", now=460, expires_at=760)
+        store.release("key", "a")
+        assert store.get("key").owner == "b"
+        store.release("key", "b")
+        assert store.get("key") is None
+
+    def test_in_memory_store(self):
+        """Test the in-memory store."""
+        self.check_store(InMemoryFlightStore())
+
+    def test_sqlite_store(self, tmp_path):
+        """Test the SQLite store."""
+        self.check_store(SQLiteFlightStore(str(tmp_path / "flights.db")))
+
+    @mock_aws
+    def test_dynamodb_store(self):
+        """Test the DynamoDB store."""
+        table = boto3.resource("dynamodb", region_name="us-east-1").create_table(
+            TableName="flights",
+            KeySchema=[{"AttributeName": "flight_key", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "flight_key", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        self.check_store(DynamoDBFlightStore(table))
@@ -0,0 +1,74 @@
+"""Tests for vectorized metric series analysis."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from alarm_investigator.tools.analysis import align_series, analyze_series
+
+START = datetime(2026, 1, 29, 9, 0, tzinfo=timezone.utc)
+
+
+def make_series(values: list[float], offset: int = 0) -> tuple[list, list]:
+    """Build a series with one point every 5 minutes."""
+    timestamps = [START + timedelta(minutes=5 * (i + offset)) for i in range(len(values))]
+    return timestamps, values
+
+
+class TestAnalyzeSeries:
+    """Tests for analyze_series."""
+
+    def test_basic_statistics_and_percentiles(self):
+        """Test summary statistics for a single series."""
+        summary = analyze_series([make_series([float(i) for i in range(1, 101)])])[0]
+
+        assert summary["min"] == 1.0
+        assert summary["max"] == 100.0
+        assert summary["avg"] == 50.5
+        assert summary["count"] == 100
+        assert summary["p50"] == pytest.approx(50.5)
+        assert summary["p99"] == pytest.approx(99.01)
+
+    def test_slope_change_point_and_threshold(self):
+        """Test trend, level shift and threshold crossing are located."""
+        values = [20.0] * 12 + [90.0] * 12
+        summary = analyze_series([make_series(values)], threshold=80.0)[0]
+
+        shift_time = (START + timedelta(minutes=60)).isoformat()
+        assert summary["change_point"] == {
+            "timestamp": shift_time,
+            "before_avg": 20.0,
+            "after_avg": 90.0,
+        }
+        assert summary["threshold_first_crossed"] == shift_time
+        assert summary["slope_per_hour"] > 0
+
+    def test_rolling_zscore_finds_spike(self):
+        """Test the largest deviation from the preceding window is reported."""
+        values = [10.0, 11.0, 9.0, 10.0, 11.0, 9.0, 10.0, 11.0, 9.0, 10.0, 50.0, 10.0]
+        summary = analyze_series([make_series(values)], zscore_window=5)[0]
+
+        assert summary["max_zscore"]["timestamp"] == (START + timedelta(minutes=50)).isoformat()
+        assert summary["max_zscore"]["value"] > 10
+
+    def test_many_series_with_gaps_and_empty(self):
+        """Test unaligned and empty series are summarized together."""
+        summaries = analyze_series(
+            [make_series([1.0, 2.0, 3.0]), make_series([5.0, 7.0], offset=1), ([], [])],
+            threshold=2.5,
+            above=False,
+        )
+
+        assert summaries[0]["count"] == 3
+        assert summaries[1]["avg"] == 6.0
+        assert summaries[1]["threshold_first_crossed"] is None
+        assert summaries[0]["threshold_first_crossed"] == START.isoformat()
+        assert summaries[2] == {}
+
+    def test_align_series_fills_missing_with_nan(self):
+        """Test series are aligned onto a shared grid."""
+        epochs, matrix = align_series([make_series([1.0, 2.0]), make_series([3.0], offset=1)])
+
+        assert len(epochs) == 2
+        assert matrix[1, 1] == 3.0
+        assert matrix[1, 0] != matrix[1, 0]  # NaN
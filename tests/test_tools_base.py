@@ -1,6 +1,8 @@
 """Tests for tool base class and registry."""
 
 from alarm_investigator.tools.base import Tool, ToolRegistry
+from alarm_investigator.tools.cache import ToolCache
+from alarm_investigator.tools.circuit import ToolGuard
 
 
 class MockTool(Tool):
@@ -9,12 +11,11 @@ class MockTool(Tool):
     name = "mock_tool"
     description = "A mock tool for testing purposes"
 
-    def get_parameters_schema(self) -> dict:
+    @classmethod
+    def get_parameters_schema(cls) -> dict:
         return {
             "type": "object",
-            "properties": {
-                "input_value": {"type": "string", "description": "Test input"}
-            },
+            "properties": {"input_value": {"type": "string", "description": "Test input"}},
             "required": ["input_value"],
         }
 
@@ -22,6 +23,20 @@ class MockTool(Tool):
         return {"result": f"processed: {kwargs.get('input_value')}"}
 
 
+class CountingTool(MockTool):
+    """A cacheable mock tool that counts executions."""
+
+    name = "counting_tool"
+    cache_ttl = 60
+
+    def __init__(self):
+        self.calls = 0
+
+    def execute(self, **kwargs) -> dict:
+        self.calls += 1
+        return super().execute(**kwargs)
+
+
 class TestTool:
     """Tests for Tool base class."""
 
@@ -91,3 +106,83 @@ class TestToolRegistry:
         assert "tools" in config
         assert len(config["tools"]) == 1
         assert config["tools"][0]["toolSpec"]["name"] == "mock_tool"
+
+    def test_register_factory_defers_construction(self):
+        """Test lazily registered tools are built only on first get."""
+        registry = ToolRegistry()
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return MockTool()
+
+        registry.register_factory(MockTool, factory)
+
+        assert calls == []
+        assert not registry.is_built("mock_tool")
+
+        tool = registry.get("mock_tool")
+
+        assert isinstance(tool, MockTool)
+        assert registry.get("mock_tool") is tool
+        assert calls == [1]
+
+    def test_bedrock_config_does_not_build_lazy_tools(self):
+        """Test Bedrock config comes from class metadata for lazy tools."""
+        registry = ToolRegistry()
+
+        def factory():
+            raise AssertionError("tool should not be built")
+
+        registry.register_factory(MockTool, factory)
+
+        config = registry.get_bedrock_config()
+
+        assert config["tools"] == [MockTool().to_bedrock_spec()]
+        assert not registry.is_built("mock_tool")
+
+    def test_execute_unknown_tool_returns_error(self):
+        """Test executing an unregistered tool returns an error result."""
+        registry = ToolRegistry()
+
+        assert registry.execute("unknown", {}) == {"error": "Unknown tool: unknown"}
+
+    def test_execute_serves_cacheable_results_from_cache(self):
+        """Test repeated calls hit the cache and carry hit/miss metadata."""
+        cache = ToolCache()
+        tool = CountingTool()
+        registry = ToolRegistry(cache=cache, cache_namespace="123:us-east-1")
+        registry.register(tool)
+
+        first = registry.execute("counting_tool", {"input_value": "a"})
+        second = registry.execute("counting_tool", {"input_value": "a"})
+        other = registry.execute("counting_tool", {"input_value": "b"})
+
+        assert first == {"result": "processed: a", "cache": {"hit": False}}
+        assert second["result"] == "processed: a"
+        assert second["cache"]["hit"] is True
+        assert other["cache"] == {"hit": False}
+        assert tool.calls == 2
+
+    def test_execute_bypasses_cache_for_tools_without_ttl(self):
+        """Test tools without a TTL are always executed."""
+        registry = ToolRegistry(cache=ToolCache())
+        registry.register(MockTool())
+
+        result = registry.execute("mock_tool", {"input_value": "a"})
+
+        assert result == {"result": "processed: a"}
+
+    def test_execute_runs_uncached_calls_through_guard(self):
+        """Test guarded calls fail fast once the circuit is open and are not cached."""
+        guard = ToolGuard(failure_threshold=1)
+        tool = CountingTool()
+        tool.execute = lambda **kwargs: {"status": "error", "error": "(ServiceUnavailable)"}
+        registry = ToolRegistry(cache=ToolCache(), cache_namespace="ns", guard=guard)
+        registry.register(tool)
+
+        registry.execute("counting_tool", {"input_value": "a"})
+        result = registry.execute("counting_tool", {"input_value": "a"})
+
+        assert result["status"] == "unavailable"
+        assert "cache" not in result
@@ -0,0 +1,109 @@
+"""Tests for the tool result cache."""
+
+import boto3
+from moto import mock_aws
+
+from alarm_investigator.tools.cache import (
+    CacheEntry,
+    DynamoDBCacheBackend,
+    FileCacheBackend,
+    InMemoryCacheBackend,
+    ToolCache,
+)
+
+
+class TestInMemoryCacheBackend:
+    """Tests for InMemoryCacheBackend."""
+
+    def test_evicts_least_recently_used_entry(self):
+        """Test the oldest untouched entry is evicted when full."""
+        backend = InMemoryCacheBackend(max_entries=2)
+        entry = CacheEntry(value={"v": 1}, stored_at=0, expires_at=100)
+        backend.set("a", entry)
+        backend.set("b", entry)
+        backend.get("a")
+
+        backend.set("c", entry)
+
+        assert backend.get("a") is entry
+        assert backend.get("b") is None
+        assert backend.get("c") is entry
+
+    def test_respects_memory_cap(self):
+        """Test entries are evicted to stay under the byte budget."""
+        backend = InMemoryCacheBackend(max_bytes=100)
+        big = CacheEntry(value={"data": "x" * 60}, stored_at=0, expires_at=100)
+
+        backend.set("a", big)
+        backend.set("b", big)
+
+        assert len(backend) == 1
+        assert backend.get("b") is big
+        assert backend.size_bytes <= 100
+
+
+class TestToolCache:
+    """Tests for ToolCache."""
+
+    def test_key_ignores_argument_order(self):
+        """Test normalized keys for equivalent arguments."""
+        first = ToolCache.make_key("ns", "tool", {"a": 1, "b": 2})
+        second = ToolCache.make_key("ns", "tool", {"b": 2, "a": 1})
+
+        assert first == second
+        assert first != ToolCache.make_key("other", "tool", {"a": 1, "b": 2})
+
+    def test_entries_expire_after_ttl(self, clock):
+        """Test lookups miss once the TTL has passed."""
+        cache = ToolCache(clock=clock)
+        cache.store("key", {"status": "success"}, ttl=60)
+
+        clock.now += 30
+        assert cache.lookup("key") == ({"status": "success"}, 30)
+
+        clock.now += 31
+        assert cache.lookup("key") is None
+
+    def test_error_results_are_not_stored(self):
+        """Test failed lookups are never cached."""
+        cache = ToolCache()
+        cache.store("key", {"status": "error", "error": "boom"}, ttl=60)
+
+        assert cache.lookup("key") is None
+
+    def test_partial_results_with_item_errors_are_not_stored(self):
+        """Test batch results with per-item errors are never cached."""
+        cache = ToolCache()
+        cache.store(
+            "key",
+            {"status": "success", "functions": {}, "errors": {"fn": "AccessDenied"}},
+            ttl=60,
+        )
+
+        assert cache.lookup("key") is None
+
+    def test_file_backend_round_trip(self, tmp_path, clock):
+        """Test the file backend persists entries between instances."""
+        ToolCache(backend=FileCacheBackend(str(tmp_path)), clock=clock).store(
+            "key", {"status": "success"}, ttl=60
+        )
+
+        cache = ToolCache(backend=FileCacheBackend(str(tmp_path)), clock=clock)
+
+        assert cache.lookup("key") == ({"status": "success"}, 0)
+
+    @mock_aws
+    def test_dynamodb_backend_round_trip(self, clock):
+        """Test the DynamoDB backend stores and reads entries."""
+        table = boto3.resource("dynamodb", region_name="us-east-1").create_table(
+            TableName="tool-cache",
+            KeySchema=[{"AttributeName": "cache_key", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "cache_key", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        cache = ToolCache(backend=DynamoDBCacheBackend(table), clock=clock)
+
+        cache.store("key", {"status": "success", "count": 3}, ttl=60)
+
+        assert cache.lookup("key") == ({"status": "success", "count": 3}, 0)
+        assert cache.lookup("missing") is None
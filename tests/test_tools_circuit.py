@@ -0,0 +1,218 @@
+"""Tests for tool deadlines and circuit breakers."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from alarm_investigator.tools.base import Tool
+from alarm_investigator.tools.circuit import (
+    CircuitBreaker,
+    CircuitState,
+    ToolGuard,
+    is_unhealthy_result,
+)
+
+
+class SlowTool(Tool):
+    """A tool that blocks until released."""
+
+    name = "slow_tool"
+    description = "Blocks until released"
+    timeout = 0.05
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    @classmethod
+    def get_parameters_schema(cls) -> dict:
+        return {"type": "object", "properties": {}}
+
+    def execute(self, **kwargs) -> dict:
+        self.release.wait(5)
+        return {"status": "success"}
+
+
+class FastTool(SlowTool):
+    """A tool that answers straight away."""
+
+    name = "fast_tool"
+
+    def execute(self, **kwargs) -> dict:
+        return {"status": "success"}
+
+
+UNHEALTHY = {
+    "status": "error",
+    "error": "Read timeout on endpoint URL: https://ecs.us-east-1.amazonaws.com/",
+}
+
+
+class TestIsUnhealthyResult:
+    """Tests for is_unhealthy_result."""
+
+    def test_classifies_endpoint_errors(self):
+        """Test endpoint and throttling errors count, request errors do not."""
+        throttled = {
+            "status": "error",
+            "error": "An error occurred (ThrottlingException) when calling the X operation",
+        }
+        not_found = {
+            "status": "error",
+            "error": "An error occurred (ResourceNotFoundException) when calling the X operation",
+        }
+
+        assert is_unhealthy_result(UNHEALTHY)
+        assert is_unhealthy_result(throttled)
+        assert not is_unhealthy_result(not_found)
+        assert not is_unhealthy_result({"status": "success"})
+
+    def test_classifies_per_item_errors_of_batch_results(self):
+        """Test endpoint errors of individual items in a batch result count."""
+        partial = {
+            "status": "success",
+            "functions": {"fn-a": {}},
+            "errors": {"fn-b": "An error occurred (TooManyRequestsException) when calling"},
+        }
+
+        assert is_unhealthy_result(partial)
+        assert not is_unhealthy_result({**partial, "errors": {"fn-b": "(AccessDeniedException)"}})
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker."""
+
+    def test_opens_after_threshold_and_probes_after_cool_down(self, clock):
+        """Test the breaker rejects calls while open and lets one trial through."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+
+        breaker.record_failure()
+        assert breaker.state == CircuitState.CLOSED
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        assert not breaker.allow()
+
+        clock.now += 30
+        assert breaker.allow()
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert not breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.allow()
+
+    def test_failed_trial_reopens(self, clock):
+        """Test a failing trial call opens the circuit for another cool-down."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+        breaker.record_failure()
+        clock.now += 30
+        assert breaker.allow()
+
+        breaker.record_failure()
+
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.retry_after() == 30
+        assert not breaker.allow()
+
+
+class TestToolGuard:
+    """Tests for ToolGuard."""
+
+    def test_timeout_returns_unavailable_result(self):
+        """Test a call that overruns the tool's deadline is abandoned."""
+        guard = ToolGuard()
+        tool = SlowTool()
+
+        result = guard.call("ns", tool, tool.execute)
+        tool.release.set()
+
+        assert result == {
+            "status": "unavailable",
+            "error": "Tool slow_tool did not respond within 0.05s",
+        }
+        assert guard.breaker("ns", "slow_tool").failures == 1
+
+    def test_open_circuit_fails_fast_per_namespace(self, clock):
+        """Test repeated endpoint failures open the circuit for that namespace only."""
+        guard = ToolGuard(failure_threshold=2, clock=clock)
+        tool = SlowTool()
+        calls = []
+
+        def execute():
+            calls.append(1)
+            return UNHEALTHY
+
+        guard.call("us-east-1", tool, execute)
+        guard.call("us-east-1", tool, execute)
+        rejected = guard.call("us-east-1", tool, execute)
+        other_region = guard.call("eu-west-1", tool, execute)
+
+        assert len(calls) == 3
+        assert rejected["status"] == "unavailable"
+        assert rejected["retry_after_seconds"] == 30.0
+        assert other_region == UNHEALTHY
+        assert guard.open_circuits() == ["us-east-1|slow_tool"]
+
+    def test_hung_tool_leaves_other_tools_working(self):
+        """Test calls stuck on one endpoint do not slow down or trip other tools."""
+        guard = ToolGuard(default_timeout=0.3, max_in_flight=4)
+        hung, fast = SlowTool(), FastTool()
+        hung.timeout = 0
+
+        hung_results = [guard.call("ns", hung, hung.execute) for _ in range(4)]
+        started = time.monotonic()
+        fast_results = [guard.call("ns", fast, fast.execute) for _ in range(5)]
+        elapsed = time.monotonic() - started
+        hung.release.set()
+
+        assert [r["status"] for r in hung_results] == ["unavailable"] * 4
+        assert fast_results == [{"status": "success"}] * 5
+        assert elapsed < 0.2
+        assert guard.open_circuits() == ["ns|slow_tool"]
+
+    def test_abandoned_calls_cap_in_flight_calls_per_tool(self):
+        """Test a tool whose calls are all still running is rejected without waiting."""
+        guard = ToolGuard(max_in_flight=1, failure_threshold=10)
+        tool = SlowTool()
+
+        timed_out = guard.call("ns", tool, tool.execute)
+        started = time.monotonic()
+        rejected = guard.call("ns", tool, tool.execute)
+        elapsed = time.monotonic() - started
+        tool.release.set()
+
+        assert "did not respond" in timed_out["error"]
+        assert rejected["status"] == "unavailable"
+        assert "already has 1 calls" in rejected["error"]
+        assert elapsed < 0.05
+        assert guard.breaker("ns", "slow_tool").failures == 1
+
+    def test_exceptions_count_as_failures(self):
+        """Test exceptions propagate and are counted by the breaker."""
+        guard = ToolGuard(failure_threshold=1)
+        tool = SlowTool()
+
+        def execute():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            guard.call("ns", tool, execute)
+
+        assert guard.call("ns", tool, execute)["status"] == "unavailable"
+
+    def test_acall_enforces_deadline(self):
+        """Test the async path times out and then fails fast."""
+        guard = ToolGuard(failure_threshold=1)
+        tool = SlowTool()
+
+        async def execute():
+            await asyncio.sleep(5)
+            return {"status": "success"}
+
+        timed_out = asyncio.run(guard.acall("ns", tool, execute))
+        rejected = asyncio.run(guard.acall("ns", tool, execute))
+
+        assert timed_out["error"] == "Tool slow_tool did not respond within 0.05s"
+        assert rejected["status"] == "unavailable"
+        assert "retry_after_seconds" in rejected
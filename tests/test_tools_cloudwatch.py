@@ -1,9 +1,39 @@
 """Tests for CloudWatch tools."""
 
-from datetime import datetime, timezone
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock
 
-from alarm_investigator.tools.cloudwatch import GetMetricsTool
+from alarm_investigator.tools.circuit import ToolGuard
+from alarm_investigator.tools.cloudwatch import (
+    FindCorrelatedMetricsTool,
+    GetMetricsBatchTool,
+    GetMetricsTool,
+    MetricSeriesCache,
+    align_to_period,
+)
+
+
+def fixed_clock(moment: datetime):
+    """Return a clock that always reports the given moment."""
+    return lambda: moment
+
+
+def metric_response(start: datetime, end: datetime) -> dict:
+    """Build a get_metric_data response with one point per 5 minutes."""
+    timestamps = []
+    ts = start
+    while ts < end:
+        timestamps.append(ts)
+        ts += timedelta(minutes=5)
+    timestamps.reverse()
+    return {
+        "MetricDataResults": [
+            {"Id": "m1", "Timestamps": timestamps, "Values": [10.0] * len(timestamps)}
+        ]
+    }
 
 
 class TestGetMetricsTool:
@@ -36,7 +66,10 @@ class TestGetMetricsTool:
             ]
         }
 
-        tool = GetMetricsTool(cloudwatch_client=mock_client)
+        tool = GetMetricsTool(
+            cloudwatch_client=mock_client,
+            clock=fixed_clock(datetime(2026, 1, 29, 10, 7, 0, tzinfo=timezone.utc)),
+        )
         result = tool.execute(
             namespace="AWS/EC2",
             metric_name="CPUUtilization",
@@ -85,3 +118,376 @@ class TestGetMetricsTool:
 
         assert result["status"] == "error"
         assert "API Error" in result["error"]
+
+    def test_window_is_aligned_to_period(self):
+        """Test the query window snaps to 5-minute boundaries."""
+        mock_client = MagicMock()
+        mock_client.get_metric_data.return_value = {"MetricDataResults": []}
+        now = datetime(2026, 1, 29, 10, 7, 42, tzinfo=timezone.utc)
+
+        tool = GetMetricsTool(cloudwatch_client=mock_client, clock=fixed_clock(now))
+        tool.execute(namespace="AWS/EC2", metric_name="CPUUtilization", dimensions={})
+
+        call = mock_client.get_metric_data.call_args.kwargs
+        assert call["EndTime"] == datetime(2026, 1, 29, 10, 5, tzinfo=timezone.utc)
+        assert call["StartTime"] == datetime(2026, 1, 29, 9, 5, tzinfo=timezone.utc)
+        assert align_to_period(now, 300) == call["EndTime"]
+
+    def test_repeated_query_in_same_period_uses_cache(self):
+        """Test identical queries seconds apart cost a single API call."""
+        mock_client = MagicMock()
+        mock_client.get_metric_data.side_effect = lambda **kw: metric_response(
+            kw["StartTime"], kw["EndTime"]
+        )
+        now = datetime(2026, 1, 29, 10, 7, tzinfo=timezone.utc)
+        tool = GetMetricsTool(cloudwatch_client=mock_client, clock=fixed_clock(now))
+
+        first = tool.execute(namespace="AWS/EC2", metric_name="CPUUtilization", dimensions={})
+        second = tool.execute(namespace="AWS/EC2", metric_name="CPUUtilization", dimensions={})
+
+        assert mock_client.get_metric_data.call_count == 1
+        assert first["datapoints"] == second["datapoints"]
+        assert len(first["datapoints"]) == 12
+
+    def test_later_query_fetches_only_missing_tail(self):
+        """Test a shared cache only fetches periods newer than the last fetch."""
+        mock_client = MagicMock()
+        mock_client.get_metric_data.side_effect = lambda **kw: metric_response(
+            kw["StartTime"], kw["EndTime"]
+        )
+        cache = MetricSeriesCache()
+        first_now = datetime(2026, 1, 29, 10, 7, tzinfo=timezone.utc)
+        GetMetricsTool(
+            cloudwatch_client=mock_client, series_cache=cache, clock=fixed_clock(first_now)
+        ).execute(namespace="AWS/EC2", metric_name="CPUUtilization", dimensions={})
+
+        later = GetMetricsTool(
+            cloudwatch_client=mock_client,
+            series_cache=cache,
+            clock=fixed_clock(first_now + timedelta(minutes=10)),
+        )
+        result = later.execute(namespace="AWS/EC2", metric_name="CPUUtilization", dimensions={})
+
+        tail_call = mock_client.get_metric_data.call_args_list[1].kwargs
+        # The last cached period is refreshed together with the two new ones
+        assert tail_call["StartTime"] == datetime(2026, 1, 29, 10, 0, tzinfo=timezone.utc)
+        assert tail_call["EndTime"] == datetime(2026, 1, 29, 10, 15, tzinfo=timezone.utc)
+        assert len(result["datapoints"]) == 12
+        assert result["datapoints"][0]["timestamp"] == "2026-01-29T10:10:00+00:00"
+
+    def test_window_longer_than_retention_keeps_all_points(self):
+        """Test a 48h window is served whole and then only refreshed."""
+        mock_client = MagicMock()
+        mock_client.get_metric_data.side_effect = lambda **kw: metric_response(
+            kw["StartTime"], kw["EndTime"]
+        )
+        now = datetime(2026, 1, 29, 10, 7, tzinfo=timezone.utc)
+        tool = GetMetricsTool(cloudwatch_client=mock_client, clock=fixed_clock(now))
+
+        first = tool.execute(
+            namespace="AWS/EC2", metric_name="CPUUtilization", dimensions={}, period_minutes=2880
+        )
+        second = tool.execute(
+            namespace="AWS/EC2", metric_name="CPUUtilization", dimensions={}, period_minutes=2880
+        )
+
+        assert first["statistics"]["count"] == 576
+        assert second["statistics"]["count"] == 576
+        assert mock_client.get_metric_data.call_count == 1
+
+    def test_points_past_retention_are_dropped_by_later_windows(self):
+        """Test the cache trims points older than retention outside the window."""
+        cache = MetricSeriesCache(retention=timedelta(hours=1))
+        key = ("AWS/EC2", "CPUUtilization", (), "Average", 300)
+        end = datetime(2026, 1, 29, 10, 0, tzinfo=timezone.utc)
+        start = end - timedelta(hours=3)
+        response = metric_response(start, end)["MetricDataResults"][0]
+        cache.merge(key, start, end, response["Timestamps"], response["Values"])
+
+        cache.missing_ranges(key, end - timedelta(minutes=30), end, timedelta(minutes=5))
+
+        assert len(cache.points(key, start, end)) == 12
+
+    def test_long_series_is_downsampled_and_columnar(self):
+        """Test long windows are downsampled with a compression report."""
+        mock_client = MagicMock()
+        mock_client.get_metric_data.side_effect = lambda **kw: metric_response(
+            kw["StartTime"], kw["EndTime"]
+        )
+        now = datetime(2026, 1, 29, 10, 7, tzinfo=timezone.utc)
+        tool = GetMetricsTool(cloudwatch_client=mock_client, clock=fixed_clock(now))
+
+        result = tool.execute(
+            namespace="AWS/EC2",
+            metric_name="CPUUtilization",
+            dimensions={},
+            period_minutes=24 * 60,
+            max_points=50,
+            encoding="columnar",
+        )
+
+        assert "datapoints" not in result
+        assert len(result["series"]["values"]) == 50
+        assert result["series"]["step_seconds"] == 300
+        assert result["statistics"]["count"] == 288
+        assert result["compression"]["original_points"] == 288
+        assert result["compression"]["returned_points"] == 50
+        assert result["compression"]["ratio"] > 5
+
+    def test_narrow_window_at_full_resolution(self):
+        """Test an explicit window with max_points=0 returns every point."""
+        mock_client = MagicMock()
+        mock_client.get_metric_data.side_effect = lambda **kw: metric_response(
+            kw["StartTime"], kw["EndTime"]
+        )
+        now = datetime(2026, 1, 29, 10, 7, tzinfo=timezone.utc)
+        tool = GetMetricsTool(cloudwatch_client=mock_client, clock=fixed_clock(now))
+
+        result = tool.execute(
+            namespace="AWS/EC2",
+            metric_name="CPUUtilization",
+            dimensions={},
+            start_time="2026-01-29T08:00:00Z",
+            end_time="2026-01-29T08:30:00Z",
+            max_points=0,
+        )
+
+        call = mock_client.get_metric_data.call_args.kwargs
+        assert call["StartTime"] == datetime(2026, 1, 29, 8, 0, tzinfo=timezone.utc)
+        assert call["EndTime"] == datetime(2026, 1, 29, 8, 30, tzinfo=timezone.utc)
+        assert len(result["datapoints"]) == 6
+        assert "compression" not in result
+
+    def test_statistics_include_analysis_summary(self):
+        """Test statistics carry percentiles and the threshold crossing."""
+        mock_client = MagicMock()
+        mock_client.get_metric_data.return_value = {
+            "MetricDataResults": [
+                {
+                    "Id": "m1",
+                    "Timestamps": [
+                        datetime(2026, 1, 29, 10, 0, tzinfo=timezone.utc),
+                        datetime(2026, 1, 29, 9, 55, tzinfo=timezone.utc),
+                        datetime(2026, 1, 29, 9, 50, tzinfo=timezone.utc),
+                    ],
+                    "Values": [85.0, 82.0, 40.0],
+                }
+            ]
+        }
+        tool = GetMetricsTool(
+            cloudwatch_client=mock_client,
+            clock=fixed_clock(datetime(2026, 1, 29, 10, 7, tzinfo=timezone.utc)),
+        )
+
+        result = tool.execute(
+            namespace="AWS/EC2", metric_name="CPUUtilization", dimensions={}, threshold=80.0
+        )
+
+        statistics = result["statistics"]
+        assert statistics["p50"] == 82.0
+        assert statistics["threshold_first_crossed"] == "2026-01-29T09:55:00+00:00"
+        assert statistics["slope_per_hour"] > 0
+
+
+class TestGetMetricsBatchTool:
+    """Tests for GetMetricsBatchTool."""
+
+    NOW = datetime(2026, 1, 29, 10, 7, tzinfo=timezone.utc)
+
+    def test_tool_has_correct_spec(self):
+        """Test tool has correct Bedrock spec."""
+        spec = GetMetricsBatchTool.class_bedrock_spec()
+
+        assert spec["toolSpec"]["name"] == "get_cloudwatch_metrics_batch"
+        assert "queries" in spec["toolSpec"]["inputSchema"]["json"]["properties"]
+
+    def test_packs_metrics_and_expressions_into_one_call(self):
+        """Test mixed statistics and expressions share a single API call."""
+        mock_client = MagicMock()
+        mock_client.get_metric_data.return_value = {
+            "MetricDataResults": [
+                {"Id": "errors", "Label": "Errors", "Timestamps": [self.NOW], "Values": [5.0]},
+                {"Id": "latency", "Timestamps": [self.NOW], "Values": [900.0]},
+                {"Id": "rate", "Label": "Error rate", "Timestamps": [self.NOW], "Values": [2.5]},
+            ]
+        }
+
+        tool = GetMetricsBatchTool(cloudwatch_client=mock_client, clock=fixed_clock(self.NOW))
+        result = tool.execute(
+            queries=[
+                {
+                    "id": "errors",
+                    "namespace": "AWS/Lambda",
+                    "metric_name": "Errors",
+                    "dimensions": {"FunctionName": "api"},
+                    "stat": "Sum",
+                },
+                {
+                    "id": "latency",
+                    "namespace": "AWS/Lambda",
+                    "metric_name": "Duration",
+                    "dimensions": {"FunctionName": "api"},
+                    "stat": "p99",
+                },
+                {"id": "rate", "expression": "errors / 200 * 100", "label": "Error rate"},
+            ],
+            period_seconds=60,
+        )
+
+        assert mock_client.get_metric_data.call_count == 1
+        queries = mock_client.get_metric_data.call_args.kwargs["MetricDataQueries"]
+        assert queries[1]["MetricStat"]["Stat"] == "p99"
+        assert queries[1]["MetricStat"]["Period"] == 60
+        assert queries[2]["Expression"] == "errors / 200 * 100"
+        assert result["status"] == "success"
+        assert result["api_calls"] == 1
+        assert [r["id"] for r in result["results"]] == ["errors", "latency", "rate"]
+        assert result["results"][2]["statistics"]["max"] == 2.5
+
+    def test_follows_next_token_pagination(self):
+        """Test paginated responses are merged per query."""
+        earlier = self.NOW - timedelta(minutes=5)
+        mock_client = MagicMock()
+        mock_client.get_metric_data.side_effect = [
+            {
+                "MetricDataResults": [{"Id": "q1", "Timestamps": [self.NOW], "Values": [1.0]}],
+                "NextToken": "page-2",
+            },
+            {"MetricDataResults": [{"Id": "q1", "Timestamps": [earlier], "Values": [2.0]}]},
+        ]
+
+        tool = GetMetricsBatchTool(cloudwatch_client=mock_client, clock=fixed_clock(self.NOW))
+        result = tool.execute(
+            queries=[{"namespace": "AWS/EC2", "metric_name": "CPUUtilization", "dimensions": {}}]
+        )
+
+        second_call = mock_client.get_metric_data.call_args_list[1].kwargs
+        assert second_call["NextToken"] == "page-2"
+        assert result["api_calls"] == 2
+        assert [p["value"] for p in result["results"][0]["datapoints"]] == [1.0, 2.0]
+
+    def test_splits_large_batches_keeping_expressions_with_inputs(self):
+        """Test batches over the per-call limit are split into few calls."""
+        mock_client = MagicMock()
+        mock_client.get_metric_data.return_value = {"MetricDataResults": []}
+        queries = [
+            {"id": f"m{i}", "namespace": "Custom", "metric_name": f"Metric{i}"} for i in range(600)
+        ]
+        queries.append({"id": "total", "expression": "m599 + m598"})
+
+        tool = GetMetricsBatchTool(cloudwatch_client=mock_client, clock=fixed_clock(self.NOW))
+        result = tool.execute(queries=queries)
+
+        calls = [c.kwargs["MetricDataQueries"] for c in mock_client.get_metric_data.call_args_list]
+        assert result["api_calls"] == 2
+        assert [len(c) for c in calls] == [500, 101]
+        first_ids = {q["Id"] for q in calls[0]}
+        assert {"total", "m599", "m598"} <= first_ids
+
+    def test_rejects_invalid_query_ids(self):
+        """Test invalid CloudWatch query ids produce an error result."""
+        tool = GetMetricsBatchTool(cloudwatch_client=MagicMock())
+
+        result = tool.execute(queries=[{"id": "CPU", "namespace": "AWS/EC2", "metric_name": "X"}])
+
+        assert result["status"] == "error"
+        assert "Invalid query id" in result["error"]
+
+
+class TestFindCorrelatedMetricsTool:
+    """Tests for FindCorrelatedMetricsTool."""
+
+    NOW = datetime(2026, 1, 29, 12, 2, tzinfo=timezone.utc)
+
+    def series_response(self, series_by_name: dict[str, list[float]], **kwargs) -> dict:
+        """Answer get_metric_data with the named series, oldest point first."""
+        end = kwargs["EndTime"]
+        results = []
+        for query in kwargs["MetricDataQueries"]:
+            values = series_by_name[query["MetricStat"]["Metric"]["MetricName"]]
+            timestamps = [
+                end - timedelta(minutes=5 * (len(values) - i)) for i in range(len(values))
+            ]
+            results.append({"Id": query["Id"], "Timestamps": timestamps, "Values": values})
+        return {"MetricDataResults": results}
+
+    def test_gets_longer_guard_timeout_than_default(self):
+        """Test the heavy discovery tool is not held to the default deadline."""
+        guard = ToolGuard(default_timeout=15.0)
+
+        assert guard.timeout_for(FindCorrelatedMetricsTool(cloudwatch_client=MagicMock())) == 25
+        assert guard.timeout_for(GetMetricsBatchTool(cloudwatch_client=MagicMock())) == 20
+        assert guard.timeout_for(GetMetricsTool(cloudwatch_client=MagicMock())) == 15.0
+
+    def test_ranks_candidates_by_correlation_and_lead(self):
+        """Test metrics are listed, fetched in bulk and ranked."""
+        alarm = [10.0] * 10 + [80.0, 90.0, 85.0, 95.0] + [10.0] * 10
+        leading = [1.0] * 8 + [8.0, 9.0, 8.5, 9.5] + [1.0] * 12
+        noise = [5.0, 3.0, 4.0, 6.0] * 6
+        flat = [7.0] * 24
+        series = {
+            "CPUUtilization": alarm,
+            "NetworkIn": leading,
+            "DiskReadOps": noise,
+            "StatusCheckFailed": flat,
+        }
+        dims = [{"Name": "InstanceId", "Value": "i-123"}]
+
+        mock_client = MagicMock()
+        mock_client.list_metrics.side_effect = [
+            {
+                "Metrics": [
+                    {"Namespace": "AWS/EC2", "MetricName": "CPUUtilization", "Dimensions": dims},
+                    {"Namespace": "AWS/EC2", "MetricName": "DiskReadOps", "Dimensions": dims},
+                ],
+                "NextToken": "more",
+            },
+            {
+                "Metrics": [
+                    {"Namespace": "AWS/EC2", "MetricName": "NetworkIn", "Dimensions": dims},
+                    {"Namespace": "AWS/EC2", "MetricName": "StatusCheckFailed", "Dimensions": dims},
+                ]
+            },
+        ]
+        mock_client.get_metric_data.side_effect = lambda **kw: self.series_response(series, **kw)
+
+        tool = FindCorrelatedMetricsTool(cloudwatch_client=mock_client, clock=fixed_clock(self.NOW))
+        result = tool.execute(
+            namespace="AWS/EC2",
+            metric_name="CPUUtilization",
+            dimensions={"InstanceId": "i-123"},
+        )
+
+        assert result["status"] == "success"
+        assert mock_client.list_metrics.call_count == 2
+        assert mock_client.get_metric_data.call_count == 1
+        assert result["candidates_evaluated"] == 3
+        ranked = result["correlated_metrics"]
+        assert [m["metric_name"] for m in ranked] == ["NetworkIn", "DiskReadOps"]
+        assert ranked[0]["correlation"] > 0.9
+        assert ranked[0]["lead_minutes"] == 10
+        assert ranked[0]["dimensions"] == {"InstanceId": "i-123"}
+
+    def test_returns_empty_ranking_without_candidates(self):
+        """Test a resource with only the alarm metric yields no ranking."""
+        mock_client = MagicMock()
+        mock_client.list_metrics.return_value = {"Metrics": []}
+
+        tool = FindCorrelatedMetricsTool(cloudwatch_client=mock_client)
+        result = tool.execute(namespace="AWS/EC2", metric_name="CPUUtilization", dimensions={})
+
+        assert result == {"status": "success", "candidates_evaluated": 0, "correlated_metrics": []}
+        mock_client.get_metric_data.assert_not_called()
+
+
+class TestNumpyImport:
+    """Tests for loading the CloudWatch tools without NumPy."""
+
+    def test_handler_imports_without_numpy(self):
+        """Test NumPy is only needed once a series is analyzed."""
+        code = "import sys; sys.modules['numpy'] = None; import alarm_investigator.handler"
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+
+        result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True)
+
+        assert result.returncode == 0, result.stderr.decode()
@@ -0,0 +1,72 @@
+"""Tests for metric series downsampling and encoding."""
+
+from datetime import datetime, timedelta, timezone
+
+from alarm_investigator.tools.downsample import encode_columnar, lttb, minmax
+
+START = datetime(2026, 1, 29, 9, 0, tzinfo=timezone.utc)
+
+
+def make_points(values: list[float], step_minutes: int = 1) -> list:
+    """Build ascending points one step apart."""
+    return [(START + timedelta(minutes=i * step_minutes), v) for i, v in enumerate(values)]
+
+
+class TestLttb:
+    """Tests for LTTB downsampling."""
+
+    def test_keeps_endpoints_and_spike(self):
+        """Test the first, last and spike points survive downsampling."""
+        values = [10.0] * 200
+        values[123] = 95.0
+        points = make_points(values)
+
+        sampled = lttb(points, 20)
+
+        assert len(sampled) == 20
+        assert sampled[0] == points[0]
+        assert sampled[-1] == points[-1]
+        assert points[123] in sampled
+
+    def test_returns_input_when_under_threshold(self):
+        """Test short series are returned unchanged."""
+        points = make_points([1.0, 2.0, 3.0])
+
+        assert lttb(points, 10) == points
+
+
+class TestMinmax:
+    """Tests for min/max bucket downsampling."""
+
+    def test_preserves_bucket_extremes(self):
+        """Test each bucket keeps its min and max in time order."""
+        points = make_points([5.0, 1.0, 9.0, 4.0, 2.0, 8.0, 3.0, 7.0])
+
+        sampled = minmax(points, 4)
+
+        assert [v for _, v in sampled] == [1.0, 9.0, 2.0, 8.0]
+        assert sampled == sorted(sampled)
+
+
+class TestEncodeColumnar:
+    """Tests for the columnar encoding."""
+
+    def test_contiguous_series_omits_offsets(self):
+        """Test regular series are encoded as start, step and values."""
+        points = make_points([1.0, 2.0, 3.0], step_minutes=5)
+
+        encoded = encode_columnar(points, 300)
+
+        assert encoded == {
+            "start": "2026-01-29T09:00:00+00:00",
+            "step_seconds": 300,
+            "values": [1.0, 2.0, 3.0],
+        }
+
+    def test_sparse_series_includes_offsets(self):
+        """Test gaps are described with step offsets."""
+        points = [make_points([0.0] * 10, step_minutes=5)[i] for i in (0, 3, 9)]
+
+        encoded = encode_columnar(points, 300)
+
+        assert encoded["offsets"] == [0, 3, 9]
@@ -69,3 +69,40 @@ class TestDescribeEC2InstanceTool:
 
         assert result["status"] == "error"
         assert "Access Denied" in result["error"]
+
+    def test_execute_describes_many_with_pagination(self):
+        """Test a list of IDs is described via one filtered, paginated query."""
+        mock_client = MagicMock()
+        mock_client.describe_instances.side_effect = [
+            {
+                "Reservations": [
+                    {"Instances": [{"InstanceId": "i-a", "State": {"Name": "running"}}]}
+                ],
+                "NextToken": "page-2",
+            },
+            {
+                "Reservations": [
+                    {"Instances": [{"InstanceId": "i-b", "State": {"Name": "stopped"}}]}
+                ]
+            },
+        ]
+
+        tool = DescribeEC2InstanceTool(ec2_client=mock_client)
+        result = tool.execute(instance_ids=["i-a", "i-b", "i-missing", "i-a"])
+
+        assert result["status"] == "success"
+        assert result["instances"]["i-a"]["state"] == "running"
+        assert result["instances"]["i-b"]["state"] == "stopped"
+        assert result["not_found"] == ["i-missing"]
+        first, second = mock_client.describe_instances.call_args_list
+        assert first.kwargs["Filters"] == [
+            {"Name": "instance-id", "Values": ["i-a", "i-b", "i-missing"]}
+        ]
+        assert second.kwargs["NextToken"] == "page-2"
+
+    def test_execute_requires_an_identifier(self):
+        """Test an error is returned when no instance ID is given."""
+        tool = DescribeEC2InstanceTool(ec2_client=MagicMock())
+        result = tool.execute()
+
+        assert result["status"] == "error"
@@ -79,3 +79,27 @@ class TestDescribeECSServiceTool:
 
         assert result["status"] == "error"
         assert "Access Denied" in result["error"]
+
+    def test_execute_describes_many_services(self):
+        """Test services are described in chunks of ten and failures reported."""
+        mock_client = MagicMock()
+        mock_client.describe_services.side_effect = lambda cluster, services: {
+            "services": [
+                {"serviceName": s, "serviceArn": f"arn:{s}", "runningCount": 1}
+                for s in services
+                if s != "svc-missing"
+            ],
+            "failures": [{"arn": "svc-missing", "reason": "MISSING"}]
+            if "svc-missing" in services
+            else [],
+        }
+        names = [f"svc-{i}" for i in range(12)] + ["svc-missing"]
+
+        tool = DescribeECSServiceTool(ecs_client=mock_client)
+        result = tool.execute(cluster="prod", services=names)
+
+        assert result["status"] == "success"
+        assert len(result["services"]) == 12
+        assert result["services"]["svc-3"]["running_count"] == 1
+        assert result["not_found"] == ["svc-missing"]
+        assert mock_client.describe_services.call_count == 2
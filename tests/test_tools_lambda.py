@@ -2,6 +2,8 @@
 
 from unittest.mock import MagicMock
 
+from botocore.exceptions import ClientError
+
 from alarm_investigator.tools.lambda_ import DescribeLambdaFunctionTool
 
 
@@ -53,3 +55,27 @@ class TestDescribeLambdaFunctionTool:
 
         assert result["status"] == "error"
         assert "not found" in result["error"].lower()
+
+    def test_execute_describes_many_functions(self):
+        """Test several functions are described and missing ones reported."""
+        def get_function(FunctionName):
+            if FunctionName == "missing":
+                raise ClientError(
+                    {"Error": {"Code": "ResourceNotFoundException", "Message": "nope"}},
+                    "GetFunction",
+                )
+            if FunctionName == "broken":
+                raise Exception("throttled")
+            return {"Configuration": {"FunctionName": FunctionName, "MemorySize": 128}}
+
+        mock_client = MagicMock()
+        mock_client.get_function.side_effect = get_function
+
+        tool = DescribeLambdaFunctionTool(lambda_client=mock_client)
+        result = tool.execute(function_names=["fn-a", "fn-b", "missing", "broken"])
+
+        assert result["status"] == "success"
+        assert set(result["functions"]) == {"fn-a", "fn-b"}
+        assert result["functions"]["fn-a"]["memory_mb"] == 128
+        assert result["not_found"] == ["missing"]
+        assert result["errors"] == {"broken": "throttled"}
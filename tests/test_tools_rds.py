@@ -70,3 +70,24 @@ class TestDescribeRDSInstanceTool:
 
         assert result["status"] == "error"
         assert "Access Denied" in result["error"]
+
+    def test_execute_describes_many_in_chunks(self):
+        """Test identifiers are chunked into db-instance-id filters."""
+        mock_client = MagicMock()
+        mock_client.describe_db_instances.side_effect = lambda **kwargs: {
+            "DBInstances": [
+                {"DBInstanceIdentifier": i, "DBInstanceStatus": "available"}
+                for i in kwargs["Filters"][0]["Values"]
+                if i != "db-missing"
+            ]
+        }
+        identifiers = [f"db-{i}" for i in range(150)] + ["db-missing"]
+
+        tool = DescribeRDSInstanceTool(rds_client=mock_client)
+        result = tool.execute(db_instance_identifiers=identifiers)
+
+        assert result["status"] == "success"
+        assert len(result["db_instances"]) == 150
+        assert result["db_instances"]["db-7"]["status"] == "available"
+        assert result["not_found"] == ["db-missing"]
+        assert mock_client.describe_db_instances.call_count == 2